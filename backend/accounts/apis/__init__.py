@@ -1,4 +1,5 @@
 from .user import UserAPI
 from .login import LoginAPI
 from .password_reset import PasswordResetAPI
-from .password_change import PasswordChangeAPI
\ No newline at end of file
+from .password_change import PasswordChangeAPI
+from .export import AccountExportAPI
\ No newline at end of file
@@ -0,0 +1,22 @@
+import logging
+from django.http import JsonResponse
+
+from common.streaming import StreamingJsonResponse
+from ..services.export import AccountExportService
+
+logger = logging.getLogger(__name__)
+
+class AccountExportAPI:
+    @staticmethod
+    def export(request):
+        """
+        API endpoint to download all of the current user's data as JSON
+        """
+        if request.method == 'GET':
+            logger.info('account export called')
+            if not hasattr(request, 'user') or not request.user.is_authenticated:
+                return JsonResponse({"detail": "Authentication required"}, status=401)
+
+            response = StreamingJsonResponse(AccountExportService.export(request.user))
+            response['Content-Disposition'] = 'attachment; filename="baxters_stuff_export.json"'
+            return response
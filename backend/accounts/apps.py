@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+
+class AccountsConfig(AppConfig):
+    name = 'accounts'
+
+    def ready(self):
+        from .services import UserCache
+
+        def invalidate_user_cache(sender, instance, **kwargs):
+            UserCache.invalidate(instance.pk)
+
+        User = get_user_model()
+        post_save.connect(invalidate_user_cache, sender=User, weak=False, dispatch_uid='accounts.user_cache.save')
+        post_delete.connect(invalidate_user_cache, sender=User, weak=False, dispatch_uid='accounts.user_cache.delete')
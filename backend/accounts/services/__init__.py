@@ -1,3 +1,4 @@
+from .user_cache import *
 from .login import *
 from .users import *
 from .password_reset import *
@@ -0,0 +1,35 @@
+import json
+import logging
+from typing import Iterator
+
+from common.streaming import stream_json_object
+from grocery_list.services import GroceryListService
+from pantry.services import PantryItemService
+from recipe.services import RecipeService
+
+logger = logging.getLogger(__name__)
+
+class AccountExportService:
+    @staticmethod
+    def export(user) -> Iterator[str]:
+        """
+        Stream everything a user owns as a single JSON document
+
+        Each section is read with a server-side iterator, so the export runs in
+        constant memory however many recipes, pantry items and lists there are.
+        """
+        logger.info(f"Exporting account data for user {user.username}")
+        profile = json.dumps({
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "date_joined": user.date_joined.isoformat(),
+        })
+        return stream_json_object({
+            "user": iter([profile]),
+            "recipes": RecipeService.stream(user_id=user.id),
+            "pantry_items": PantryItemService.stream(user_id=user.id),
+            "grocery_lists": GroceryListService.stream(user_id=user.id),
+        })
@@ -3,6 +3,7 @@ from rest_framework import exceptions
 from rest_framework_simplejwt.tokens import AccessToken
 
 from ..serializers import LoginSerializer, LoginRefreshSerializer
+from .user_cache import UserCache
 
 class LoginService:
     def login(validated_data):
@@ -24,7 +25,7 @@ class LoginService:
         user_id = access_token['user_id']
         if user_id is None:
             return
-        return LoginService.__get_user_by_id(user_id)
+        return UserCache.get(user_id, LoginService.__get_user_by_id)
     
     def __get_user_by_id(id):
         User = get_user_model()
@@ -0,0 +1,68 @@
+import copy
+import logging
+import threading
+import time
+from typing import Callable, Dict
+
+from rest_framework_simplejwt.settings import api_settings
+
+logger = logging.getLogger(__name__)
+
+class UserCache:
+    """
+    Per-process cache of authenticated users keyed by user ID
+
+    Entries live no longer than an access token, so a cached user is never
+    older than the token that was used to look it up. Entries are dropped
+    whenever the user is saved or deleted (see accounts.apps), which covers
+    UserService.update/delete and password changes and resets.
+    """
+    __lock = threading.Lock()
+    __entries = {}
+    __hits = 0
+    __misses = 0
+
+    @staticmethod
+    def ttl() -> float:
+        return api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+
+    @staticmethod
+    def get(user_id, loader: Callable):
+        """
+        Return a copy of the cached user, loading it with loader(user_id) on a miss
+        """
+        now = time.monotonic()
+        with UserCache.__lock:
+            entry = UserCache.__entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                UserCache.__hits += 1
+                return copy.copy(entry[1])
+            UserCache.__misses += 1
+
+        user = loader(user_id)
+        with UserCache.__lock:
+            UserCache.__entries[user_id] = (now + UserCache.ttl(), user)
+        return copy.copy(user)
+
+    @staticmethod
+    def invalidate(user_id) -> None:
+        with UserCache.__lock:
+            UserCache.__entries.pop(user_id, None)
+
+    @staticmethod
+    def clear() -> None:
+        with UserCache.__lock:
+            UserCache.__entries.clear()
+            UserCache.__hits = 0
+            UserCache.__misses = 0
+
+    @staticmethod
+    def stats() -> Dict:
+        with UserCache.__lock:
+            lookups = UserCache.__hits + UserCache.__misses
+            return {
+                "size": len(UserCache.__entries),
+                "hits": UserCache.__hits,
+                "misses": UserCache.__misses,
+                "hit_rate": UserCache.__hits / lookups if lookups else 0.0,
+            }
@@ -3,4 +3,6 @@ from .loginservice import *
 from .userservice import *
 from .password_reset_serializers import *
 from .password_reset_service import *
-from .password_reset_api import *
\ No newline at end of file
+from .password_reset_api import *
+from .export_api import *
+from .user_cache import *
@@ -0,0 +1,52 @@
+import json
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from grocery_list.models import GroceryList
+from ingredient.models import Ingredient
+from pantry.models import PantryItem
+from recipe.models import Recipe
+from ..models import User
+
+class AccountExportAPITests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='test_user',
+            email='test@example.com',
+            password='Pass123!'
+        )
+        self.other_user = User.objects.create_user(username='other_user', password='Pass123!')
+        ingredient = Ingredient.objects.create(name='Flour')
+
+        Recipe.objects.create(title='Bread', user=self.user)
+        Recipe.objects.create(title='Not mine', user=self.other_user)
+        PantryItem.objects.create(user=self.user, ingredient=ingredient, quantity=1, unit='kg')
+        GroceryList.objects.create(title='Weekly shop', user=self.user)
+
+        self.client = APIClient()
+        access_token = str(RefreshToken.for_user(self.user).access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'JWT {access_token}')
+
+    def test_export_streams_user_data(self):
+        """
+        Test the export endpoint streams only the current user's data
+        """
+        response = self.client.get('/api/export/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment', response['Content-Disposition'])
+
+        data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(data['user']['username'], 'test_user')
+        self.assertNotIn('password', data['user'])
+        self.assertEqual([recipe['title'] for recipe in data['recipes']], ['Bread'])
+        self.assertEqual(data['pantry_items'][0]['ingredient_details']['name'], 'Flour')
+        self.assertEqual(data['grocery_lists'][0]['title'], 'Weekly shop')
+
+    def test_export_requires_token(self):
+        """
+        Test the export endpoint rejects unauthenticated requests
+        """
+        response = APIClient().get('/api/export/')
+        self.assertEqual(response.status_code, 401)
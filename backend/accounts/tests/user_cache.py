@@ -0,0 +1,86 @@
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from ..models import User
+from ..services import LoginService, PasswordChangeService, UserCache, UserService
+
+class UserCacheTests(APITestCase):
+    def setUp(self):
+        UserCache.clear()
+
+        username = 'test_user'
+        password = 'Pass123!'
+        user = User.objects.create_user(username=username, password=password)
+        user.save()
+
+        self.user = user
+        self.access = str(RefreshToken.for_user(user).access_token)
+
+    def tearDown(self):
+        UserCache.clear()
+
+    def test_get_authenticated_user_cached(self):
+        """
+        Test get_authenticated_user() only reads the user from the database once
+        """
+        with self.assertNumQueries(1):
+            LoginService.get_authenticated_user(self.access)
+            user = LoginService.get_authenticated_user(self.access)
+
+        self.assertEqual(user.id, self.user.id)
+        self.assertEqual(UserCache.stats()['hits'], 1)
+        self.assertEqual(UserCache.stats()['misses'], 1)
+        self.assertEqual(UserCache.stats()['hit_rate'], 0.5)
+
+    def test_middleware_uses_cache(self):
+        """
+        Test repeated requests with the same token reuse the cached user
+        """
+        self.client.credentials(HTTP_AUTHORIZATION='JWT ' + self.access)
+        self.client.get('/api/grocerylist/')
+        self.client.get('/api/grocerylist/')
+
+        self.assertEqual(UserCache.stats()['hits'], 1)
+
+    def test_update_invalidates(self):
+        """
+        Test UserService.update() drops the cached user
+        """
+        LoginService.get_authenticated_user(self.access)
+        UserService.update(self.user.id, {'first_name': 'Baxter'})
+
+        user = LoginService.get_authenticated_user(self.access)
+        self.assertEqual(user.first_name, 'Baxter')
+
+    def test_delete_invalidates(self):
+        """
+        Test UserService.delete() drops the cached user
+        """
+        LoginService.get_authenticated_user(self.access)
+        UserService.delete(self.user.id)
+
+        with self.assertRaises(User.DoesNotExist):
+            LoginService.get_authenticated_user(self.access)
+
+    def test_password_change_invalidates(self):
+        """
+        Test a password change drops the cached user
+        """
+        user = LoginService.get_authenticated_user(self.access)
+        PasswordChangeService.change_password(user, {
+            'current_password': 'Pass123!',
+            'new_password1': 'NewPass456!',
+            'new_password2': 'NewPass456!',
+        })
+
+        self.assertEqual(UserCache.stats()['size'], 0)
+        self.assertTrue(LoginService.get_authenticated_user(self.access).check_password('NewPass456!'))
+
+    def test_health_logs_stats(self):
+        """
+        Test the unauthenticated health check logs user cache metrics instead of returning them
+        """
+        with self.assertLogs('grocery_list.apis.health', level='INFO') as logs:
+            response = self.client.get('/api/health/')
+        self.assertNotIn('user_cache', response.json())
+        self.assertIn('hit_rate', logs.output[0])
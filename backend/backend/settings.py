@@ -114,6 +114,12 @@ DATABASES = {
     }
 }
 
+# Token buckets shared by all processes, see common.rate_limit
+RATE_LIMIT_DB = env('RATE_LIMIT_DB', default=str(BASE_DIR / 'backend' / 'instance' / 'rate_limits.sqlite3'))
+
+# Recipe pages fetched by the URL scanner, see recipe.services.page_fetcher
+SCAN_CACHE_DIR = env('SCAN_CACHE_DIR', default=str(BASE_DIR / 'backend' / 'instance' / 'scan_cache'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -1,6 +1,7 @@
 from django.urls import path, include
 
 from accounts import urls as accounts_urls
+from accounts.apis import AccountExportAPI
 from grocery_list import urls as grocery_list_urls
 from grocery_list.apis import HealthAPI
 from ingredient import urls as ingredient_urls
@@ -16,4 +17,6 @@ urlpatterns = [
     path('api/pantry/', include(pantry_urls)),
     path('api/recipes/', include(recipe_urls)),
     path('api/health/', HealthAPI.check),
+    # Outside /api/accounts/ so the JWT middleware authenticates it
+    path('api/export/', AccountExportAPI.export),
 ]
@@ -0,0 +1,135 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+class CursorPaginator:
+    """
+    Keyset (cursor) pagination over a fixed ordering
+
+    The ordering must end in a unique field (normally the primary key) so every
+    row has a distinct position. The cursor is an opaque token holding the
+    ordering values of the last row on the previous page, so fetching any page
+    is a single indexed range query no matter how deep it is.
+    """
+
+    def __init__(self, ordering: List[str], default_page_size: int = DEFAULT_PAGE_SIZE,
+                 max_page_size: int = MAX_PAGE_SIZE):
+        self.ordering = ordering
+        self.default_page_size = default_page_size
+        self.max_page_size = max_page_size
+
+    def page_size(self, requested: Optional[int] = None) -> int:
+        """Clamp a requested page size to the paginator's cap"""
+        if not requested:
+            return self.default_page_size
+        return max(1, min(int(requested), self.max_page_size))
+
+    def paginate(self, queryset, cursor: Optional[str] = None,
+                 page_size: Optional[int] = None) -> Tuple[List, Optional[str]]:
+        """
+        Return the rows of one page and the cursor for the next page,
+        or None when this is the last page
+        """
+        size = self.page_size(page_size)
+        queryset = queryset.order_by(*self.ordering)
+        if cursor:
+            queryset = queryset.filter(self.__after(self.decode_cursor(cursor, queryset.model)))
+
+        rows = list(queryset[:size + 1])
+        if len(rows) <= size:
+            return rows, None
+
+        rows = rows[:size]
+        return rows, self.encode_cursor(self.__position(rows[-1]))
+
+    def encode_cursor(self, values: List) -> str:
+        payload = json.dumps([
+            value.isoformat() if isinstance(value, (date, datetime)) else value
+            for value in values
+        ])
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, cursor: str, model=None) -> List:
+        """
+        Decode a cursor's values, converting them with the model's fields when
+        a model is given so tampered cursors fail here rather than in the query
+        """
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        except (binascii.Error, ValueError, UnicodeError):
+            raise ValueError("Invalid cursor")
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise ValueError("Invalid cursor")
+        if model is None:
+            return values
+
+        decoded = []
+        for field, value in zip(self.ordering, values):
+            # Ordering fields are never NULL at a cursor position, and NULLs can't be compared
+            if value is None:
+                raise ValueError("Invalid cursor")
+            try:
+                decoded.append(self.__field(model, field).to_python(value))
+            except (ValidationError, TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+        return decoded
+
+    def __field(self, model, field: str):
+        # Follow relations, e.g. 'ingredient__name', to the field being ordered by
+        names = field.lstrip('-').split('__')
+        for name in names[:-1]:
+            model = model._meta.get_field(name).related_model
+        return model._meta.get_field(names[-1])
+
+    def __position(self, obj) -> List:
+        values = []
+        for field in self.ordering:
+            value = obj
+            for attr in field.lstrip('-').split('__'):
+                value = getattr(value, attr)
+            values.append(value)
+        return values
+
+    def __after(self, values: List) -> Q:
+        # (a, b, c) > (x, y, z)  ==  a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+        condition = Q()
+        for i, field in enumerate(self.ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            clause = Q(**{f'{name}__{lookup}': values[i]})
+            for prev_field, prev_value in zip(self.ordering[:i], values[:i]):
+                clause &= Q(**{prev_field.lstrip('-'): prev_value})
+            condition |= clause
+        return condition
+
+def get_pagination_params(request) -> Optional[Tuple[Optional[str], Optional[int]]]:
+    """
+    Read the cursor and page_size query parameters from a request
+
+    Returns None when the client did not ask for a page, so list endpoints can
+    keep returning a plain array to existing callers.
+    """
+    if 'cursor' not in request.GET and 'page_size' not in request.GET:
+        return None
+
+    page_size = request.GET.get('page_size')
+    if page_size:
+        try:
+            page_size = int(page_size)
+        except ValueError:
+            raise ValueError("page_size must be an integer")
+    return request.GET.get('cursor') or None, page_size or None
+
+def paginated_response(results, next_cursor: Optional[str]) -> Dict:
+    return {
+        "results": results,
+        "next_cursor": next_cursor
+    }
@@ -0,0 +1,113 @@
+import sqlite3
+import threading
+import time
+from typing import Dict
+
+from django.conf import settings
+
+# Buckets untouched for this long are full again and can be forgotten
+IDLE_BUCKET_SECONDS = 24 * 60 * 60
+
+_local = threading.local()
+
+class RateLimited(Exception):
+    """Raised when a rate limit has no tokens left"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class RateLimiter:
+    """
+    Token buckets shared by every process through a SQLite file
+
+    Each key has a bucket holding up to `capacity` tokens that refills over
+    `period` seconds. Taking a token runs in a BEGIN IMMEDIATE transaction,
+    so gunicorn and scan worker processes never hand out the same token, and
+    callers get the wait time back instead of being put to sleep.
+    The file is settings.RATE_LIMIT_DB.
+    """
+
+    @staticmethod
+    def acquire(key: str, capacity: int, period: float) -> float:
+        """
+        Take a token from a bucket
+
+        Args:
+            key: The bucket, e.g. "scan-domain:example.com"
+            capacity: The most tokens the bucket holds, i.e. the allowed burst
+            period: Seconds for an empty bucket to refill
+
+        Returns:
+            0 if a token was taken, otherwise the seconds until one is available
+        """
+        rate = capacity / period
+        now = time.time()
+        connection = RateLimiter.__connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT tokens, updated_at FROM rate_limit_bucket WHERE key = ?", (key,)
+            ).fetchone()
+            tokens = capacity if row is None else min(capacity, row[0] + max(0.0, now - row[1]) * rate)
+
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / rate
+
+            connection.execute(
+                "INSERT INTO rate_limit_bucket (key, tokens, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                (key, tokens, now)
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return wait
+
+    @staticmethod
+    def check(key: str, capacity: int, period: float, message: str) -> None:
+        """
+        Take a token from a bucket, raising RateLimited if there is none
+        """
+        wait = RateLimiter.acquire(key, capacity, period)
+        if wait:
+            raise RateLimited(message, retry_after=wait)
+
+    @staticmethod
+    def purge_idle(max_age: float = IDLE_BUCKET_SECONDS) -> int:
+        """
+        Delete buckets that haven't been used in max_age seconds
+        """
+        connection = RateLimiter.__connection()
+        return connection.execute(
+            "DELETE FROM rate_limit_bucket WHERE updated_at < ?", (time.time() - max_age,)
+        ).rowcount
+
+    @staticmethod
+    def reset() -> None:
+        """
+        Refill every bucket, for tests
+        """
+        RateLimiter.__connection().execute("DELETE FROM rate_limit_bucket")
+
+    @staticmethod
+    def __connection() -> sqlite3.Connection:
+        """
+        Helper method to get this thread's connection to the bucket file, creating the table on first use
+        """
+        path = str(settings.RATE_LIMIT_DB)
+        connections: Dict[str, sqlite3.Connection] = _local.__dict__.setdefault('connections', {})
+        if path not in connections:
+            # Autocommit mode, so the explicit BEGIN IMMEDIATE above is the only transaction
+            connection = sqlite3.connect(path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_bucket "
+                "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            connections[path] = connection
+        return connections[path]
@@ -0,0 +1,58 @@
+import json
+from typing import Dict, Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+DEFAULT_CHUNK_SIZE = 200
+
+def stream_json_array(queryset, serializer_class, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yield a queryset as a JSON array, one serialized chunk at a time
+
+    Rows are read with a server-side iterator, so only one chunk of model
+    instances and one chunk of serialized data are held in memory. Any
+    prefetch_related lookups on the queryset are applied per chunk.
+    """
+    encoder = DjangoJSONEncoder()
+    yield '['
+    first = True
+    chunk = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield from _encode_chunk(encoder, serializer_class, chunk, first)
+            first = False
+            chunk = []
+    if chunk:
+        yield from _encode_chunk(encoder, serializer_class, chunk, first)
+    yield ']'
+
+def stream_json_object(sections: Dict[str, Iterable[str]]) -> Iterator[str]:
+    """
+    Yield a JSON object whose values are produced by other JSON streams,
+    such as those returned by stream_json_array
+    """
+    yield '{'
+    for i, (key, stream) in enumerate(sections.items()):
+        if i:
+            yield ','
+        yield json.dumps(key) + ':'
+        yield from stream
+    yield '}'
+
+def _encode_chunk(encoder, serializer_class, chunk, first) -> Iterator[str]:
+    data = serializer_class(chunk, many=True).data
+    for i, row in enumerate(data):
+        yield ('' if first and i == 0 else ',') + encoder.encode(row)
+
+class StreamingJsonResponse(StreamingHttpResponse):
+    """Streaming response for JSON produced by the stream_json_* generators"""
+
+    def __init__(self, streaming_content, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(streaming_content, **kwargs)
+
+def wants_stream(request) -> bool:
+    """Whether the client asked for a streamed response with ?stream=true"""
+    return request.GET.get('stream', '').lower() in ('1', 'true', 'yes')
@@ -0,0 +1,76 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from common.pagination import CursorPaginator
+from ingredient.models import Ingredient
+from recipe.models import Recipe
+
+User = get_user_model()
+
+class CursorPaginatorTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpassword'
+        )
+
+    def _collect(self, paginator, queryset, page_size):
+        """Walk every page and return the ids in order, plus the page count"""
+        ids, pages, cursor = [], 0, None
+        while True:
+            rows, cursor = paginator.paginate(queryset, cursor, page_size)
+            ids.extend(row.id for row in rows)
+            pages += 1
+            if cursor is None:
+                return ids, pages
+
+    def test_ascending_pages_cover_all_rows(self):
+        """Test walking ascending pages returns every row once in order"""
+        # bulk_create leaves normalized_name empty, so the duplicate name is allowed
+        Ingredient.objects.bulk_create([
+            Ingredient(name=name) for name in ['Pear', 'Apple', 'Fig', 'Banana', 'Date', 'Cherry', 'Apple']
+        ])
+        paginator = CursorPaginator(ordering=['name', 'id'])
+
+        ids, pages = self._collect(paginator, Ingredient.objects.all(), 2)
+
+        expected = list(Ingredient.objects.order_by('name', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 4)
+
+    def test_descending_pages_with_equal_timestamps(self):
+        """Test rows sharing an ordering value are split across pages by the tie-breaker"""
+        for i in range(5):
+            Recipe.objects.create(title=f'Recipe {i}', user=self.user)
+        first = Recipe.objects.order_by('id').first()
+        Recipe.objects.update(created_at=first.created_at)
+        paginator = CursorPaginator(ordering=['-created_at', '-id'])
+
+        ids, pages = self._collect(paginator, Recipe.objects.all(), 2)
+
+        expected = list(Recipe.objects.order_by('-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+    def test_page_size_is_capped(self):
+        """Test requested page sizes are clamped to the maximum"""
+        paginator = CursorPaginator(ordering=['name', 'id'], default_page_size=10, max_page_size=20)
+        self.assertEqual(paginator.page_size(None), 10)
+        self.assertEqual(paginator.page_size(5), 5)
+        self.assertEqual(paginator.page_size(1000), 20)
+
+    def test_invalid_cursor(self):
+        """Test a malformed cursor raises ValueError"""
+        paginator = CursorPaginator(ordering=['name', 'id'])
+        with self.assertRaises(ValueError):
+            paginator.paginate(Ingredient.objects.all(), 'not-a-cursor')
+        with self.assertRaises(ValueError):
+            paginator.paginate(Ingredient.objects.all(), paginator.encode_cursor(['only one value']))
+
+    def test_tampered_cursor(self):
+        """Test cursor values that don't fit the ordering fields raise ValueError"""
+        paginator = CursorPaginator(ordering=['-created_at', 'id'])
+        for values in [['notadate', 1], [{'a': 1}, 1], ['2024-01-01T00:00:00', 'abc'], [None, 1]]:
+            with self.assertRaises(ValueError):
+                paginator.paginate(Recipe.objects.all(), paginator.encode_cursor(values))
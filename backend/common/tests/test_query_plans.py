@@ -0,0 +1,107 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from grocery_list.models import GroceryList, GroceryListItem
+from grocery_list.services import GroceryListItemService, GroceryListService
+from ingredient.models import Ingredient
+from ingredient.services import IngredientSearchService, IngredientService
+from pantry.models import PantryItem
+from pantry.services import PantryItemService
+from recipe.models import Recipe, RecipeItem
+from recipe.services import RecipeItemService, RecipeMatchService, RecipeService
+
+User = get_user_model()
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite specific')
+class QueryPlanTests(TestCase):
+    """
+    Checks the hot service queries are answered from the indexes added for them
+    """
+
+    def setUp(self):
+        RecipeMatchService.invalidate()
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.ingredients = [Ingredient.objects.create(name=name) for name in ['Flour', 'Eggs', 'Milk']]
+
+        self.recipe = Recipe.objects.create(title='Pancakes', user=self.user)
+        self.grocery_list = GroceryList.objects.create(title='Weekly', user=self.user)
+        for ingredient in self.ingredients:
+            RecipeItem.objects.create(recipe=self.recipe, ingredient=ingredient)
+            GroceryListItem.objects.create(grocery_list=self.grocery_list, ingredient=ingredient, purchased=True)
+            PantryItem.objects.create(user=self.user, ingredient=ingredient)
+
+    def tearDown(self):
+        RecipeMatchService.invalidate()
+
+    def _plan(self, call):
+        """
+        Run call and return the EXPLAIN QUERY PLAN details of every SELECT it made
+        """
+        with CaptureQueriesContext(connection) as queries:
+            call()
+        details = []
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                if query['sql'].startswith('SELECT'):
+                    cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+                    details.extend(row[-1] for row in cursor.fetchall())
+        return details
+
+    def assertUsesIndex(self, call, index):
+        """
+        Assert one of call's queries searched an index whose name starts with index
+        """
+        details = self._plan(call)
+        self.assertTrue(
+            any(f'INDEX {index}' in detail for detail in details),
+            f'{index} not used:\n' + '\n'.join(details)
+        )
+
+    def test_pantry_add_grocery_list(self):
+        """Test moving a grocery list to the pantry searches purchased items and pantry rows by index"""
+        call = lambda: PantryItemService.add_grocery_list_to_pantry(self.grocery_list.id, self.user.id)
+        self.assertUsesIndex(call, 'grocery_item_list_purch_idx')
+        self.assertUsesIndex(call, 'pantry_user_ingredient_idx')
+
+    def test_grocery_list_merge_items(self):
+        """Test merging into a grocery list reads its items by index"""
+        entries = [{"ingredient": self.ingredients[0], "quantity": 1}]
+        self.assertUsesIndex(
+            lambda: GroceryListItemService.merge_items(self.grocery_list.id, entries), 'grocery_item_list_'
+        )
+
+    def test_grocery_list_page(self):
+        """Test paging a user's grocery lists walks the (user, created_at) index"""
+        self.assertUsesIndex(
+            lambda: GroceryListService.list_page(user_id=self.user.id, summary=True), 'grocery_list_user_created_idx'
+        )
+
+    def test_recipe_items_list(self):
+        """Test listing a recipe's items searches by index"""
+        self.assertUsesIndex(lambda: RecipeItemService.list(self.recipe.id), 'recipe_item_recipe_ingr_idx')
+
+    def test_recipe_page(self):
+        """Test paging a user's recipes walks the (user, created_at) index"""
+        self.assertUsesIndex(lambda: RecipeService.list_page(user_id=self.user.id), 'recipe_user_created_idx')
+
+    def test_cookable(self):
+        """Test matching recipes reads the user's pantry by index"""
+        self.assertUsesIndex(lambda: RecipeMatchService.cookable(self.user.id), 'pantry_user_ingredient_idx')
+
+    def test_ingredient_page(self):
+        """Test paging ingredients by name walks the name index"""
+        self.assertUsesIndex(lambda: IngredientService.list_page(), 'ingredient_name_idx')
+
+    def test_ingredient_prefix_search(self):
+        """Test short search queries use the lowercase name index"""
+        self.assertUsesIndex(lambda: IngredientSearchService.search('fl'), 'ingredient_name_lower_idx')
+
+    def test_ingredient_match_names(self):
+        """Test resolving names searches the unique normalized_name index"""
+        self.assertUsesIndex(
+            lambda: IngredientService.match_names(['eggs', 'flour']), 'sqlite_autoindex_ingredient_ingredient_1'
+        )
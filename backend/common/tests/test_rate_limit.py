@@ -0,0 +1,74 @@
+import os
+import tempfile
+import threading
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from common.rate_limit import RateLimited, RateLimiter
+
+@override_settings(RATE_LIMIT_DB=':memory:')
+class RateLimiterTests(SimpleTestCase):
+    def setUp(self):
+        RateLimiter.reset()
+
+    def test_acquire_burst(self):
+        """Test a bucket allows its capacity and then reports the wait"""
+        with patch('common.rate_limit.time.time', return_value=1000.0):
+            for _ in range(3):
+                self.assertEqual(RateLimiter.acquire('test', 3, 60), 0)
+            self.assertAlmostEqual(RateLimiter.acquire('test', 3, 60), 20.0)
+
+    def test_acquire_refill(self):
+        """Test tokens come back as time passes, up to the capacity"""
+        with patch('common.rate_limit.time.time', return_value=1000.0):
+            RateLimiter.acquire('test', 2, 60)
+            RateLimiter.acquire('test', 2, 60)
+        with patch('common.rate_limit.time.time', return_value=1030.0):
+            self.assertEqual(RateLimiter.acquire('test', 2, 60), 0)
+            self.assertGreater(RateLimiter.acquire('test', 2, 60), 0)
+        with patch('common.rate_limit.time.time', return_value=5000.0):
+            self.assertEqual(RateLimiter.acquire('test', 2, 60), 0)
+            self.assertEqual(RateLimiter.acquire('test', 2, 60), 0)
+            self.assertGreater(RateLimiter.acquire('test', 2, 60), 0)
+
+    def test_keys_are_independent(self):
+        """Test an empty bucket doesn't affect other keys"""
+        RateLimiter.acquire('slow.example.com', 1, 60)
+        self.assertGreater(RateLimiter.acquire('slow.example.com', 1, 60), 0)
+        self.assertEqual(RateLimiter.acquire('fast.example.com', 1, 60), 0)
+
+    def test_check(self):
+        """Test check raises with the wait once the bucket is empty"""
+        RateLimiter.check('test', 1, 60, message="Slow down")
+        with self.assertRaises(RateLimited) as context:
+            RateLimiter.check('test', 1, 60, message="Slow down")
+        self.assertEqual(str(context.exception), "Slow down")
+        self.assertGreater(context.exception.retry_after, 0)
+
+    def test_purge_idle(self):
+        """Test only buckets unused for the max age are deleted"""
+        with patch('common.rate_limit.time.time', return_value=1000.0):
+            RateLimiter.acquire('old', 1, 60)
+        RateLimiter.acquire('recent', 1, 60)
+        self.assertEqual(RateLimiter.purge_idle(max_age=60), 1)
+
+    def test_shared_between_connections(self):
+        """Test separate connections to the file share the buckets"""
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(RATE_LIMIT_DB=os.path.join(directory, 'rate_limits.sqlite3')):
+                waits = []
+
+                def take_tokens():
+                    # Each thread opens its own connection, like a separate process
+                    for _ in range(5):
+                        waits.append(RateLimiter.acquire('shared', 10, 60))
+
+                threads = [threading.Thread(target=take_tokens) for _ in range(4)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+                self.assertEqual(waits.count(0), 10)
+                self.assertEqual(len(waits), 20)
@@ -0,0 +1,61 @@
+import json
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from common.streaming import stream_json_array, stream_json_object
+from ingredient.models import Ingredient, IngredientCategory
+from ingredient.serializers import IngredientSerializer
+from recipe.models import Recipe
+from recipe.services import RecipeService
+
+User = get_user_model()
+
+class StreamingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpassword'
+        )
+        category = IngredientCategory.objects.create(name='Produce')
+        for i in range(7):
+            ingredient = Ingredient.objects.create(name=f'Ingredient {i}')
+            ingredient.categories.add(category)
+
+    def test_stream_json_array_matches_serializer(self):
+        """Test a streamed array decodes to the same data as the serializer"""
+        queryset = Ingredient.objects.order_by('name').prefetch_related('categories')
+        streamed = ''.join(stream_json_array(queryset, IngredientSerializer, chunk_size=3))
+        self.assertEqual(json.loads(streamed), json.loads(json.dumps(IngredientSerializer(queryset, many=True).data)))
+
+    def test_stream_json_array_queries_per_chunk(self):
+        """Test prefetches run once per chunk rather than once per row"""
+        queryset = Ingredient.objects.order_by('name').prefetch_related('categories')
+        # 7 rows in chunks of 3: one rows query plus one prefetch query per chunk
+        with self.assertNumQueries(4):
+            ''.join(stream_json_array(queryset, IngredientSerializer, chunk_size=3))
+
+    def test_stream_json_empty(self):
+        """Test empty querysets and objects stream valid JSON"""
+        streamed = ''.join(stream_json_array(Ingredient.objects.none(), IngredientSerializer))
+        self.assertEqual(json.loads(streamed), [])
+        streamed = ''.join(stream_json_object({'a': iter(['1']), 'b': iter(['[]'])}))
+        self.assertEqual(json.loads(streamed), {'a': 1, 'b': []})
+
+    def test_stream_recipes(self):
+        """Test RecipeService.stream matches RecipeService.list"""
+        for i in range(3):
+            Recipe.objects.create(title=f'Recipe {i}', user=self.user)
+        streamed = json.loads(''.join(RecipeService.stream(user_id=self.user.id)))
+        self.assertEqual(streamed, json.loads(json.dumps(RecipeService.list(user_id=self.user.id), default=str)))
+
+    def test_streaming_list_endpoint(self):
+        """Test ?stream=true returns a streaming response"""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'JWT {RefreshToken.for_user(self.user).access_token}')
+        response = client.get('/api/ingredients/?stream=true')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(len(json.loads(b''.join(response.streaming_content))), 7)
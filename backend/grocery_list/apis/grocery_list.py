@@ -3,6 +3,8 @@ import logging
 from django.http import JsonResponse
 from typing import Dict
 
+from common.pagination import get_pagination_params
+from common.streaming import StreamingJsonResponse, wants_stream
 from ..services import GroceryListService
 
 logger = logging.getLogger(__name__)
@@ -15,7 +17,18 @@ class GroceryListAPI:
             logger.info('grocery_list method "list" called')
             # Get user-specific lists if user is authenticated
             user_id = request.user.id if hasattr(request, 'user') and request.user.is_authenticated else None
-            return JsonResponse(GroceryListService.list(user_id=user_id), safe=False)
+            # Summary mode omits nested items for list views that only show counts
+            summary = request.GET.get('summary', '').lower() in ('1', 'true', 'yes')
+            if wants_stream(request):
+                return StreamingJsonResponse(GroceryListService.stream(user_id=user_id, summary=summary))
+            try:
+                pagination = get_pagination_params(request)
+                if pagination is not None:
+                    cursor, page_size = pagination
+                    return JsonResponse(GroceryListService.list_page(user_id=user_id, summary=summary, cursor=cursor, page_size=page_size))
+            except ValueError as e:
+                return JsonResponse({"error": str(e)}, status=400)
+            return JsonResponse(GroceryListService.list(user_id=user_id, summary=summary), safe=False)
         elif request.method == 'POST':
             logger.info('grocery_list method "create" called')
             data = json.loads(request.body.decode("utf-8"))
@@ -2,6 +2,8 @@ import logging
 from django.http import JsonResponse
 from django.db import connection
 
+from accounts.services import UserCache
+
 logger = logging.getLogger(__name__)
 
 class HealthAPI:
@@ -9,7 +11,8 @@ class HealthAPI:
     @staticmethod
     def check(request):
         if request.method == 'GET':
-            logger.info('health check endpoint called')
+            # Cache metrics go to the log only; this endpoint is unauthenticated
+            logger.info(f'health check endpoint called, user cache: {UserCache.stats()}')
             
             # Check database connection
             try:
@@ -0,0 +1,39 @@
+# Generated by Django 5.2 on 2026-10-18 12:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grocery_list', '0004_alter_grocerylistitem_quantity'),
+        ('ingredient', '0007_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='grocerylist',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='grocery_lists', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='grocerylistitem',
+            name='grocery_list',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='items', to='grocery_list.grocerylist'),
+        ),
+        migrations.AddIndex(
+            model_name='grocerylist',
+            index=models.Index(fields=['user', '-created_at'], name='grocery_list_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grocerylistitem',
+            index=models.Index(fields=['grocery_list', 'ingredient'], name='grocery_item_list_ingr_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grocerylistitem',
+            index=models.Index(fields=['grocery_list', 'purchased'], name='grocery_item_list_purch_idx'),
+        ),
+    ]
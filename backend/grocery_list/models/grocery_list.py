@@ -9,13 +9,17 @@ class GroceryList(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name='grocery_lists',
-        null=True  # Making it nullable for backward compatibility
+        null=True,  # Making it nullable for backward compatibility
+        db_index=False  # Covered by grocery_list_user_created_idx
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='grocery_list_user_created_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -6,7 +6,8 @@ class GroceryListItem(models.Model):
     grocery_list = models.ForeignKey(
         GroceryList,
         on_delete=models.CASCADE,
-        related_name='items'
+        related_name='items',
+        db_index=False  # Covered by the grocery_item_list_* indexes
     )
     ingredient = models.ForeignKey(
         Ingredient,
@@ -22,5 +23,12 @@ class GroceryListItem(models.Model):
     purchased = models.BooleanField(default=False)
     notes = models.TextField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # Items are merged per ingredient and counted or moved to the pantry by purchased state
+            models.Index(fields=['grocery_list', 'ingredient'], name='grocery_item_list_ingr_idx'),
+            models.Index(fields=['grocery_list', 'purchased'], name='grocery_item_list_purch_idx'),
+        ]
+
     def __str__(self):
         return f"{self.quantity} {self.unit or ''} {self.ingredient.name}"
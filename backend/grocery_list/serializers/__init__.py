@@ -1,2 +1,2 @@
-from .grocery_list import GroceryListSerializer
+from .grocery_list import GroceryListSerializer, GroceryListSummarySerializer
 from .grocery_list_item import GroceryListItemSerializer
\ No newline at end of file
@@ -2,21 +2,31 @@ from rest_framework import serializers
 from ..models import GroceryList
 from .grocery_list_item import GroceryListItemSerializer
 
-class GroceryListSerializer(serializers.ModelSerializer):
-    items = GroceryListItemSerializer(many=True, read_only=True)
+class GroceryListSummarySerializer(serializers.ModelSerializer):
     item_count = serializers.SerializerMethodField()
     purchased_count = serializers.SerializerMethodField()
 
     class Meta:
         model = GroceryList
-        fields = ['id', 'title', 'description', 'completed', 'user', 'created_at', 'updated_at', 'items', 'item_count', 'purchased_count']
+        fields = ['id', 'title', 'description', 'completed', 'user', 'created_at', 'updated_at', 'item_count', 'purchased_count']
         extra_kwargs = {
             "description": {"required": False, "allow_blank": True, "allow_null": True},
             "user": {"required": False}
         }
 
     def get_item_count(self, obj):
+        # Use the counts annotated by GroceryListQueryPlan when available
+        if hasattr(obj, 'annotated_item_count'):
+            return obj.annotated_item_count
         return obj.items.count()
 
     def get_purchased_count(self, obj):
-        return obj.items.filter(purchased=True).count()
\ No newline at end of file
+        if hasattr(obj, 'annotated_purchased_count'):
+            return obj.annotated_purchased_count
+        return obj.items.filter(purchased=True).count()
+
+class GroceryListSerializer(GroceryListSummarySerializer):
+    items = GroceryListItemSerializer(many=True, read_only=True)
+
+    class Meta(GroceryListSummarySerializer.Meta):
+        fields = ['id', 'title', 'description', 'completed', 'user', 'created_at', 'updated_at', 'items', 'item_count', 'purchased_count']
@@ -1,2 +1,3 @@
 from .grocery_list import GroceryListService
-from .grocery_list_item import GroceryListItemService
\ No newline at end of file
+from .grocery_list_item import GroceryListItemService
+from .query_plan import GroceryListQueryPlan
\ No newline at end of file
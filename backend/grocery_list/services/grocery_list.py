@@ -1,22 +1,40 @@
-from typing import Dict
+from typing import Dict, Iterator, Optional
 
+from common.pagination import CursorPaginator, paginated_response
+from common.streaming import stream_json_array
 from ..models import GroceryList
-from ..serializers import GroceryListSerializer
+from ..serializers import GroceryListSerializer, GroceryListSummarySerializer
+from .query_plan import GroceryListQueryPlan
+
+# Matches GroceryList.Meta.ordering, with id as a tie-breaker
+GROCERY_LIST_PAGINATOR = CursorPaginator(ordering=['-created_at', '-id'])
 
 class GroceryListService:
 
     @staticmethod
-    def list(user_id=None) -> Dict:
-        if user_id:
-            grocery_lists = GroceryList.objects.filter(user_id=user_id)
-        else:
-            grocery_lists = GroceryList.objects.all()
-        serializer = GroceryListSerializer(grocery_lists, many=True)
+    def list(user_id=None, summary=False) -> Dict:
+        grocery_lists = GroceryListService.__for_user(user_id, summary)
+        serializer_class = GroceryListSummarySerializer if summary else GroceryListSerializer
+        serializer = serializer_class(grocery_lists, many=True)
         return serializer.data
 
+    @staticmethod
+    def list_page(user_id=None, summary=False, cursor: Optional[str] = None, page_size: Optional[int] = None) -> Dict:
+        grocery_lists = GroceryListService.__for_user(user_id, summary)
+        page, next_cursor = GROCERY_LIST_PAGINATOR.paginate(grocery_lists, cursor, page_size)
+        serializer_class = GroceryListSummarySerializer if summary else GroceryListSerializer
+        serializer = serializer_class(page, many=True)
+        return paginated_response(serializer.data, next_cursor)
+
+    @staticmethod
+    def stream(user_id=None, summary=False) -> Iterator[str]:
+        grocery_lists = GroceryListService.__for_user(user_id, summary)
+        serializer_class = GroceryListSummarySerializer if summary else GroceryListSerializer
+        return stream_json_array(grocery_lists, serializer_class)
+
     @staticmethod
     def get(id) -> Dict:
-        grocery_list = GroceryListService.__get(id=id)
+        grocery_list = GroceryListQueryPlan.grocery_lists(GroceryList.objects.filter(id=id)).first()
         serializer = GroceryListSerializer(grocery_list)
         return serializer.data
 
@@ -45,6 +63,14 @@ class GroceryListService:
         grocery_list.delete()
         return {"status_code": 200}
 
+    @staticmethod
+    def __for_user(user_id=None, summary=False):
+        if user_id:
+            grocery_lists = GroceryList.objects.filter(user_id=user_id)
+        else:
+            grocery_lists = GroceryList.objects.all()
+        return GroceryListQueryPlan.grocery_lists(grocery_lists, summary=summary)
+
     @staticmethod
     def __get(id=id):
         return GroceryList.objects.filter(id=id).first()
\ No newline at end of file
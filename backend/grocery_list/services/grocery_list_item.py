@@ -1,14 +1,22 @@
-from typing import Dict
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterable, List
 
+from django.db import transaction
+
+from measurement.services.unit_conversion import try_convert_units
 from ..models import GroceryListItem
 from ..serializers import GroceryListItemSerializer
+from .query_plan import GroceryListQueryPlan
 
 class GroceryListItemService:
 
     @staticmethod
     def list(grocery_list_id) -> Dict:
         # Get items sorted by ingredient name for consistent ordering
-        items = GroceryListItem.objects.filter(grocery_list_id=grocery_list_id).order_by('ingredient__name')
+        items = GroceryListQueryPlan.grocery_list_items(
+            GroceryListItem.objects.filter(grocery_list_id=grocery_list_id).order_by('ingredient__name')
+        )
         serializer = GroceryListItemSerializer(items, many=True)
         return serializer.data
 
@@ -39,6 +47,64 @@ class GroceryListItemService:
         item.delete()
         return {"status_code": 200}
 
+    @staticmethod
+    def merge_items(grocery_list_id, entries: Iterable[Dict]) -> List[GroceryListItem]:
+        """
+        Merge quantities into a grocery list in one set-based pass
+
+        The list's existing items are loaded once and each entry is folded into
+        an item for the same ingredient, converting the entry to that item's unit
+        when they differ. Entries whose unit can't be converted to any existing
+        item's unit become a new item. All writes happen in one transaction.
+
+        Args:
+            grocery_list_id: The ID of the grocery list to merge into
+            entries: Dicts with an "ingredient" (Ingredient instance), "quantity",
+                and optional "unit" and "notes"
+
+        Returns:
+            The grocery list items that were updated or created
+        """
+        existing_items = GroceryListItem.objects.filter(
+            grocery_list_id=grocery_list_id
+        ).order_by('id')
+
+        items_by_ingredient = defaultdict(list)
+        for item in existing_items:
+            items_by_ingredient[item.ingredient_id].append(item)
+
+        updated_items = {}
+        new_items = []
+        for entry in entries:
+            ingredient = entry['ingredient']
+            quantity = Decimal(str(entry['quantity']))
+            unit = entry.get('unit')
+
+            for item in items_by_ingredient[ingredient.id]:
+                converted = try_convert_units(quantity, unit, item.unit, ingredient.name, density=ingredient.density)
+                if converted is not None:
+                    item.quantity += converted
+                    if item.pk:
+                        updated_items[item.pk] = item
+                    break
+            else:
+                item = GroceryListItem(
+                    grocery_list_id=grocery_list_id,
+                    ingredient=ingredient,
+                    quantity=quantity,
+                    unit=unit,
+                    notes=entry.get('notes'),
+                    purchased=False
+                )
+                items_by_ingredient[ingredient.id].append(item)
+                new_items.append(item)
+
+        with transaction.atomic():
+            GroceryListItem.objects.bulk_update(updated_items.values(), ['quantity'])
+            GroceryListItem.objects.bulk_create(new_items)
+
+        return list(updated_items.values()) + new_items
+
     @staticmethod
     def __get(id=id):
         return GroceryListItem.objects.filter(id=id).first()
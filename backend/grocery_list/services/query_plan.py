@@ -0,0 +1,37 @@
+from django.db.models import Count, Prefetch, Q
+
+from ..models import GroceryList, GroceryListItem
+
+class GroceryListQueryPlan:
+    """
+    Builds grocery list querysets shaped for the serializer that will render them,
+    so counts and nested items are loaded in a fixed number of queries
+    """
+
+    @staticmethod
+    def grocery_lists(queryset=None, summary=False):
+        """
+        Queryset for GroceryListSerializer, or GroceryListSummarySerializer when
+        summary is set: item and purchased counts are annotated, and items are
+        prefetched with their ingredient and categories unless summarizing
+        """
+        if queryset is None:
+            queryset = GroceryList.objects.all()
+        queryset = queryset.annotate(
+            annotated_item_count=Count('items', distinct=True),
+            annotated_purchased_count=Count('items', filter=Q(items__purchased=True), distinct=True),
+        )
+        if summary:
+            return queryset
+        return queryset.prefetch_related(
+            Prefetch('items', queryset=GroceryListQueryPlan.grocery_list_items())
+        )
+
+    @staticmethod
+    def grocery_list_items(queryset=None):
+        """
+        Queryset for GroceryListItemSerializer: ingredient joined, categories prefetched
+        """
+        if queryset is None:
+            queryset = GroceryListItem.objects.all()
+        return queryset.select_related('ingredient').prefetch_related('ingredient__categories')
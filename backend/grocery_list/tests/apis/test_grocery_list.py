@@ -1,3 +1,4 @@
+import base64
 import json
 from django.test import TestCase
 from django.contrib.auth import get_user_model
@@ -113,3 +114,33 @@ class GroceryListAPITest(TestCase):
         # Check that the grocery list was deleted
         with self.assertRaises(GroceryList.DoesNotExist):
             GroceryList.objects.get(id=self.grocery_list.id)
+
+    def test_list_grocery_lists_paginated(self):
+        """Test retrieving grocery lists one page at a time"""
+        for i in range(3):
+            GroceryList.objects.create(title=f'Extra List {i}', user=self.user)
+
+        response = self.client.get('/api/grocerylist/?page_size=3&summary=true')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(len(data['results']), 3)
+        self.assertIsNotNone(data['next_cursor'])
+
+        response = self.client.get(f"/api/grocerylist/?cursor={data['next_cursor']}&page_size=3")
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(len(data['results']), 1)
+        self.assertEqual(data['results'][0]['title'], 'Test Grocery List')
+        self.assertIsNone(data['next_cursor'])
+
+    def test_list_grocery_lists_invalid_cursor(self):
+        """Test an invalid cursor is rejected"""
+        response = self.client.get('/api/grocerylist/?cursor=garbage')
+        self.assertEqual(response.status_code, 400)
+
+    def test_list_grocery_lists_tampered_cursor(self):
+        """Test a well-formed cursor holding values of the wrong type is rejected"""
+        for values in [['notadate', 1], [{'a': 1}, 1]]:
+            cursor = base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii')
+            response = self.client.get(f'/api/grocerylist/?cursor={cursor}')
+            self.assertEqual(response.status_code, 400)
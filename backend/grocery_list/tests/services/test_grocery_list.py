@@ -1,7 +1,8 @@
 from django.test import TestCase
 
-from grocery_list.models import GroceryList
+from grocery_list.models import GroceryList, GroceryListItem
 from grocery_list.services import GroceryListService
+from ingredient.models import Ingredient, IngredientCategory
 
 class GroceryListServiceTests(TestCase):
     def setUp(self):
@@ -107,3 +108,63 @@ class GroceryListServiceTests(TestCase):
         id = second_list.id
         GroceryListService.delete(id=id)
         self.assertEqual(GroceryList.objects.count(), 1)
+
+
+    def _add_items(self, grocery_list, count):
+        category = IngredientCategory.objects.create(name=f"Category for {grocery_list.title}")
+        for i in range(count):
+            ingredient = Ingredient.objects.create(name=f"{grocery_list.title} Ingredient {i}")
+            ingredient.categories.add(category)
+            GroceryListItem.objects.create(grocery_list=grocery_list, ingredient=ingredient, purchased=i % 2 == 0)
+
+    def test_list_query_count_is_constant(self):
+        """
+        Test list() uses the same number of queries regardless of list and item count
+        """
+        for grocery_list in GroceryList.objects.all():
+            self._add_items(grocery_list, 3)
+        with self.assertNumQueries(3):
+            grocery_lists = GroceryListService.list()
+        self.assertEqual(len(grocery_lists), 2)
+
+        for i in range(5):
+            self._add_items(GroceryList.objects.create(title=f"Extra {i}"), 4)
+        with self.assertNumQueries(3):
+            grocery_lists = GroceryListService.list()
+        self.assertEqual(len(grocery_lists), 7)
+
+    def test_list_counts(self):
+        """
+        Test list() reports annotated item and purchased counts
+        """
+        first_list = GroceryList.objects.get(title="Test Title")
+        self._add_items(first_list, 3)
+        grocery_list = next(gl for gl in GroceryListService.list() if gl['id'] == first_list.id)
+        self.assertEqual(grocery_list['item_count'], 3)
+        self.assertEqual(grocery_list['purchased_count'], 2)
+        self.assertEqual(len(grocery_list['items']), 3)
+        self.assertEqual(len(grocery_list['items'][0]['ingredient_details']['categories']), 1)
+
+    def test_list_summary(self):
+        """
+        Test list() in summary mode omits items and runs a single query
+        """
+        first_list = GroceryList.objects.get(title="Test Title")
+        self._add_items(first_list, 3)
+        with self.assertNumQueries(1):
+            grocery_lists = GroceryListService.list(summary=True)
+        grocery_list = next(gl for gl in grocery_lists if gl['id'] == first_list.id)
+        self.assertNotIn('items', grocery_list)
+        self.assertEqual(grocery_list['item_count'], 3)
+        self.assertEqual(grocery_list['purchased_count'], 2)
+
+    def test_get_query_count(self):
+        """
+        Test get() loads a list with its items in a fixed number of queries
+        """
+        first_list = GroceryList.objects.get(title="Test Title")
+        self._add_items(first_list, 4)
+        with self.assertNumQueries(3):
+            grocery_list = GroceryListService.get(id=first_list.id)
+        self.assertEqual(grocery_list['item_count'], 4)
+        self.assertEqual(grocery_list['purchased_count'], 2)
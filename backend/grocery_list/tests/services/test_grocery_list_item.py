@@ -0,0 +1,92 @@
+from decimal import Decimal
+from django.test import TestCase
+
+from grocery_list.models import GroceryList, GroceryListItem
+from grocery_list.services import GroceryListItemService
+from ingredient.models import Ingredient
+from measurement.services.unit_registry import UnitRegistry
+
+class GroceryListItemServiceTests(TestCase):
+    def setUp(self):
+        # Load the unit registry up front so query counts only cover the code under test
+        UnitRegistry.current()
+
+        self.grocery_list = GroceryList.objects.create(title="Weekly Shop")
+        self.flour = Ingredient.objects.create(name="Flour")
+        self.milk = Ingredient.objects.create(name="Milk")
+        self.eggs = Ingredient.objects.create(name="Eggs")
+        self.flour_item = GroceryListItem.objects.create(
+            grocery_list=self.grocery_list, ingredient=self.flour, quantity=1, unit='kg'
+        )
+
+    def test_merge_items_same_unit(self):
+        """
+        Test merge_items() adds to an existing item with the same unit
+        """
+        items = GroceryListItemService.merge_items(self.grocery_list.id, [
+            {"ingredient": self.flour, "quantity": Decimal('0.5'), "unit": 'kg'},
+        ])
+        self.assertEqual([item.id for item in items], [self.flour_item.id])
+        self.flour_item.refresh_from_db()
+        self.assertEqual(self.flour_item.quantity, Decimal('1.5'))
+
+    def test_merge_items_converts_units(self):
+        """
+        Test merge_items() converts an entry to the existing item's unit
+        """
+        GroceryListItemService.merge_items(self.grocery_list.id, [
+            {"ingredient": self.flour, "quantity": 250, "unit": 'g'},
+        ])
+        self.flour_item.refresh_from_db()
+        self.assertEqual(self.flour_item.quantity, Decimal('1.25'))
+        self.assertEqual(GroceryListItem.objects.count(), 1)
+
+    def test_merge_items_uses_stored_density(self):
+        """
+        Test merge_items() converts volume to weight with the ingredient's own density
+        """
+        self.flour.density = 1.0
+        self.flour.save()
+
+        GroceryListItemService.merge_items(self.grocery_list.id, [
+            {"ingredient": self.flour, "quantity": 1000, "unit": 'ml'},
+        ])
+        self.flour_item.refresh_from_db()
+        # 1000 ml at 1 g/ml, rather than flour's guessed density
+        self.assertEqual(self.flour_item.quantity, Decimal('2'))
+
+    def test_merge_items_unconvertible_unit(self):
+        """
+        Test merge_items() keeps entries in an unconvertible unit as a separate item
+        """
+        GroceryListItemService.merge_items(self.grocery_list.id, [
+            {"ingredient": self.flour, "quantity": 2, "unit": 'bag'},
+            {"ingredient": self.flour, "quantity": 1, "unit": 'bag'},
+        ])
+        self.flour_item.refresh_from_db()
+        self.assertEqual(self.flour_item.quantity, Decimal('1'))
+        bag_item = GroceryListItem.objects.get(unit='bag')
+        self.assertEqual(bag_item.quantity, Decimal('3'))
+
+    def test_merge_items_query_count(self):
+        """
+        Test merge_items() runs a fixed number of queries however many entries there are
+        """
+        entries = [
+            {"ingredient": self.flour, "quantity": 100, "unit": 'g'},
+            {"ingredient": self.milk, "quantity": 1, "unit": 'cup', "notes": "whole"},
+            {"ingredient": self.milk, "quantity": 250, "unit": 'ml'},
+            {"ingredient": self.eggs, "quantity": 6, "unit": None},
+        ] * 5
+        # load existing items, savepoint, bulk update, bulk insert, release savepoint
+        with self.assertNumQueries(5):
+            items = GroceryListItemService.merge_items(self.grocery_list.id, entries)
+        self.assertEqual(len(items), 3)
+
+        self.flour_item.refresh_from_db()
+        self.assertEqual(self.flour_item.quantity, Decimal('1.5'))
+        milk_item = GroceryListItem.objects.get(ingredient=self.milk)
+        self.assertEqual(milk_item.unit, 'cup')
+        self.assertEqual(milk_item.notes, 'whole')
+        self.assertAlmostEqual(float(milk_item.quantity), 5 + 5 * 250 / 236.59, places=1)
+        self.assertEqual(GroceryListItem.objects.get(ingredient=self.eggs).quantity, Decimal('30'))
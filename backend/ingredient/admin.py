@@ -5,6 +5,8 @@ from .models import IngredientCategory
 
 class IngredientAdmin(admin.ModelAdmin):
     list_display = ('id', 'name', 'description',)
+    # Derived from name by Ingredient.save()
+    readonly_fields = ('normalized_name',)
 
 admin.site.register(Ingredient, IngredientAdmin)
 
@@ -3,16 +3,29 @@ import logging
 from django.http import JsonResponse
 from typing import Dict
 
+from common.pagination import get_pagination_params
+from common.streaming import StreamingJsonResponse, wants_stream
 from ..services import IngredientService
 
 logger = logging.getLogger(__name__)
 
+MAX_SEARCH_RESULTS = 50
+
 class IngredientAPI:
 
     @staticmethod
     def list(request) -> Dict:
         if request.method == 'GET':
             logger.info('ingredients method "list" called')
+            if wants_stream(request):
+                return StreamingJsonResponse(IngredientService.stream())
+            try:
+                pagination = get_pagination_params(request)
+                if pagination is not None:
+                    cursor, page_size = pagination
+                    return JsonResponse(IngredientService.list_page(cursor=cursor, page_size=page_size))
+            except ValueError as e:
+                return JsonResponse({"error": str(e)}, status=400)
             return JsonResponse(IngredientService.list(), safe=False)
         elif request.method == 'POST':
             logger.info('ingredients method "create" called')
@@ -31,3 +44,15 @@ class IngredientAPI:
         elif request.method == 'DELETE':
             logger.info('ingredients method "delete" called')
             return JsonResponse(IngredientService.delete(id=id))
+
+    @staticmethod
+    def search(request) -> Dict:
+        if request.method == 'GET':
+            logger.info('ingredients method "search" called')
+            try:
+                limit = int(request.GET.get('limit', 10))
+            except ValueError:
+                return JsonResponse({"error": "limit must be a number"}, status=400)
+            if not 1 <= limit <= MAX_SEARCH_RESULTS:
+                return JsonResponse({"error": f"limit must be between 1 and {MAX_SEARCH_RESULTS}"}, status=400)
+            return JsonResponse(IngredientService.search(request.GET.get('q', ''), limit=limit), safe=False)
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from ingredient.services import IngredientMergeService
+from recipe.services import RecipeMatchService
+
+class Command(BaseCommand):
+    help = 'Merge ingredients whose names normalize to the same form and fill in normalized_name'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Duplicates merged per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report the duplicates that would be merged')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            duplicates = IngredientMergeService.find_duplicates()
+            merged = sum(len(ids) for ids in duplicates.values())
+            self.stdout.write(f"{len(duplicates)} duplicate groups, {merged} ingredients would be merged")
+            return
+
+        result = IngredientMergeService.merge_duplicates(batch_size=options['batch_size'])
+
+        # Recipe items were re-pointed with queryset updates, which send no signals.
+        # Other processes notice the bumped Recipe.updated_at on their next call;
+        # this one drops its indexes now.
+        RecipeMatchService.invalidate()
+
+        repointed = ', '.join(f"{count} {model}" for model, count in result['repointed'].items())
+        self.stdout.write(self.style.SUCCESS(
+            f"Merged {result['merged']} ingredients in {result['groups']} groups, re-pointed {repointed}"
+        ))
@@ -0,0 +1,59 @@
+from django.db import migrations
+
+# Trigram FTS5 index over ingredient names for IngredientSearchService. Only
+# created on SQLite 3.34+ builds with FTS5 (for the trigram tokenizer);
+# elsewhere the service falls back to LIKE.
+CREATE_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS ingredient_search_insert AFTER INSERT ON ingredient_ingredient BEGIN
+        INSERT INTO ingredient_search(rowid, name) VALUES (new.id, new.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS ingredient_search_update AFTER UPDATE OF name ON ingredient_ingredient BEGIN
+        UPDATE ingredient_search SET name = new.name WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS ingredient_search_delete AFTER DELETE ON ingredient_ingredient BEGIN
+        DELETE FROM ingredient_search WHERE rowid = old.id;
+    END""",
+]
+
+CREATE_INDEX = [
+    "CREATE VIRTUAL TABLE ingredient_search USING fts5(name, tokenize='trigram')",
+    "INSERT INTO ingredient_search(rowid, name) SELECT id, name FROM ingredient_ingredient",
+    *CREATE_TRIGGERS,
+]
+
+DROP_INDEX = [
+    "DROP TRIGGER IF EXISTS ingredient_search_insert",
+    "DROP TRIGGER IF EXISTS ingredient_search_update",
+    "DROP TRIGGER IF EXISTS ingredient_search_delete",
+    "DROP TABLE IF EXISTS ingredient_search",
+]
+
+def fts5_available(connection):
+    if connection.vendor != 'sqlite' or connection.Database.sqlite_version_info < (3, 34, 0):
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return 'ENABLE_FTS5' in {row[0] for row in cursor.fetchall()}
+
+def create_index(apps, schema_editor):
+    if not fts5_available(schema_editor.connection):
+        return
+    for statement in CREATE_INDEX:
+        schema_editor.execute(statement)
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_INDEX:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingredient', '0004_ingredient_density'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
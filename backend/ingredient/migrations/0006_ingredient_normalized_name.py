@@ -0,0 +1,55 @@
+# Generated by Django 5.2 on 2026-10-18 11:57
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+from ingredient.normalization import normalize_ingredient_name
+
+
+def fill_normalized_names(apps, schema_editor):
+    # Only the oldest ingredient of each normalized name gets it; the rest stay
+    # NULL until the merge_duplicate_ingredients command folds them into it
+    Ingredient = apps.get_model('ingredient', 'Ingredient')
+    seen = set()
+    ingredients = []
+    for ingredient in Ingredient.objects.order_by('id').only('id', 'name').iterator():
+        normalized_name = normalize_ingredient_name(ingredient.name)
+        if normalized_name and normalized_name not in seen:
+            seen.add(normalized_name)
+            ingredient.normalized_name = normalized_name
+            ingredients.append(ingredient)
+    Ingredient.objects.bulk_update(ingredients, ['normalized_name'], batch_size=500)
+
+
+def restore_search_triggers(apps, schema_editor):
+    # Making the column unique rebuilds ingredient_ingredient on SQLite, which
+    # drops the search index triggers from migration 0005
+    connection = schema_editor.connection
+    if 'ingredient_search' not in connection.introspection.table_names():
+        return
+    search_index = import_module('ingredient.migrations.0005_ingredient_search')
+    for statement in search_index.CREATE_TRIGGERS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingredient', '0005_ingredient_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredient',
+            name='normalized_name',
+            field=models.CharField(blank=True, max_length=120, null=True),
+        ),
+        migrations.RunPython(fill_normalized_names, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='ingredient',
+            name='normalized_name',
+            field=models.CharField(blank=True, max_length=120, null=True, unique=True),
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2 on 2026-10-18 12:38
+
+import django.core.validators
+from django.db import migrations, models
+
+from measurement.services import unit_defaults
+from measurement.services.density_index import DensityIndex
+
+
+def clear_guessed_densities(apps, schema_editor):
+    """
+    Densities used to be guessed from the name and stored. Clear the ones that
+    match what the registry's keywords guess, so they follow later registry
+    edits, along with any that aren't positive.
+    """
+    Ingredient = apps.get_model('ingredient', 'Ingredient')
+    IngredientDensity = apps.get_model('measurement', 'IngredientDensity')
+
+    keywords = list(IngredientDensity.objects.order_by('priority', 'id').values_list('keyword', 'density'))
+    if not keywords:
+        keywords = list(unit_defaults.INGREDIENT_DENSITIES.items()) + [
+            (word, density) for words, density in unit_defaults.CATEGORY_DENSITY_KEYWORDS for word in words
+        ]
+    index = DensityIndex((keyword.lower(), density) for keyword, density in keywords)
+
+    cleared = []
+    for ingredient_id, name, density in Ingredient.objects.exclude(density=None).values_list('id', 'name', 'density'):
+        guess = index.lookup(name.lower())
+        if guess is None:
+            guess = unit_defaults.DEFAULT_DENSITY
+        if density <= 0 or density == guess:
+            cleared.append(ingredient_id)
+
+    for start in range(0, len(cleared), 500):
+        Ingredient.objects.filter(id__in=cleared[start:start + 500]).update(density=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingredient', '0007_hot_path_indexes'),
+        ('measurement', '0002_seed_units'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ingredient',
+            name='density',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(0.01)]),
+        ),
+        migrations.RunPython(clear_guessed_densities, migrations.RunPython.noop),
+    ]
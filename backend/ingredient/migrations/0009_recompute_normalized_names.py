@@ -0,0 +1,43 @@
+# Generated by Django 5.2 on 2026-10-18 13:05
+
+from django.db import migrations
+
+from ingredient.normalization import normalize_ingredient_name
+
+
+def recompute_normalized_names(apps, schema_editor):
+    # normalize_ingredient_name used to strip leading unit words, so "Pound cake"
+    # was stored as "cake". Recompute every row; as in 0006 only the oldest
+    # ingredient of each normalized name gets it and the rest stay NULL
+    Ingredient = apps.get_model('ingredient', 'Ingredient')
+    seen = set()
+    ingredients = []
+    for ingredient in Ingredient.objects.order_by('id').only('id', 'name', 'normalized_name').iterator():
+        normalized_name = normalize_ingredient_name(ingredient.name)
+        if not normalized_name or normalized_name in seen:
+            normalized_name = None
+        else:
+            seen.add(normalized_name)
+        if ingredient.normalized_name != normalized_name:
+            ingredient.normalized_name = normalized_name
+            ingredients.append(ingredient)
+
+    # Clear first so rows swapping names never collide on the unique index
+    ids = [ingredient.id for ingredient in ingredients]
+    for start in range(0, len(ids), 500):
+        Ingredient.objects.filter(id__in=ids[start:start + 500]).update(normalized_name=None)
+    Ingredient.objects.bulk_update(
+        [ingredient for ingredient in ingredients if ingredient.normalized_name],
+        ['normalized_name'], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingredient', '0008_ingredient_density_explicit'),
+    ]
+
+    operations = [
+        migrations.RunPython(recompute_normalized_names, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,51 @@
+from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models.functions import Lower
 
+from ..normalization import normalize_ingredient_name
 from .category import IngredientCategory
 
 class Ingredient(models.Model):
     name = models.CharField(max_length=120)
     description = models.TextField(null=True)
     categories = models.ManyToManyField(IngredientCategory, related_name="ingredients")
+    # Known density in g/ml for weight <-> volume conversions; when NULL the
+    # density is guessed from the name with the unit registry's keywords
+    density = models.FloatField(null=True, blank=True, validators=[MinValueValidator(0.01)])
+    # normalize_ingredient_name(name), kept up to date by save(); duplicates left
+    # over from before it existed are NULL until merge_duplicate_ingredients runs
+    normalized_name = models.CharField(max_length=120, unique=True, null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['name'], name='ingredient_name_idx'),
+            # Case-insensitive prefix lookups compare Lower('name') against a range
+            models.Index(Lower('name'), name='ingredient_name_lower_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The name as stored, so post_save receivers can tell whether it changed
+        instance._loaded_name = instance.__dict__.get('name')
+        return instance
+
+    def name_changed(self) -> bool:
+        """Whether the name differs from the one loaded from the database; True for unsaved rows"""
+        return getattr(self, '_loaded_name', None) != self.name
+
+    def save(self, *args, **kwargs):
+        normalized_name = normalize_ingredient_name(self.name)
+        if self.pk and self.normalized_name is None and Ingredient.objects.filter(
+            normalized_name=normalized_name
+        ).exclude(pk=self.pk).exists():
+            # A leftover duplicate stays NULL until it's merged into the ingredient holding the name
+            normalized_name = None
+        self.normalized_name = normalized_name
+        if kwargs.get('update_fields') is not None and 'name' in kwargs['update_fields']:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'normalized_name'}
+        super().save(*args, **kwargs)
+        self._loaded_name = self.name
 
     def __str__(self):
         return self.name
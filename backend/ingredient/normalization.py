@@ -0,0 +1,87 @@
+import re
+from typing import Optional
+
+from measurement.services.unit_defaults import UNIT_ALIASES
+
+IRREGULAR_PLURALS = {
+    'leaves': 'leaf',
+    'loaves': 'loaf',
+    'halves': 'half',
+    'knives': 'knife',
+    'geese': 'goose',
+    'teeth': 'tooth',
+    'feet': 'foot',
+    'mice': 'mouse',
+    'chilies': 'chili',
+    'chillies': 'chilli',
+}
+# Singulars ending in e whose plurals the suffix rules would cut too short (cookies -> cooky)
+E_SINGULARS = {
+    'cookie', 'brownie', 'pie', 'veggie', 'smoothie', 'calorie', 'hoagie', 'quiche',
+    'brioche', 'ganache', 'niche', 'cache', 'panache',
+}
+# Words ending in s that aren't plurals
+UNCOUNTABLE_WORDS = {'asparagus', 'couscous', 'hummus', 'molasses', 'swiss', 'citrus', 'octopus', 'schnapps', 'grits', 'oats'}
+
+# Size and preparation words that don't change which ingredient is meant
+DESCRIPTORS = {
+    'large', 'small', 'medium', 'fresh', 'freshly', 'chopped', 'diced', 'minced', 'sliced',
+    'grated', 'shredded', 'peeled', 'crushed', 'beaten', 'softened', 'melted', 'finely',
+    'roughly', 'coarsely', 'thinly', 'heaping', 'level',
+}
+UNIT_WORDS = set(UNIT_ALIASES) | {alias for aliases in UNIT_ALIASES.values() for alias in aliases} | {
+    'pinch', 'dash', 'clove', 'cloves', 'can', 'cans', 'package', 'packages', 'handful',
+    'bunch', 'sprig', 'sprigs', 'slice', 'slices', 'piece', 'pieces',
+}
+
+QUANTITY_PATTERN = re.compile(r'^(\d+([./]\d+)?|[¼½¾⅓⅔⅛⅜⅝⅞]|a|an)$')
+
+def singularize(word: str) -> str:
+    """
+    Turn a lowercase English plural into its singular form, e.g. tomatoes -> tomato
+    """
+    if word in IRREGULAR_PLURALS:
+        return IRREGULAR_PLURALS[word]
+    if word in UNCOUNTABLE_WORDS or len(word) <= 3:
+        return word
+    if word.endswith('s') and word[:-1] in E_SINGULARS:
+        return word[:-1]
+    if word.endswith('ies'):
+        return word[:-3] + 'y'
+    if word.endswith(('oes', 'ches', 'shes', 'sses', 'xes', 'zes')):
+        return word[:-2]
+    if word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+def clean_ingredient_name(name: str) -> str:
+    """
+    Strip what scanned ingredient lines leave around the name itself
+
+    "2 large eggs, beaten" becomes "eggs": notes in brackets or after a comma,
+    leading quantities, and size or preparation words are dropped, and so are
+    units and "of" when they follow a quantity, so "Pound cake" is kept whole.
+    Names that would be left empty are only lowercased and trimmed. Only for
+    scanned lines; names people type in are stored as given.
+    """
+    text = (name or '').lower()
+    text = re.sub(r'\([^)]*\)', ' ', text).split(',')[0]
+    words = re.sub(r"[^\w\s./¼½¾⅓⅔⅛⅜⅝⅞]|(?<!\d)[./]|[./](?!\d)", ' ', text).split()
+
+    quantity_found = False
+    while words and (
+        QUANTITY_PATTERN.match(words[0]) or (quantity_found and (words[0] in UNIT_WORDS or words[0] == 'of'))
+    ):
+        quantity_found = True
+        words.pop(0)
+    words = [word for word in words if word not in DESCRIPTORS]
+
+    return ' '.join(words) or ' '.join((name or '').lower().split())
+
+def normalize_ingredient_name(name: str) -> Optional[str]:
+    """
+    Reduce an ingredient name to the form stored in Ingredient.normalized_name:
+    lowercased, punctuation removed and every word singular
+    """
+    words = re.sub(r"[^\w\s]", ' ', (name or '').lower()).split()
+    return ' '.join(singularize(word) for word in words) or None
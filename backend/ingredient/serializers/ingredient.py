@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from ..models import Ingredient
+from ..normalization import normalize_ingredient_name
 from .category import IngredientCategorySerializer
 
 class IngredientSerializer(serializers.ModelSerializer):
@@ -10,9 +11,19 @@ class IngredientSerializer(serializers.ModelSerializer):
         model = Ingredient
         fields = '__all__'
         extra_kwargs = {
-            "description": {"required": False, "allow_blank": True, "allow_null": True}
+            "description": {"required": False, "allow_blank": True, "allow_null": True},
+            "normalized_name": {"read_only": True}
         }
 
+    def validate_name(self, value):
+        normalized_name = normalize_ingredient_name(value)
+        duplicates = Ingredient.objects.filter(normalized_name=normalized_name)
+        if self.instance is not None:
+            duplicates = duplicates.exclude(pk=self.instance.pk)
+        if normalized_name and duplicates.exists():
+            raise serializers.ValidationError("An ingredient with this name already exists.")
+        return value
+
     def create(self, validated_data):
         validated_data.pop('categories', None)
         
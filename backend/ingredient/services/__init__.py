@@ -1,2 +1,4 @@
 from .ingredient import *
-from .category import *
\ No newline at end of file
+from .category import *
+from .search import *
+from .merge import *
@@ -1,15 +1,42 @@
-from typing import Dict
+from typing import Dict, Iterable, Iterator, List, Optional
 
+from django.db import IntegrityError, transaction
+
+from common.pagination import CursorPaginator, paginated_response
+from common.streaming import stream_json_array
 from ..models import Ingredient
 from ..serializers import IngredientSerializer
 from .category import IngredientCategoryService
+from ..normalization import clean_ingredient_name, normalize_ingredient_name
+from .search import IngredientSearchService
+
+INGREDIENT_PAGINATOR = CursorPaginator(ordering=['name', 'id'])
 
 class IngredientService:
 
     @staticmethod
     def list() -> Dict:
         # Get all ingredients ordered by name
-        ingredients = Ingredient.objects.all().order_by('name')
+        ingredients = Ingredient.objects.all().order_by('name').prefetch_related('categories')
+        serializer = IngredientSerializer(ingredients, many=True)
+        return serializer.data
+
+    @staticmethod
+    def list_page(cursor: Optional[str] = None, page_size: Optional[int] = None) -> Dict:
+        ingredients = Ingredient.objects.prefetch_related('categories')
+        page, next_cursor = INGREDIENT_PAGINATOR.paginate(ingredients, cursor, page_size)
+        serializer = IngredientSerializer(page, many=True)
+        return paginated_response(serializer.data, next_cursor)
+
+    @staticmethod
+    def stream() -> Iterator[str]:
+        ingredients = Ingredient.objects.all().order_by('name').prefetch_related('categories')
+        return stream_json_array(ingredients, IngredientSerializer)
+
+    @staticmethod
+    def search(query: str, limit: int = 10) -> List[Dict]:
+        # Ranked prefix and fuzzy matches from the ingredient search index
+        ingredients = IngredientSearchService.search(query, limit=limit)
         serializer = IngredientSerializer(ingredients, many=True)
         return serializer.data
 
@@ -21,6 +48,11 @@ class IngredientService:
 
     @staticmethod
     def create(validated_data) -> Dict:
+        # Creating an ingredient that already exists under another spelling returns the existing one
+        existing = IngredientService.match_names([validated_data.get('name') or ''])
+        if existing:
+            return IngredientSerializer(next(iter(existing.values()))).data
+
         validated_data['categories'] = IngredientService.__process_categoryids(validated_data['categories'])
         serializer = IngredientSerializer(data=validated_data)
         if serializer.is_valid():
@@ -51,6 +83,10 @@ class IngredientService:
         """
         Find an existing ingredient by name or create a new one
 
+        Names are compared in normalized form, so "2 large Tomatoes, diced" finds
+        an existing "tomato", and new ingredients are named without the quantity
+        and preparation notes.
+
         Args:
             name: The name of the ingredient to find or create
             user_id: The ID of the user creating the ingredient (if needed)
@@ -59,9 +95,9 @@ class IngredientService:
         Returns:
             Ingredient object (either existing or newly created)
         """
-        # Try to find an existing ingredient with the same name
-        name = name.strip().lower()
-        ingredient = Ingredient.objects.filter(name__iexact=name).first()
+        # Try to find an existing ingredient with the same normalized name
+        name = clean_ingredient_name(name)
+        ingredient = IngredientService.match_names([name]).get(normalize_ingredient_name(name))
 
         if ingredient:
             return ingredient
@@ -84,8 +120,84 @@ class IngredientService:
             # Get the newly created ingredient
             return Ingredient.objects.get(id=serializer.data['id'])
         else:
-            # If there was an error, create a basic ingredient without categories
-            return Ingredient.objects.create(name=name.capitalize(), description='')
+            # If there was an error, create a basic ingredient without categories,
+            # unless another request created the same ingredient in the meantime
+            ingredient, _ = Ingredient.objects.get_or_create(
+                normalized_name=normalize_ingredient_name(name),
+                defaults={'name': name.capitalize(), 'description': ''}
+            )
+            return ingredient
+
+    @staticmethod
+    def find_or_create_ingredients(names: Iterable[str]) -> Dict[str, Ingredient]:
+        """
+        Resolve many ingredient names at once, creating the ones that don't exist
+
+        Existing ingredients are matched by normalized name in a single query and
+        the missing ones are created with a single bulk insert. Names that
+        normalize to the same form share one ingredient.
+
+        Args:
+            names: The ingredient names to resolve
+
+        Returns:
+            Dict mapping each stripped, lowercased name to its Ingredient
+        """
+        # Stripped, lowercased name -> the name cleaned of what the scan left around it
+        cleaned_names = {}
+        for name in names:
+            name = name.strip().lower()
+            if name and name not in cleaned_names:
+                cleaned_names[name] = clean_ingredient_name(name)
+
+        if not cleaned_names:
+            return {}
+
+        matches = IngredientService.match_names(cleaned_names.values())
+
+        missing = {}
+        for name in cleaned_names.values():
+            if normalize_ingredient_name(name) not in matches:
+                missing.setdefault(normalize_ingredient_name(name), name)
+        if missing:
+            try:
+                with transaction.atomic():
+                    created = Ingredient.objects.bulk_create([
+                        Ingredient(name=name.capitalize(), description='', normalized_name=normalized_name)
+                        for normalized_name, name in missing.items()
+                    ])
+                matches.update(zip(missing.keys(), created))
+            except IntegrityError:
+                # Another request created some of them first
+                for normalized_name, name in missing.items():
+                    matches[normalized_name], _ = Ingredient.objects.get_or_create(
+                        normalized_name=normalized_name,
+                        defaults={'name': name.capitalize(), 'description': ''}
+                    )
+
+        return {name: matches[normalize_ingredient_name(cleaned)] for name, cleaned in cleaned_names.items()}
+
+    @staticmethod
+    def match_names(names: Iterable[str]) -> Dict[str, Ingredient]:
+        """
+        Find the existing ingredients for several names with one indexed lookup
+
+        Names are matched on Ingredient.normalized_name, so "Tomatoes" finds an
+        existing "tomato".
+
+        Args:
+            names: The ingredient names to look up
+
+        Returns:
+            Dict mapping the normalized form of each name that matched to its Ingredient
+        """
+        wanted = {normalize_ingredient_name(name) for name in names} - {None}
+        if not wanted:
+            return {}
+        return {
+            ingredient.normalized_name: ingredient
+            for ingredient in Ingredient.objects.filter(normalized_name__in=wanted)
+        }
 
     @staticmethod
     def __process_categoryids(categories):
@@ -0,0 +1,131 @@
+import logging
+from collections import defaultdict
+from typing import Dict, List
+
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+from django.utils import timezone
+
+from grocery_list.models import GroceryListItem
+from pantry.models import PantryItem
+from recipe.models import Recipe, RecipeItem
+from ..models import Ingredient
+from ..normalization import normalize_ingredient_name
+
+logger = logging.getLogger(__name__)
+
+# Models whose ingredient foreign key is moved onto the surviving ingredient
+REFERENCING_MODELS = (RecipeItem, GroceryListItem, PantryItem)
+
+class IngredientMergeService:
+
+    @staticmethod
+    def find_duplicates() -> Dict[int, List[int]]:
+        """
+        Group ingredients by normalized name
+
+        Returns:
+            Dict mapping the oldest ingredient ID of each group with more than
+            one member to the IDs of the others
+        """
+        groups = defaultdict(list)
+        for id, name in Ingredient.objects.order_by('id').values_list('id', 'name').iterator():
+            groups[normalize_ingredient_name(name)].append(id)
+        return {ids[0]: ids[1:] for normalized_name, ids in groups.items() if normalized_name and len(ids) > 1}
+
+    @staticmethod
+    def merge_duplicates(batch_size: int = 500) -> Dict:
+        """
+        Fold every duplicate ingredient into the oldest one with the same normalized name
+
+        Duplicates are handled batch_size at a time, each batch in its own
+        transaction: recipe, grocery list and pantry items are re-pointed with
+        one UPDATE per model, categories and densities are carried over and
+        the duplicates are deleted. Finally normalized_name is brought up to
+        date on the remaining ingredients.
+
+        Queryset updates don't send signals, so callers must drop any caches
+        keyed on recipe items afterwards.
+
+        Returns:
+            Dict with the number of duplicate groups, ingredients merged and
+            rows re-pointed per model
+        """
+        duplicates = IngredientMergeService.find_duplicates()
+        pairs = [(duplicate_id, canonical_id) for canonical_id, ids in duplicates.items() for duplicate_id in ids]
+
+        repointed = {model.__name__: 0 for model in REFERENCING_MODELS}
+        for start in range(0, len(pairs), batch_size):
+            batch = dict(pairs[start:start + batch_size])
+            with transaction.atomic():
+                for model, count in IngredientMergeService.__merge_batch(batch).items():
+                    repointed[model] += count
+            logger.info(f"Merged {start + len(batch)} of {len(pairs)} duplicate ingredients")
+
+        IngredientMergeService.__refresh_normalized_names()
+
+        return {
+            "groups": len(duplicates),
+            "merged": len(pairs),
+            "repointed": repointed
+        }
+
+    @staticmethod
+    def __merge_batch(canonical_ids: Dict[int, int]) -> Dict[str, int]:
+        """
+        Helper method to merge one batch of duplicate ID -> canonical ID
+        """
+        new_ingredient_id = Case(
+            *[When(ingredient_id=duplicate_id, then=Value(canonical_id)) for duplicate_id, canonical_id in canonical_ids.items()],
+            output_field=IntegerField()
+        )
+
+        # Scaled recipe caches are keyed on updated_at, so bump it like RecipeItemService does
+        recipe_ids = set(
+            RecipeItem.objects.filter(ingredient_id__in=canonical_ids).values_list('recipe_id', flat=True)
+        )
+        Recipe.objects.filter(id__in=recipe_ids).update(updated_at=timezone.now())
+
+        repointed = {
+            model.__name__: model.objects.filter(ingredient_id__in=canonical_ids).update(ingredient_id=new_ingredient_id)
+            for model in REFERENCING_MODELS
+        }
+
+        Category = Ingredient.categories.through
+        Category.objects.bulk_create([
+            Category(ingredient_id=canonical_ids[ingredient_id], ingredientcategory_id=category_id)
+            for ingredient_id, category_id in Category.objects.filter(
+                ingredient_id__in=canonical_ids
+            ).values_list('ingredient_id', 'ingredientcategory_id')
+        ], ignore_conflicts=True)
+
+        ingredients = Ingredient.objects.in_bulk({*canonical_ids, *canonical_ids.values()})
+        updated = {}
+        for duplicate_id, canonical_id in canonical_ids.items():
+            canonical = ingredients[canonical_id]
+            if canonical.density is None and ingredients[duplicate_id].density is not None:
+                canonical.density = ingredients[duplicate_id].density
+                updated[canonical_id] = canonical
+        Ingredient.objects.bulk_update(updated.values(), ['density'])
+
+        Ingredient.objects.filter(id__in=canonical_ids).delete()
+        return repointed
+
+    @staticmethod
+    def __refresh_normalized_names() -> None:
+        """
+        Helper method to store the current normalized_name on every ingredient
+
+        Stale values are cleared first so swapping names between rows can't
+        trip the unique constraint halfway through.
+        """
+        stale = []
+        for ingredient in Ingredient.objects.only('id', 'name', 'normalized_name').iterator():
+            normalized_name = normalize_ingredient_name(ingredient.name)
+            if ingredient.normalized_name != normalized_name:
+                ingredient.normalized_name = normalized_name
+                stale.append(ingredient)
+
+        with transaction.atomic():
+            Ingredient.objects.filter(id__in=[ingredient.id for ingredient in stale]).update(normalized_name=None)
+            Ingredient.objects.bulk_update(stale, ['normalized_name'], batch_size=500)
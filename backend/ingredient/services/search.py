@@ -0,0 +1,187 @@
+import logging
+from typing import List, Optional
+
+from django.db import connection
+from django.db.models.functions import Lower
+
+from ..models import Ingredient
+from ..normalization import normalize_ingredient_name
+
+logger = logging.getLogger(__name__)
+
+# FTS5 table kept in sync with ingredient_ingredient by triggers (see migration 0005)
+SEARCH_TABLE = 'ingredient_search'
+SEARCH_TRIGGERS = ('ingredient_search_insert', 'ingredient_search_update', 'ingredient_search_delete')
+# The trigram tokenizer can't match anything shorter than this
+TRIGRAM_LENGTH = 3
+# Minimum trigram similarity for a fuzzy match to be returned
+MIN_SIMILARITY = 0.3
+# How many fuzzy candidates to fetch per result before re-ranking them
+CANDIDATES_PER_RESULT = 5
+
+def trigrams(text: str) -> set:
+    """
+    The set of three-character substrings of a text, padded so short words still have some
+    """
+    text = f'  {text} '
+    return {text[i:i + TRIGRAM_LENGTH] for i in range(len(text) - TRIGRAM_LENGTH + 1)}
+
+def similarity(a: str, b: str) -> float:
+    """
+    Jaccard similarity of two texts' trigrams, between 0 and 1
+    """
+    a, b = trigrams(a), trigrams(b)
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+class IngredientSearchService:
+    """
+    Prefix and fuzzy ingredient search over an SQLite FTS5 trigram index
+
+    Databases without the index (anything but SQLite, SQLite built without
+    FTS5, or an index whose triggers are missing) fall back to a LIKE scan,
+    so results are the same, only slower.
+    """
+    __available = None
+
+    @staticmethod
+    def search(query: str, limit: int = 10) -> List[Ingredient]:
+        """
+        Find ingredients matching a partial or misspelled name
+
+        Exact matches come first, then names starting with the query, then
+        names containing it, then fuzzy matches by trigram similarity.
+
+        Args:
+            query: The text typed so far
+            limit: Maximum number of ingredients to return
+
+        Returns:
+            Ingredients, best match first
+        """
+        query = ' '.join((query or '').lower().split())
+        if not query:
+            return []
+        normalized = normalize_ingredient_name(query) or query
+
+        ids = IngredientSearchService.__candidate_ids(query, normalized, limit * CANDIDATES_PER_RESULT)
+        ingredients = Ingredient.objects.filter(id__in=ids).prefetch_related('categories')
+
+        ranked = []
+        for ingredient in ingredients:
+            name = ingredient.name.lower()
+            score = max(similarity(query, name), similarity(normalized, normalize_ingredient_name(name)))
+            if name == query or normalize_ingredient_name(name) == normalized:
+                tier = 0
+            elif name.startswith(query):
+                tier = 1
+            elif query in name:
+                tier = 2
+            elif score >= MIN_SIMILARITY:
+                tier = 3
+            else:
+                continue
+            ranked.append((tier, -score, len(name), ingredient.id, ingredient))
+
+        ranked.sort(key=lambda entry: entry[:4])
+        return [entry[-1] for entry in ranked[:limit]]
+
+    @staticmethod
+    def __candidate_ids(query: str, normalized: str, limit: int) -> List[int]:
+        """
+        Helper method to pick the ingredients worth ranking for a query
+        """
+        if len(normalized) < TRIGRAM_LENGTH:
+            # Too short for trigrams, and substring matches of a letter or two are mostly noise
+            return list(
+                IngredientSearchService.__starting_with(normalized)
+                .order_by('name_lower').values_list('id', flat=True)[:limit]
+            )
+        if not IngredientSearchService.__index_available():
+            return list(
+                Ingredient.objects.filter(name__icontains=normalized)
+                .order_by('name').values_list('id', flat=True)[:limit]
+            )
+
+        # Names containing the query, then names sharing the most trigrams with it
+        ids = IngredientSearchService.__match(IngredientSearchService.__phrase(normalized), limit)
+        if len(ids) < limit:
+            fuzzy = ' OR '.join(
+                IngredientSearchService.__phrase(trigram)
+                for trigram in sorted(trigrams(normalized))
+                if len(trigram.strip()) == TRIGRAM_LENGTH
+            )
+            if fuzzy:
+                ids += [id for id in IngredientSearchService.__match(fuzzy, limit) if id not in ids]
+        if len(ids) < limit:
+            # A typo in a short word can touch every trigram, so also try names starting the same way
+            ids += [
+                id for id in IngredientSearchService.__starting_with(normalized[:TRIGRAM_LENGTH - 1])
+                .order_by('name_lower').values_list('id', flat=True)[:limit]
+                if id not in ids
+            ]
+        return ids
+
+    @staticmethod
+    def __starting_with(prefix: str):
+        """
+        Helper method for a case-insensitive prefix filter written as a range on
+        Lower('name'), so it can use ingredient_name_lower_idx where LIKE can't
+        """
+        return Ingredient.objects.annotate(name_lower=Lower('name')).filter(
+            name_lower__gte=prefix, name_lower__lt=prefix + '\uffff'
+        )
+
+    @staticmethod
+    def __match(expression: str, limit: Optional[int] = None) -> List[int]:
+        """
+        Helper method to run an FTS5 MATCH and return ingredient IDs by relevance
+        """
+        sql = f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s ORDER BY rank'
+        params = [expression]
+        if limit:
+            sql += ' LIMIT %s'
+            params.append(limit)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def __phrase(text: str) -> str:
+        """
+        Helper method to quote text as an FTS5 phrase
+        """
+        return '"' + text.replace('"', '""') + '"'
+
+    @staticmethod
+    def __index_available() -> bool:
+        """
+        Helper method to check once per process whether the FTS5 index and the
+        triggers keeping it in sync exist
+
+        Checks the SQLite library like migration 0005, then the schema itself:
+        the migration skips the index without FTS5, and rebuilding
+        ingredient_ingredient drops the triggers (see migration 0006).
+        """
+        if IngredientSearchService.__available is None:
+            available = connection.vendor == 'sqlite' and connection.Database.sqlite_version_info >= (3, 34, 0)
+            if available:
+                probe = connection.Database.connect(':memory:')
+                try:
+                    available = ('ENABLE_FTS5',) in probe.execute('PRAGMA compile_options').fetchall()
+                finally:
+                    probe.close()
+            if available:
+                expected = {('table', SEARCH_TABLE)} | {('trigger', name) for name in SEARCH_TRIGGERS}
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT type, name FROM sqlite_master WHERE name IN (%s, %s, %s, %s)",
+                        [SEARCH_TABLE, *SEARCH_TRIGGERS]
+                    )
+                    found = set(cursor.fetchall())
+                available = found == expected
+                if found and not available:
+                    logger.warning(f"Ingredient search index is incomplete, missing {sorted(expected - found)}")
+            if not available:
+                logger.info("SQLite FTS5 trigram index unavailable, ingredient search falls back to LIKE")
+            IngredientSearchService.__available = available
+        return IngredientSearchService.__available
@@ -0,0 +1,42 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from ...models import Ingredient
+
+User = get_user_model()
+
+class IngredientAPITests(TestCase):
+    def setUp(self):
+        # Create a test user
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpassword'
+        )
+
+        Ingredient.objects.create(name='Cumin')
+        Ingredient.objects.create(name='Curry powder')
+
+        # Set up the API client
+        self.client = APIClient()
+
+        # Get token
+        refresh = RefreshToken.for_user(self.user)
+        access_token = str(refresh.access_token)
+
+        # Add token to client
+        self.client.credentials(HTTP_AUTHORIZATION=f'JWT {access_token}')
+
+    def test_search(self):
+        """Test searching ingredients by a partial name"""
+        response = self.client.get('/api/ingredients/search/?q=cur&limit=5')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([ingredient['name'] for ingredient in response.json()], ['Curry powder'])
+
+    def test_search_invalid_limit(self):
+        """Test an out of range limit is rejected"""
+        self.assertEqual(self.client.get('/api/ingredients/search/?q=cu&limit=0').status_code, 400)
+        self.assertEqual(self.client.get('/api/ingredients/search/?q=cu&limit=x').status_code, 400)
@@ -33,7 +33,7 @@ class IngredientServiceTests(TestCase):
         """
         Test create() function returns a new JSON formatted Ingredient
         """
-        name = 'Test Name 2'
+        name = 'Test Name 3'
         description = 'Test Description'
         validated_data = {}
         validated_data['name'] = name
@@ -49,7 +49,7 @@ class IngredientServiceTests(TestCase):
         """
         Test create() function returns a new JSON formatted Ingredient
         """
-        name = 'Test Name 2'
+        name = 'Test Name 3'
         description = ''
         validated_data = {}
         validated_data['name'] = name
@@ -61,6 +61,24 @@ class IngredientServiceTests(TestCase):
         self.assertEqual(ingredient['description'], description)
         self.assertEqual(len(ingredient['categories']), 0)
 
+    def test_create_existing_name(self):
+        """
+        Test create() function returns the existing Ingredient for a name that normalizes the same
+        """
+        validated_data = {'name': 'test names 2', 'description': '', 'categories': []}
+        ingredient = IngredientService.create(validated_data)
+        self.assertEqual(ingredient['id'], 2)
+        self.assertEqual(Ingredient.objects.count(), 2)
+
+    def test_create_does_not_merge_unit_named_ingredients(self):
+        """
+        Test create() keeps ingredients whose names start with a unit word apart from the plain name
+        """
+        pound_cake = IngredientService.create({'name': 'Pound cake', 'description': '', 'categories': []})
+        cake = IngredientService.create({'name': 'Cake', 'description': '', 'categories': []})
+        self.assertNotEqual(cake['id'], pound_cake['id'])
+        self.assertEqual(cake['name'], 'Cake')
+
     def test_update(self):
         """
         Test update() function returns an updated JSON formatted Ingredient
@@ -145,3 +163,22 @@ class IngredientServiceTests(TestCase):
         id = 2
         IngredientService.delete(id=id)
         self.assertEqual(Ingredient.objects.count(), 1)
+
+    def test_find_or_create_ingredients(self):
+        """
+        Test find_or_create_ingredients() reuses existing ingredients and bulk creates the rest
+        """
+        # The lookup, then the bulk insert inside its savepoint
+        with self.assertNumQueries(4):
+            ingredients = IngredientService.find_or_create_ingredients(
+                ["test name", " TEST NAME 2 ", "Basil", "basil", ""]
+            )
+        self.assertEqual(list(ingredients.keys()), ["test name", "test name 2", "basil"])
+        self.assertEqual(ingredients["test name"].id, 1)
+        self.assertEqual(ingredients["test name 2"].id, 2)
+        self.assertEqual(ingredients["basil"].name, "Basil")
+        self.assertEqual(Ingredient.objects.count(), 3)
+
+        # Everything exists now, so only the lookup runs
+        with self.assertNumQueries(1):
+            IngredientService.find_or_create_ingredients(["basil", "Test Name"])
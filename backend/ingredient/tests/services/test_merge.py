@@ -0,0 +1,110 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from grocery_list.models import GroceryList, GroceryListItem
+from pantry.models import PantryItem
+from recipe.models import Recipe, RecipeItem
+from recipe.services import RecipeMatchService
+from ...models import Ingredient, IngredientCategory
+from ...services import IngredientMergeService
+
+User = get_user_model()
+
+
+class IngredientMergeServiceTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.category = IngredientCategory.objects.create(name='Produce')
+
+        self.tomato = Ingredient.objects.create(name='Tomato')
+        # Duplicates as they were stored before normalized_name existed
+        self.tomatoes, self.scanned, self.basil = Ingredient.objects.bulk_create([
+            Ingredient(name='Tomatoes', density=0.95),
+            Ingredient(name='TOMATOES!'),
+            Ingredient(name='Basil'),
+        ])
+        self.scanned.categories.add(self.category)
+
+        self.recipe = Recipe.objects.create(title='Salad', user=self.user)
+        RecipeItem.objects.create(recipe=self.recipe, ingredient=self.tomatoes)
+        RecipeItem.objects.create(recipe=self.recipe, ingredient=self.basil)
+        grocery_list = GroceryList.objects.create(title='Weekly', user=self.user)
+        GroceryListItem.objects.create(grocery_list=grocery_list, ingredient=self.scanned)
+        PantryItem.objects.create(user=self.user, ingredient=self.tomatoes)
+
+    def test_find_duplicates(self):
+        """
+        Test ingredients are grouped under the oldest one with the same normalized name
+        """
+        self.assertEqual(
+            IngredientMergeService.find_duplicates(),
+            {self.tomato.id: [self.tomatoes.id, self.scanned.id]}
+        )
+
+    def test_merge_duplicates(self):
+        """
+        Test duplicates are folded into the oldest ingredient and references re-pointed
+        """
+        result = IngredientMergeService.merge_duplicates(batch_size=1)
+
+        self.assertEqual(result['groups'], 1)
+        self.assertEqual(result['merged'], 2)
+        self.assertEqual(result['repointed'], {'RecipeItem': 1, 'GroceryListItem': 1, 'PantryItem': 1})
+
+        self.assertEqual(list(Ingredient.objects.order_by('id')), [self.tomato, self.basil])
+        self.assertEqual(RecipeItem.objects.filter(ingredient=self.tomato).count(), 1)
+        self.assertEqual(GroceryListItem.objects.get().ingredient, self.tomato)
+        self.assertEqual(PantryItem.objects.get().ingredient, self.tomato)
+
+        self.tomato.refresh_from_db()
+        self.assertEqual(self.tomato.density, 0.95)
+        self.assertEqual(list(self.tomato.categories.all()), [self.category])
+        self.assertEqual(Ingredient.objects.get(id=self.basil.id).normalized_name, 'basil')
+
+        self.assertEqual(IngredientMergeService.find_duplicates(), {})
+
+    def test_save_duplicate(self):
+        """
+        Test a duplicate left NULL by the migration can still be saved before it's merged
+        """
+        self.tomatoes.description = 'Ripe'
+        self.tomatoes.density = 0.9
+        self.tomatoes.save()
+
+        self.tomatoes.refresh_from_db()
+        self.assertEqual(self.tomatoes.description, 'Ripe')
+        self.assertIsNone(self.tomatoes.normalized_name)
+
+        # Renamed to something unique, it takes its own normalized name
+        self.tomatoes.name = 'Plum tomatoes'
+        self.tomatoes.save()
+        self.assertEqual(Ingredient.objects.get(id=self.tomatoes.id).normalized_name, 'plum tomato')
+
+    def test_merge_updates_match_indexes(self):
+        """
+        Test recipe match indexes built before a merge pick up the re-pointed items without being invalidated
+        """
+        self.addCleanup(RecipeMatchService.invalidate)
+        RecipeMatchService.invalidate()
+        self.assertEqual(RecipeMatchService.cookable(user_id=self.user.id)[0]['score'], 0.5)
+
+        IngredientMergeService.merge_duplicates()
+
+        matches = RecipeMatchService.cookable(user_id=self.user.id)
+        self.assertEqual([match['title'] for match in matches], ['Salad'])
+        self.assertEqual(matches[0]['missing'][0]['name'], 'Basil')
+
+    def test_command(self):
+        """
+        Test the management command reports and merges duplicates
+        """
+        out = StringIO()
+        call_command('merge_duplicate_ingredients', '--dry-run', stdout=out)
+        self.assertIn('1 duplicate groups, 2 ingredients would be merged', out.getvalue())
+        self.assertEqual(Ingredient.objects.count(), 4)
+
+        call_command('merge_duplicate_ingredients', stdout=out)
+        self.assertEqual(Ingredient.objects.count(), 2)
@@ -0,0 +1,144 @@
+import unittest
+
+from django.db import connection
+from django.test import TestCase
+
+from ...models import Ingredient
+from ...normalization import clean_ingredient_name, normalize_ingredient_name
+from ...services import IngredientSearchService, IngredientService
+from ...services.search import SEARCH_TABLE, SEARCH_TRIGGERS
+
+
+class NormalizeIngredientNameTests(TestCase):
+    def test_normalize_ingredient_name(self):
+        """
+        Test names are lowercased, stripped of punctuation and singularized
+        """
+        self.assertEqual(normalize_ingredient_name(' Tomatoes '), 'tomato')
+        self.assertEqual(normalize_ingredient_name('Cherries'), 'cherry')
+        self.assertEqual(normalize_ingredient_name('Bay Leaves'), 'bay leaf')
+        self.assertEqual(normalize_ingredient_name('Sun-dried  peaches'), 'sun dried peach')
+        self.assertEqual(normalize_ingredient_name('Asparagus'), 'asparagus')
+        self.assertEqual(normalize_ingredient_name('Glass'), 'glass')
+        self.assertEqual(normalize_ingredient_name('Cookies'), 'cookie')
+        self.assertEqual(normalize_ingredient_name('Quiches'), 'quiche')
+        self.assertEqual(normalize_ingredient_name('Chilies'), 'chili')
+        self.assertEqual(normalize_ingredient_name('Pies'), 'pie')
+
+    def test_normalize_keeps_unit_words(self):
+        """
+        Test unit and size words that are part of a name aren't stripped
+        """
+        self.assertEqual(normalize_ingredient_name('Pound cake'), 'pound cake')
+        self.assertEqual(normalize_ingredient_name('Lb cake'), 'lb cake')
+        self.assertEqual(normalize_ingredient_name('Cup noodles'), 'cup noodle')
+        self.assertEqual(normalize_ingredient_name('Large eggs'), 'large egg')
+
+    def test_clean_ingredient_name(self):
+        """
+        Test quantities, units, descriptors and notes are stripped from scanned names
+        """
+        self.assertEqual(clean_ingredient_name('2 large eggs, beaten'), 'eggs')
+        self.assertEqual(clean_ingredient_name('1/2 cup of flour'), 'flour')
+        self.assertEqual(clean_ingredient_name('½ tsp salt (optional)'), 'salt')
+        self.assertEqual(clean_ingredient_name('3 cloves garlic, minced'), 'garlic')
+        self.assertEqual(clean_ingredient_name('Cloves'), 'cloves')
+        self.assertEqual(normalize_ingredient_name(clean_ingredient_name('1.5 kg Potatoes')), 'potato')
+        # Units are only stripped after a quantity
+        self.assertEqual(clean_ingredient_name('Pound cake'), 'pound cake')
+        self.assertEqual(clean_ingredient_name('Cup noodles'), 'cup noodles')
+        self.assertEqual(clean_ingredient_name('1 pound cake'), 'cake')
+
+
+class IngredientSearchServiceTests(TestCase):
+    def setUp(self):
+        for name in ['Tomato', 'Cherry tomatoes', 'Tomato paste', 'Potatoes', 'Basil', 'Oregano', 'Egg']:
+            Ingredient.objects.create(name=name)
+
+    def _search(self, query, limit=10):
+        return [ingredient.name for ingredient in IngredientSearchService.search(query, limit=limit)]
+
+    def test_prefix_search(self):
+        """
+        Test exact and prefix matches rank ahead of names merely containing the query
+        """
+        self.assertEqual(self._search('toma'), ['Tomato', 'Tomato paste', 'Cherry tomatoes'])
+        self.assertEqual(self._search('tomatoes')[0], 'Tomato')
+        self.assertEqual(self._search('toma', limit=1), ['Tomato'])
+
+    def test_fuzzy_search(self):
+        """
+        Test misspelled queries still find the ingredient
+        """
+        self.assertEqual(self._search('oregeno')[0], 'Oregano')
+        self.assertEqual(self._search('basli')[0], 'Basil')
+        self.assertEqual(self._search('saffron'), [])
+        self.assertEqual(self._search('bazil')[0], 'Basil')
+
+    def test_short_and_empty_queries(self):
+        """
+        Test queries shorter than a trigram and empty queries
+        """
+        self.assertEqual(self._search('eg'), ['Egg'])
+        self.assertEqual(self._search('  '), [])
+
+    def test_index_follows_renames_and_deletes(self):
+        """
+        Test the index is kept in sync with the ingredient table
+        """
+        basil = Ingredient.objects.get(name='Basil')
+        basil.name = 'Thai basil'
+        basil.save()
+        self.assertEqual(self._search('thai'), ['Thai basil'])
+
+        basil.delete()
+        self.assertEqual(self._search('basil'), [])
+
+    def test_match_names(self):
+        """
+        Test names are matched to existing ingredients by their normalized form in one query
+        """
+        with self.assertNumQueries(1):
+            matches = IngredientService.match_names(['tomatoes', 'POTATO', 'egg', 'saffron'])
+        self.assertEqual(
+            {name: ingredient.name for name, ingredient in matches.items()},
+            {'tomato': 'Tomato', 'potato': 'Potatoes', 'egg': 'Egg'}
+        )
+
+    def test_find_or_create_ingredient_matches_plurals(self):
+        """
+        Test find_or_create_ingredient() reuses an ingredient stored as a plural or singular
+        """
+        self.assertEqual(IngredientService.find_or_create_ingredient('Tomatoes').name, 'Tomato')
+        self.assertEqual(IngredientService.find_or_create_ingredient('potato').name, 'Potatoes')
+        self.assertEqual(IngredientService.find_or_create_ingredient('Eggs').name, 'Egg')
+        self.assertEqual(IngredientService.find_or_create_ingredient('2 large eggs, beaten').name, 'Egg')
+        self.assertEqual(Ingredient.objects.count(), 7)
+
+        self.assertEqual(IngredientService.find_or_create_ingredient('1 cup chopped Walnuts').name, 'Walnuts')
+        self.assertEqual(Ingredient.objects.get(name='Walnuts').normalized_name, 'walnut')
+        Ingredient.objects.get(name='Walnuts').delete()
+
+        ingredients = IngredientService.find_or_create_ingredients(['Onions', 'onion'])
+        self.assertEqual(ingredients['onions'], ingredients['onion'])
+        self.assertEqual(Ingredient.objects.count(), 8)
+
+    @unittest.skipUnless(connection.vendor == 'sqlite', "The search index is SQLite only")
+    def test_index_and_triggers_exist(self):
+        """
+        Test the search index and its triggers survive every migration, when SQLite has FTS5
+        """
+        probe = connection.Database.connect(':memory:')
+        try:
+            fts5 = ('ENABLE_FTS5',) in probe.execute('PRAGMA compile_options').fetchall()
+        finally:
+            probe.close()
+        if connection.Database.sqlite_version_info < (3, 34, 0) or not fts5:
+            self.skipTest("SQLite has no FTS5 trigram tokenizer")
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT type, name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+            schema = set(cursor.fetchall())
+        self.assertIn(('table', SEARCH_TABLE), schema)
+        for trigger in SEARCH_TRIGGERS:
+            self.assertIn(('trigger', trigger), schema)
@@ -4,6 +4,7 @@ from .apis import IngredientAPI, IngredientCategoryAPI
 urlpatterns = [
     path('', IngredientAPI.list),
     path('<int:id>/', IngredientAPI.detail),
+    path('search/', IngredientAPI.search),
 
     path('categories/', IngredientCategoryAPI.list),
     path('categories/<int:id>/', IngredientCategoryAPI.detail),
@@ -0,0 +1,21 @@
+from django.contrib import admin
+
+from .models import IngredientDensity, Unit, UnitAlias
+
+class UnitAliasInline(admin.TabularInline):
+    model = UnitAlias
+    extra = 1
+
+class UnitAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'label', 'dimension', 'factor')
+    list_filter = ('dimension',)
+    search_fields = ('name', 'aliases__alias')
+    inlines = [UnitAliasInline]
+
+class IngredientDensityAdmin(admin.ModelAdmin):
+    list_display = ('id', 'keyword', 'density', 'priority')
+    search_fields = ('keyword',)
+    ordering = ['priority', 'id']
+
+admin.site.register(Unit, UnitAdmin)
+admin.site.register(IngredientDensity, IngredientDensityAdmin)
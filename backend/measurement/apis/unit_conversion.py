@@ -3,11 +3,28 @@ from django.views.decorators.http import require_http_methods
 import json
 import logging
 
-from ..services.unit_conversion import convert_units, get_unit_type
+from ..services.ingredient_density import IngredientDensityService
+from ..services.unit_conversion import convert_units, convert_units_batch, get_unit_type
+from ..services.unit_registry import UnitRegistry
 from ingredient.models import Ingredient
 
 logger = logging.getLogger(__name__)
 
+MAX_BATCH_CONVERSIONS = 1000
+
+def _parse_ingredient_id(value):
+    """
+    Read an ingredient ID sent as a number or a string of digits
+
+    Returns:
+        The ID, or None if the value isn't one
+    """
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return None
+
 @require_http_methods(["POST"])
 def convert_units_api(request):
     """
@@ -42,10 +59,12 @@ def convert_units_api(request):
             }, status=400)
         
         ingredient_name = None
+        density = None
         if ingredient_id:
             try:
                 ingredient = Ingredient.objects.get(id=ingredient_id)
                 ingredient_name = ingredient.name
+                density = IngredientDensityService.density(ingredient)
             except Ingredient.DoesNotExist:
                 return JsonResponse({
                     'error': f'Ingredient with ID {ingredient_id} not found'
@@ -61,7 +80,8 @@ def convert_units_api(request):
             quantity, 
             from_unit, 
             to_unit, 
-            ingredient_name
+            ingredient_name,
+            density
         )
         
         return JsonResponse({
@@ -80,6 +100,102 @@ def convert_units_api(request):
             'error': 'An unexpected error occurred'
         }, status=500)
 
+@require_http_methods(["POST"])
+def convert_units_batch_api(request):
+    """
+    API endpoint to convert many quantities in one request
+
+    Request body:
+    {
+        "conversions": [
+            {
+                "quantity": number,
+                "from_unit": string,
+                "to_unit": string,
+                "ingredient_id": number (optional)
+            }
+        ]
+    }
+
+    Response:
+    {
+        "results": [
+            {
+                "converted_quantity": number,
+                "from_unit": string,
+                "to_unit": string,
+                "is_exact": boolean
+            }
+            or
+            {
+                "error": string
+            }
+        ]
+    }
+    """
+    try:
+        data = json.loads(request.body)
+        conversions = data.get('conversions')
+
+        if not isinstance(conversions, list) or not all(isinstance(row, dict) for row in conversions):
+            return JsonResponse({
+                'error': 'conversions must be a list of objects'
+            }, status=400)
+        if len(conversions) > MAX_BATCH_CONVERSIONS:
+            return JsonResponse({
+                'error': f'At most {MAX_BATCH_CONVERSIONS} conversions can be sent at once'
+            }, status=400)
+
+        ingredient_ids = [
+            _parse_ingredient_id(row['ingredient_id']) if row.get('ingredient_id') is not None else None
+            for row in conversions
+        ]
+        # Resolve every ingredient density with at most a single query
+        densities = IngredientDensityService.densities(
+            {ingredient_id for ingredient_id in ingredient_ids if ingredient_id is not None}
+        )
+
+        results = [None] * len(conversions)
+        batch_rows = []
+        batch = []
+        for row_index, row in enumerate(conversions):
+            quantity = row.get('quantity')
+            from_unit = row.get('from_unit')
+            to_unit = row.get('to_unit')
+            ingredient_id = ingredient_ids[row_index]
+
+            if not all([quantity is not None, from_unit, to_unit]):
+                results[row_index] = {'error': 'Missing required parameters'}
+            elif row.get('ingredient_id') is not None and ingredient_id is None:
+                results[row_index] = {'error': 'ingredient_id must be an integer'}
+            elif ingredient_id is not None and ingredient_id not in densities:
+                results[row_index] = {'error': f'Ingredient with ID {ingredient_id} not found'}
+            else:
+                batch_rows.append(row_index)
+                batch.append((quantity, from_unit, to_unit, None, densities.get(ingredient_id)))
+
+        for row_index, result in zip(batch_rows, convert_units_batch(batch)):
+            if 'error' not in result:
+                row = conversions[row_index]
+                from_type = get_unit_type(row['from_unit'])
+                result.update({
+                    'from_unit': row['from_unit'],
+                    'to_unit': row['to_unit'],
+                    'is_exact': from_type == get_unit_type(row['to_unit']) and from_type != 'count'
+                })
+            results[row_index] = result
+
+        return JsonResponse({'results': results})
+    except ValueError as e:
+        return JsonResponse({
+            'error': str(e)
+        }, status=400)
+    except Exception as e:
+        logger.error(f"Error in convert_units_batch_api: {str(e)}")
+        return JsonResponse({
+            'error': 'An unexpected error occurred'
+        }, status=500)
+
 @require_http_methods(["GET"])
 def get_common_units(request):
     """
@@ -100,26 +216,13 @@ def get_common_units(request):
         ]
     }
     """
+    units = UnitRegistry.current().units_by_dimension()
     common_units = {
-        "weight": [
-            {"value": "g", "label": "Grams (g)"},
-            {"value": "kg", "label": "Kilograms (kg)"},
-            {"value": "oz", "label": "Ounces (oz)"},
-            {"value": "lb", "label": "Pounds (lb)"}
-        ],
-        "volume": [
-            {"value": "ml", "label": "Milliliters (ml)"},
-            {"value": "l", "label": "Liters (l)"},
-            {"value": "tsp", "label": "Teaspoons (tsp)"},
-            {"value": "tbsp", "label": "Tablespoons (tbsp)"},
-            {"value": "cup", "label": "Cups"},
-            {"value": "pint", "label": "Pints"},
-            {"value": "quart", "label": "Quarts"},
-            {"value": "gallon", "label": "Gallons"}
-        ],
-        "count": [
-            {"value": "", "label": "Count (no unit)"}
-        ]
+        dimension: [{"value": name, "label": label} for name, label in units.get(dimension, [])]
+        for dimension in ("weight", "volume")
     }
+    common_units["count"] = [{"value": "", "label": "Count (no unit)"}] + [
+        {"value": name, "label": label} for name, label in units.get("count", [])
+    ]
     
     return JsonResponse(common_units)
@@ -1,5 +1,18 @@
 from django.apps import AppConfig
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 
 class MeasurementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'measurement'
+
+    def ready(self):
+        from .models import IngredientDensity, Unit, UnitAlias
+        from .services.unit_registry import UnitRegistry
+
+        def invalidate_registry(sender, **kwargs):
+            transaction.on_commit(UnitRegistry.invalidate)
+
+        for model in (Unit, UnitAlias, IngredientDensity):
+            post_save.connect(invalidate_registry, sender=model, weak=False, dispatch_uid=f'measurement.registry.save.{model.__name__}')
+            post_delete.connect(invalidate_registry, sender=model, weak=False, dispatch_uid=f'measurement.registry.delete.{model.__name__}')
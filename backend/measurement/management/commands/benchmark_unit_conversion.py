@@ -0,0 +1,92 @@
+import timeit
+from decimal import Decimal
+from typing import Optional, Union
+
+from django.core.management.base import BaseCommand
+
+from measurement.services.unit_conversion import (
+    VOLUME_CONVERSIONS, WEIGHT_CONVERSIONS, convert_units, get_ingredient_density
+)
+
+# (quantity, from_unit, to_unit, ingredient_name) covering the common shapes of call
+CASES = [
+    (1, 'kg', 'g', None),
+    (2.5, 'cup', 'tbsp', None),
+    (12, 'oz', 'lb', None),
+    (250, 'g', 'cup', 'flour'),
+    (3, 'tbsp', 'g', 'butter'),
+    (Decimal('1.25'), 'L', 'ml', None),
+]
+
+def legacy_convert_units(
+    quantity: Union[float, Decimal],
+    from_unit: str,
+    to_unit: str,
+    ingredient_name: Optional[str] = None
+) -> Decimal:
+    """
+    convert_units as it was before conversion factors were compiled, kept as the benchmark baseline
+    """
+    def get_unit_type(unit):
+        if not unit:
+            return 'count'
+        unit = unit.lower()
+        if unit in WEIGHT_CONVERSIONS:
+            return 'weight'
+        elif unit in VOLUME_CONVERSIONS:
+            return 'volume'
+        return 'count'
+
+    if not from_unit and not to_unit:
+        return Decimal(str(quantity))
+    if not from_unit or not to_unit:
+        raise ValueError("Cannot convert between a unit and no unit")
+    from_unit = from_unit.lower()
+    to_unit = to_unit.lower()
+    if from_unit == to_unit:
+        return Decimal(str(quantity))
+
+    from_type = get_unit_type(from_unit)
+    to_type = get_unit_type(to_unit)
+    if from_type == to_type:
+        if from_type == 'weight':
+            base_quantity = Decimal(str(quantity)) * Decimal(str(WEIGHT_CONVERSIONS[from_unit]))
+            return base_quantity / Decimal(str(WEIGHT_CONVERSIONS[to_unit]))
+        elif from_type == 'volume':
+            base_quantity = Decimal(str(quantity)) * Decimal(str(VOLUME_CONVERSIONS[from_unit]))
+            return base_quantity / Decimal(str(VOLUME_CONVERSIONS[to_unit]))
+        raise ValueError(f"Cannot convert between different count units: {from_unit} to {to_unit}")
+
+    if from_type in ['weight', 'volume'] and to_type in ['weight', 'volume']:
+        if not ingredient_name:
+            raise ValueError("Ingredient name required for weight-volume conversions")
+        density = get_ingredient_density(ingredient_name)
+        if from_type == 'weight':
+            weight_in_g = Decimal(str(quantity)) * Decimal(str(WEIGHT_CONVERSIONS[from_unit]))
+            volume_in_ml = weight_in_g / Decimal(str(density))
+            return volume_in_ml / Decimal(str(VOLUME_CONVERSIONS[to_unit]))
+        volume_in_ml = Decimal(str(quantity)) * Decimal(str(VOLUME_CONVERSIONS[from_unit]))
+        weight_in_g = volume_in_ml * Decimal(str(density))
+        return weight_in_g / Decimal(str(WEIGHT_CONVERSIONS[to_unit]))
+
+    raise ValueError(f"Cannot convert from {from_type} to {to_type}")
+
+class Command(BaseCommand):
+    help = 'Compare the per-call cost of convert_units against the pre-compiled implementation'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', type=int, default=20000, help='Calls per case')
+        parser.add_argument('--repeat', type=int, default=5, help='Timing runs per case, the fastest is reported')
+
+    def handle(self, *args, **options):
+        number = options['number']
+        repeat = options['repeat']
+
+        self.stdout.write(f"{'case':<32}{'legacy (us)':>14}{'compiled (us)':>16}{'speedup':>10}")
+        for case in CASES:
+            legacy = min(timeit.repeat(lambda: legacy_convert_units(*case), number=number, repeat=repeat))
+            compiled = min(timeit.repeat(lambda: convert_units(*case), number=number, repeat=repeat))
+            label = f"{case[0]} {case[1]} -> {case[2]}" + (f" ({case[3]})" if case[3] else '')
+            self.stdout.write(
+                f"{label:<32}{legacy / number * 1e6:>14.2f}{compiled / number * 1e6:>16.2f}{legacy / compiled:>9.1f}x"
+            )
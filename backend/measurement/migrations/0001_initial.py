@@ -0,0 +1,49 @@
+# Generated by Django 5.2 on 2026-10-18 11:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngredientDensity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('keyword', models.CharField(max_length=120, unique=True)),
+                ('density', models.FloatField()),
+                ('priority', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'ingredient densities',
+                'ordering': ['priority', 'id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Unit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=20, unique=True)),
+                ('label', models.CharField(max_length=50)),
+                ('dimension', models.CharField(choices=[('weight', 'Weight'), ('volume', 'Volume'), ('count', 'Count')], max_length=10)),
+                ('factor', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='UnitAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=50, unique=True)),
+                ('unit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='measurement.unit')),
+            ],
+        ),
+    ]
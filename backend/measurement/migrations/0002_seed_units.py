@@ -0,0 +1,69 @@
+from django.db import migrations
+
+# (name, label, dimension, factor, aliases), frozen copy of measurement.services.unit_defaults
+UNITS = [
+    ('g', 'Grams (g)', 'weight', 1, ['gram', 'grams']),
+    ('kg', 'Kilograms (kg)', 'weight', 1000, ['kgs', 'kilogram', 'kilograms']),
+    ('oz', 'Ounces (oz)', 'weight', 28.35, ['ounce', 'ounces']),
+    ('lb', 'Pounds (lb)', 'weight', 453.59, ['lbs', 'pound', 'pounds']),
+    ('ml', 'Milliliters (ml)', 'volume', 1, ['milliliter', 'milliliters', 'millilitre', 'millilitres']),
+    ('l', 'Liters (l)', 'volume', 1000, ['liter', 'liters', 'litre', 'litres']),
+    ('tsp', 'Teaspoons (tsp)', 'volume', 4.93, ['tsps', 'teaspoon', 'teaspoons']),
+    ('tbsp', 'Tablespoons (tbsp)', 'volume', 14.79, ['tbsps', 'tablespoon', 'tablespoons']),
+    ('cup', 'Cups', 'volume', 236.59, ['cups']),
+    ('pint', 'Pints', 'volume', 473.18, ['pints']),
+    ('quart', 'Quarts', 'volume', 946.35, ['quarts', 'qt']),
+    ('gallon', 'Gallons', 'volume', 3785.41, ['gallons', 'gal']),
+]
+
+# (keyword, density, priority): specific ingredients first, then category keywords
+DENSITIES = [
+    ('water', 1.0, 0),
+    ('milk', 1.03, 0),
+    ('flour', 0.53, 0),
+    ('sugar', 0.85, 0),
+    ('salt', 1.2, 0),
+    ('oil', 0.92, 0),
+    ('butter', 0.96, 0),
+    ('honey', 1.42, 0),
+    ('liquid', 1.0, 10),
+    ('sauce', 1.0, 10),
+    ('beverage', 1.0, 10),
+    ('juice', 1.0, 10),
+    ('powder', 0.6, 20),
+    ('spice', 0.6, 20),
+    ('meat', 1.1, 30),
+    ('protein', 1.1, 30),
+    ('cheese', 1.1, 30),
+    ('chicken', 1.1, 30),
+    ('beef', 1.1, 30),
+    ('pork', 1.1, 30),
+]
+
+def seed_units(apps, schema_editor):
+    Unit = apps.get_model('measurement', 'Unit')
+    UnitAlias = apps.get_model('measurement', 'UnitAlias')
+    IngredientDensity = apps.get_model('measurement', 'IngredientDensity')
+
+    for name, label, dimension, factor, aliases in UNITS:
+        unit = Unit.objects.create(name=name, label=label, dimension=dimension, factor=factor)
+        UnitAlias.objects.bulk_create(UnitAlias(alias=alias, unit=unit) for alias in aliases)
+
+    IngredientDensity.objects.bulk_create(
+        IngredientDensity(keyword=keyword, density=density, priority=priority)
+        for keyword, density, priority in DENSITIES
+    )
+
+def unseed_units(apps, schema_editor):
+    apps.get_model('measurement', 'IngredientDensity').objects.all().delete()
+    apps.get_model('measurement', 'Unit').objects.all().delete()
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurement', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_units, unseed_units),
+    ]
@@ -0,0 +1,2 @@
+from .unit import *
+from .density import *
@@ -0,0 +1,19 @@
+from django.db import models
+
+class IngredientDensity(models.Model):
+    """
+    Density for ingredients whose name contains keyword
+
+    When several keywords match a name, the one with the lowest priority wins.
+    """
+    keyword = models.CharField(max_length=120, unique=True)
+    # Density in g/ml
+    density = models.FloatField()
+    priority = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['priority', 'id']
+        verbose_name_plural = 'ingredient densities'
+
+    def __str__(self):
+        return f"{self.keyword} ({self.density} g/ml)"
@@ -0,0 +1,27 @@
+from django.db import models
+
+class Unit(models.Model):
+    DIMENSION_CHOICES = [
+        ('weight', 'Weight'),
+        ('volume', 'Volume'),
+        ('count', 'Count'),
+    ]
+
+    name = models.CharField(max_length=20, unique=True)
+    label = models.CharField(max_length=50)
+    dimension = models.CharField(max_length=10, choices=DIMENSION_CHOICES)
+    # Size of one unit in the dimension's base unit (g for weight, ml for volume)
+    factor = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return self.name
+
+class UnitAlias(models.Model):
+    alias = models.CharField(max_length=50, unique=True)
+    unit = models.ForeignKey(Unit, on_delete=models.CASCADE, related_name='aliases')
+
+    def __str__(self):
+        return f"{self.alias} -> {self.unit.name}"
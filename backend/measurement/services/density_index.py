@@ -0,0 +1,70 @@
+from collections import deque
+from typing import Generic, Iterable, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+class DensityIndex(Generic[T]):
+    """
+    Aho-Corasick automaton over keywords, built once
+
+    Each keyword carries a value, and lookup returns the value of the
+    earliest-added keyword found anywhere in the text. That reproduces the
+    first-match-wins order of scanning a table of keywords with `in`, but in
+    a single pass over the text no matter how many keywords there are.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, T]]):
+        self.__goto = [{}]
+        self.__fail = [0]
+        # Best (lowest priority) keyword ending at each state, as (priority, value)
+        self.__output = [None]
+
+        for priority, (keyword, value) in enumerate(keywords):
+            state = 0
+            for char in keyword:
+                next_state = self.__goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.__goto)
+                    self.__goto[state][char] = next_state
+                    self.__goto.append({})
+                    self.__fail.append(0)
+                    self.__output.append(None)
+                state = next_state
+            if self.__output[state] is None:
+                self.__output[state] = (priority, value)
+
+        # Breadth-first pass to link failure states and fold their outputs in
+        queue = deque(self.__goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.__goto[state].items():
+                queue.append(next_state)
+                fail = self.__fail[state]
+                while fail and char not in self.__goto[fail]:
+                    fail = self.__fail[fail]
+                self.__fail[next_state] = self.__goto[fail].get(char, 0)
+                self.__output[next_state] = self.__best(
+                    self.__output[next_state], self.__output[self.__fail[next_state]]
+                )
+
+    def lookup(self, text: str) -> Optional[T]:
+        """Return the value of the first-added keyword contained in text, or None"""
+        goto = self.__goto
+        fail = self.__fail
+        output = self.__output
+        best = None
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            best = self.__best(best, output[state])
+        return best[1] if best is not None else None
+
+    @staticmethod
+    def __best(first, second):
+        if first is None:
+            return second
+        if second is None or first[0] <= second[0]:
+            return first
+        return second
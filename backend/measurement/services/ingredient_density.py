@@ -0,0 +1,47 @@
+import logging
+from typing import Dict, Iterable
+
+from ingredient.models import Ingredient
+from .unit_conversion import get_ingredient_density
+
+logger = logging.getLogger(__name__)
+
+class IngredientDensityService:
+    """
+    Resolves ingredient densities
+
+    An ingredient's own Ingredient.density is used when it has one; otherwise
+    the density is guessed from its name with the unit registry's keywords.
+    Guesses are never stored, so editing the registry's densities changes
+    them for every ingredient without one of its own.
+    """
+
+    @staticmethod
+    def density(ingredient: Ingredient) -> float:
+        """
+        Return the density of a loaded ingredient in g/ml
+        """
+        if ingredient.density is not None:
+            return ingredient.density
+        return get_ingredient_density(ingredient.name)
+
+    @staticmethod
+    def densities(ingredient_ids: Iterable[int]) -> Dict[int, float]:
+        """
+        Return the density of each existing ingredient with one query
+
+        Args:
+            ingredient_ids: The IDs of the ingredients
+
+        Returns:
+            Dict mapping ingredient ID to density in g/ml; IDs that don't exist are left out
+        """
+        ingredient_ids = set(ingredient_ids)
+        if not ingredient_ids:
+            return {}
+        return {
+            ingredient_id: density if density is not None else get_ingredient_density(name)
+            for ingredient_id, name, density in Ingredient.objects.filter(
+                id__in=ingredient_ids
+            ).values_list('id', 'name', 'density')
+        }
@@ -1,55 +1,33 @@
 from decimal import Decimal
-from typing import Dict, Optional, Union
-
-# Define unit conversion constants
-WEIGHT_CONVERSIONS = {
-    'g': 1,           # base unit for weight
-    'kg': 1000,       # 1 kg = 1000 g
-    'oz': 28.35,      # 1 oz = 28.35 g
-    'lb': 453.59,     # 1 lb = 453.59 g
-}
-
-VOLUME_CONVERSIONS = {
-    'ml': 1,          # base unit for volume
-    'l': 1000,        # 1 l = 1000 ml
-    'tsp': 4.93,      # 1 tsp = 4.93 ml
-    'tbsp': 14.79,    # 1 tbsp = 14.79 ml
-    'cup': 236.59,    # 1 cup = 236.59 ml
-    'pint': 473.18,   # 1 pint = 473.18 ml
-    'quart': 946.35,  # 1 quart = 946.35 ml
-    'gallon': 3785.41 # 1 gallon = 3785.41 ml
-}
-
-# Common ingredient densities (g/ml)
-INGREDIENT_DENSITIES = {
-    'water': 1.0,
-    'milk': 1.03,
-    'flour': 0.53,
-    'sugar': 0.85,
-    'salt': 1.2,
-    'oil': 0.92,
-    'butter': 0.96,
-    'honey': 1.42,
-    # Add more common ingredients
-}
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .unit_converter import UnitConverter
+from .unit_defaults import (
+    CATEGORY_DENSITY_KEYWORDS, DEFAULT_DENSITY, INGREDIENT_DENSITIES, VOLUME_CONVERSIONS, WEIGHT_CONVERSIONS
+)
+from .unit_registry import UnitRegistry
+
+# Units a quantity can be restated in, smallest first, each with the smallest
+# amount worth writing in that unit. Quantities stay in their measuring system.
+HUMANIZED_UNIT_LADDERS = [
+    [('tsp', 0), ('tbsp', 1), ('cup', Decimal('0.25')), ('gallon', 1)],
+    [('ml', 0), ('l', 1)],
+    [('oz', 0), ('lb', 1)],
+    [('g', 0), ('kg', 1)],
+]
 
 def get_unit_type(unit: str) -> str:
     """Determine if a unit is for weight, volume, or count"""
-    if not unit:
-        return 'count'
-    unit = unit.lower()
-    if unit in WEIGHT_CONVERSIONS:
-        return 'weight'
-    elif unit in VOLUME_CONVERSIONS:
-        return 'volume'
-    else:
-        return 'count'
+    return UnitRegistry.current().converter.unit_type(unit)
 
 def convert_units(
     quantity: Union[float, Decimal], 
     from_unit: str, 
     to_unit: str, 
-    ingredient_name: Optional[str] = None
+    ingredient_name: Optional[str] = None,
+    density: Optional[float] = None
 ) -> Decimal:
     """
     Convert a quantity from one unit to another
@@ -59,89 +37,112 @@ def convert_units(
         from_unit: The unit to convert from
         to_unit: The unit to convert to
         ingredient_name: Optional ingredient name for density-based conversions
+        density: Optional known density in g/ml, used instead of guessing from ingredient_name
         
     Returns:
         The converted quantity as a Decimal
     """
-    # Handle null or empty units
-    if not from_unit and not to_unit:
-        return Decimal(str(quantity))
-    if not from_unit or not to_unit:
-        raise ValueError("Cannot convert between a unit and no unit")
-    
-    # Normalize units to lowercase
-    from_unit = from_unit.lower()
-    to_unit = to_unit.lower()
-    
-    # If units are the same, no conversion needed
-    if from_unit == to_unit:
+    return UnitRegistry.current().converter.convert(quantity, from_unit, to_unit, ingredient_name, density)
+
+def convert_units_batch(
+    conversions: Iterable[Tuple[Union[float, Decimal], str, str, Optional[str], Optional[float]]]
+) -> List[Dict]:
+    """
+    Convert many quantities at once
+
+    Conversion factors are looked up once per distinct (from_unit, to_unit,
+    ingredient_name, density) and the quantities are scaled in a single NumPy operation,
+    so results are floats rather than Decimals.
+
+    Args:
+        conversions: (quantity, from_unit, to_unit, ingredient_name, density) tuples
+
+    Returns:
+        One dict per conversion, in order, with either "converted_quantity" or "error"
+    """
+    results = []
+    quantities = []
+    factors = []
+    converted_rows = []
+    factor_cache = {}
+    converter = UnitRegistry.current().converter
+
+    for quantity, from_unit, to_unit, ingredient_name, density in conversions:
+        key = (from_unit, to_unit, ingredient_name, density)
+        try:
+            if key not in factor_cache:
+                numerator, denominator = converter.factor(from_unit, to_unit, ingredient_name, density)
+                factor_cache[key] = float(numerator / denominator)
+            quantities.append(float(quantity))
+        except (TypeError, ValueError) as e:
+            results.append({"error": str(e)})
+            continue
+        factors.append(factor_cache[key])
+        converted_rows.append(len(results))
+        results.append(None)
+
+    converted = np.asarray(quantities, dtype=np.float64) * np.asarray(factors, dtype=np.float64)
+    for row, converted_quantity in zip(converted_rows, converted.tolist()):
+        results[row] = {"converted_quantity": converted_quantity}
+    return results
+
+def try_convert_units(
+    quantity: Union[float, Decimal],
+    from_unit: Optional[str],
+    to_unit: Optional[str],
+    ingredient_name: Optional[str] = None,
+    density: Optional[float] = None
+) -> Optional[Decimal]:
+    """
+    Convert a quantity like convert_units, but return None instead of raising
+    when the units can't be converted. Units are compared case-insensitively and
+    a missing unit only matches another missing unit.
+    """
+    if (from_unit or '').lower() == (to_unit or '').lower():
         return Decimal(str(quantity))
-    
-    # Get unit types
-    from_type = get_unit_type(from_unit)
-    to_type = get_unit_type(to_unit)
-    
-    # Convert within the same type
-    if from_type == to_type:
-        if from_type == 'weight':
-            # Convert to base unit (g) then to target unit
-            base_quantity = Decimal(str(quantity)) * Decimal(str(WEIGHT_CONVERSIONS[from_unit]))
-            return base_quantity / Decimal(str(WEIGHT_CONVERSIONS[to_unit]))
-        elif from_type == 'volume':
-            # Convert to base unit (ml) then to target unit
-            base_quantity = Decimal(str(quantity)) * Decimal(str(VOLUME_CONVERSIONS[from_unit]))
-            return base_quantity / Decimal(str(VOLUME_CONVERSIONS[to_unit]))
-        else:
-            # Count units can't be converted between different units
-            raise ValueError(f"Cannot convert between different count units: {from_unit} to {to_unit}")
-    
-    # Convert between different types (weight <-> volume)
-    if from_type in ['weight', 'volume'] and to_type in ['weight', 'volume']:
-        if not ingredient_name:
-            raise ValueError("Ingredient name required for weight-volume conversions")
-        
-        # Get ingredient density
-        density = get_ingredient_density(ingredient_name)
-        
-        if from_type == 'weight' and to_type == 'volume':
-            # weight to volume: volume = weight / density
-            # Convert weight to grams first
-            weight_in_g = Decimal(str(quantity)) * Decimal(str(WEIGHT_CONVERSIONS[from_unit]))
-            # Convert grams to ml using density
-            volume_in_ml = weight_in_g / Decimal(str(density))
-            # Convert ml to target volume unit
-            return volume_in_ml / Decimal(str(VOLUME_CONVERSIONS[to_unit]))
-        else:  # volume to weight
-            # volume to weight: weight = volume * density
-            # Convert volume to ml first
-            volume_in_ml = Decimal(str(quantity)) * Decimal(str(VOLUME_CONVERSIONS[from_unit]))
-            # Convert ml to grams using density
-            weight_in_g = volume_in_ml * Decimal(str(density))
-            # Convert grams to target weight unit
-            return weight_in_g / Decimal(str(WEIGHT_CONVERSIONS[to_unit]))
-    
-    # Other conversions not supported
-    raise ValueError(f"Cannot convert from {from_type} to {to_type}")
+    try:
+        return convert_units(quantity, from_unit, to_unit, ingredient_name, density)
+    except ValueError:
+        return None
+
+def humanize_quantity(quantity: Union[float, Decimal], unit: Optional[str]) -> Tuple[Decimal, Optional[str]]:
+    """
+    Restate a quantity in the most readable unit of its measuring system
+
+    For example 48 tsp becomes 1 cup and 1500 g becomes 1.5 kg. Units outside
+    HUMANIZED_UNIT_LADDERS are returned unchanged, and so is the original
+    spelling of the unit when it is already the best fit.
+
+    Returns:
+        The (quantity, unit) to display
+    """
+    if not isinstance(quantity, Decimal):
+        quantity = Decimal(str(quantity))
+
+    if quantity <= 0:
+        return quantity, unit
+
+    canonical = UnitRegistry.current().canonical_unit(unit)
+    ladder = next((ladder for ladder in HUMANIZED_UNIT_LADDERS if canonical in dict(ladder)), None)
+    if ladder is None:
+        return quantity, unit
+
+    best = (quantity, canonical)
+    for rung_unit, minimum in ladder:
+        converted = try_convert_units(quantity, canonical, rung_unit)
+        if converted is not None and converted >= minimum:
+            best = (converted, rung_unit)
+
+    if best[1] == canonical:
+        return quantity, unit
+    return best
 
 def get_ingredient_density(ingredient_name: str) -> float:
     """
     Get the density of an ingredient in g/ml
-    
-    This function tries to find the density from a lookup table of common ingredients
+
+    The name is matched against the registry's density keywords in priority
+    order, in a single pass over its density index, falling back to
+    DEFAULT_DENSITY. Results are memoized per name until the registry changes.
     """
-    # Check the lookup table using the ingredient name
-    ingredient_name = ingredient_name.lower()
-    for key, density in INGREDIENT_DENSITIES.items():
-        if key in ingredient_name:
-            return density
-    
-    # Use category-based defaults based on ingredient name
-    if any(word in ingredient_name for word in ['liquid', 'oil', 'sauce', 'beverage', 'water', 'milk', 'juice']):
-        return 1.0  # Approximate density of water
-    elif any(word in ingredient_name for word in ['flour', 'powder', 'spice', 'sugar', 'salt']):
-        return 0.6  # Approximate density of flour
-    elif any(word in ingredient_name for word in ['meat', 'protein', 'cheese', 'chicken', 'beef', 'pork']):
-        return 1.1  # Approximate density of meat
-    
-    # Default fallback
-    return 0.8  # A middle-ground default
+    return UnitRegistry.current().density(ingredient_name)
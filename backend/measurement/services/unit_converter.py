@@ -0,0 +1,130 @@
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+
+class UnitConverter:
+    """
+    Unit converter with every conversion factor compiled up front
+
+    Each unit pair maps to an exact (numerator, denominator) pair of Decimals,
+    so a conversion is one dict lookup followed by a multiply and a divide.
+    The same pairs back the vectorized convert_units_batch.
+    Weight <-> volume pairs are compiled per density; densities that weren't
+    known when the converter was built are compiled on first use. Aliases
+    ("cups", "tablespoons") are resolved to their canonical unit first.
+    """
+
+    def __init__(
+        self,
+        weight_units: Dict[str, float],
+        volume_units: Dict[str, float],
+        densities: Iterable[float],
+        density_lookup: Callable[[str], float],
+        aliases: Optional[Dict[str, str]] = None
+    ):
+        self.__density_lookup = density_lookup
+        self.__canonical = {alias.lower(): unit for alias, unit in (aliases or {}).items()}
+        self.unit_types = {}
+        self.__bases = {}
+        for unit_type, units in (('weight', weight_units), ('volume', volume_units)):
+            for unit, factor in units.items():
+                self.unit_types[unit] = unit_type
+                self.__bases[unit] = Decimal(str(factor))
+
+        self.__factors = {}
+        for from_unit, from_type in self.unit_types.items():
+            for to_unit, to_type in self.unit_types.items():
+                if from_type == to_type:
+                    self.__factors[(from_unit, to_unit)] = (self.__bases[from_unit], self.__bases[to_unit])
+
+        self.__identity = (Decimal(1), Decimal(1))
+        self.__density_factors = {}
+        for density in densities:
+            self.__compile_density(density)
+
+    def unit_type(self, unit: Optional[str]) -> str:
+        """Determine if a unit is for weight, volume, or count"""
+        if not unit:
+            return 'count'
+        unit = unit.lower()
+        return self.unit_types.get(self.__canonical.get(unit, unit), 'count')
+
+    def convert(
+        self,
+        quantity: Union[float, Decimal],
+        from_unit: str,
+        to_unit: str,
+        ingredient_name: Optional[str] = None,
+        density: Optional[float] = None
+    ) -> Decimal:
+        """
+        Convert a quantity from one unit to another, see unit_conversion.convert_units
+        """
+        if not isinstance(quantity, Decimal):
+            quantity = Decimal(str(quantity))
+
+        factor = self.factor(from_unit, to_unit, ingredient_name, density)
+        if factor is self.__identity:
+            return quantity
+        numerator, denominator = factor
+        return quantity * numerator / denominator
+
+    def factor(
+        self,
+        from_unit: str,
+        to_unit: str,
+        ingredient_name: Optional[str] = None,
+        density: Optional[float] = None
+    ) -> Tuple[Decimal, Decimal]:
+        """
+        Return the exact (numerator, denominator) that converts from_unit to to_unit
+
+        Weight <-> volume conversions use density when given, otherwise the
+        density guessed from ingredient_name.
+        """
+        # Handle null or empty units
+        if not from_unit and not to_unit:
+            return self.__identity
+        if not from_unit or not to_unit:
+            raise ValueError("Cannot convert between a unit and no unit")
+
+        from_unit = from_unit.lower()
+        from_unit = self.__canonical.get(from_unit, from_unit)
+        to_unit = to_unit.lower()
+        to_unit = self.__canonical.get(to_unit, to_unit)
+        if from_unit == to_unit:
+            return self.__identity
+
+        factor = self.__factors.get((from_unit, to_unit))
+        if factor is None:
+            from_type = self.unit_types.get(from_unit, 'count')
+            to_type = self.unit_types.get(to_unit, 'count')
+            if from_type == 'count' and to_type == 'count':
+                raise ValueError(f"Cannot convert between different count units: {from_unit} to {to_unit}")
+            if from_type == 'count' or to_type == 'count':
+                raise ValueError(f"Cannot convert from {from_type} to {to_type}")
+            if density is None:
+                if not ingredient_name:
+                    raise ValueError("Ingredient name required for weight-volume conversions")
+                density = self.__density_lookup(ingredient_name)
+            if density <= 0:
+                raise ValueError("Density must be greater than 0")
+
+            factor = self.__density_factors.get((from_unit, to_unit, density))
+            if factor is None:
+                self.__compile_density(density)
+                factor = self.__density_factors[(from_unit, to_unit, density)]
+        return factor
+
+    def __compile_density(self, density: float) -> None:
+        exact_density = Decimal(str(density))
+        for from_unit, from_type in self.unit_types.items():
+            for to_unit, to_type in self.unit_types.items():
+                if from_type == 'weight' and to_type == 'volume':
+                    # volume = weight / density
+                    factor = (self.__bases[from_unit], exact_density * self.__bases[to_unit])
+                elif from_type == 'volume' and to_type == 'weight':
+                    # weight = volume * density
+                    factor = (self.__bases[from_unit] * exact_density, self.__bases[to_unit])
+                else:
+                    continue
+                self.__density_factors[(from_unit, to_unit, density)] = factor
@@ -0,0 +1,79 @@
+"""
+Built-in unit and density data
+
+The registry seed migration holds a frozen copy of these tables, and
+UnitRegistry falls back to them when the registry tables are empty or not
+migrated yet.
+"""
+
+# Define unit conversion constants
+WEIGHT_CONVERSIONS = {
+    'g': 1,           # base unit for weight
+    'kg': 1000,       # 1 kg = 1000 g
+    'oz': 28.35,      # 1 oz = 28.35 g
+    'lb': 453.59,     # 1 lb = 453.59 g
+}
+
+VOLUME_CONVERSIONS = {
+    'ml': 1,          # base unit for volume
+    'l': 1000,        # 1 l = 1000 ml
+    'tsp': 4.93,      # 1 tsp = 4.93 ml
+    'tbsp': 14.79,    # 1 tbsp = 14.79 ml
+    'cup': 236.59,    # 1 cup = 236.59 ml
+    'pint': 473.18,   # 1 pint = 473.18 ml
+    'quart': 946.35,  # 1 quart = 946.35 ml
+    'gallon': 3785.41 # 1 gallon = 3785.41 ml
+}
+
+# Common ingredient densities (g/ml)
+INGREDIENT_DENSITIES = {
+    'water': 1.0,
+    'milk': 1.03,
+    'flour': 0.53,
+    'sugar': 0.85,
+    'salt': 1.2,
+    'oil': 0.92,
+    'butter': 0.96,
+    'honey': 1.42,
+    # Add more common ingredients
+}
+
+# Category-based densities for ingredients not in INGREDIENT_DENSITIES, checked in order
+CATEGORY_DENSITY_KEYWORDS = [
+    (['liquid', 'oil', 'sauce', 'beverage', 'water', 'milk', 'juice'], 1.0),  # Approximate density of water
+    (['flour', 'powder', 'spice', 'sugar', 'salt'], 0.6),  # Approximate density of flour
+    (['meat', 'protein', 'cheese', 'chicken', 'beef', 'pork'], 1.1),  # Approximate density of meat
+]
+
+DEFAULT_DENSITY = 0.8  # A middle-ground default
+
+# Other spellings of each unit, recognized when parsing and converting
+UNIT_ALIASES = {
+    'g': ['gram', 'grams'],
+    'kg': ['kgs', 'kilogram', 'kilograms'],
+    'oz': ['ounce', 'ounces'],
+    'lb': ['lbs', 'pound', 'pounds'],
+    'ml': ['milliliter', 'milliliters', 'millilitre', 'millilitres'],
+    'l': ['liter', 'liters', 'litre', 'litres'],
+    'tsp': ['tsps', 'teaspoon', 'teaspoons'],
+    'tbsp': ['tbsps', 'tablespoon', 'tablespoons'],
+    'cup': ['cups'],
+    'pint': ['pints'],
+    'quart': ['quarts', 'qt'],
+    'gallon': ['gallons', 'gal'],
+}
+
+UNIT_LABELS = {
+    'g': 'Grams (g)',
+    'kg': 'Kilograms (kg)',
+    'oz': 'Ounces (oz)',
+    'lb': 'Pounds (lb)',
+    'ml': 'Milliliters (ml)',
+    'l': 'Liters (l)',
+    'tsp': 'Teaspoons (tsp)',
+    'tbsp': 'Tablespoons (tbsp)',
+    'cup': 'Cups',
+    'pint': 'Pints',
+    'quart': 'Quarts',
+    'gallon': 'Gallons',
+}
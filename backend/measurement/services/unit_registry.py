@@ -0,0 +1,159 @@
+import logging
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import DatabaseError
+
+from ..models import IngredientDensity, Unit, UnitAlias
+from . import unit_defaults
+from .density_index import DensityIndex
+from .unit_converter import UnitConverter
+
+logger = logging.getLogger(__name__)
+
+class UnitRegistrySnapshot:
+    """
+    Units, aliases and densities as loaded at one point in time, along with
+    the converter, density index and unit pattern built from them
+    """
+    MAX_DENSITY_MEMO = 4096
+
+    def __init__(
+        self,
+        units: List[Tuple[str, str, str, Optional[float]]],
+        aliases: Dict[str, str],
+        densities: List[Tuple[str, float]],
+        default_density: float
+    ):
+        """
+        Args:
+            units: (name, label, dimension, factor) rows in display order
+            aliases: Alternative spelling -> canonical unit name
+            densities: (keyword, density in g/ml) in priority order
+            default_density: Density for names that match no keyword
+        """
+        self.units = units
+        self.aliases = {name.lower(): name for name, _, _, _ in units}
+        self.aliases.update({alias.lower(): name for alias, name in aliases.items()})
+        self.default_density = default_density
+        self.density_index = DensityIndex((keyword.lower(), density) for keyword, density in densities)
+        self.__density_memo = {}
+
+        self.converter = UnitConverter(
+            {name: factor for name, _, dimension, factor in units if dimension == 'weight' and factor},
+            {name: factor for name, _, dimension, factor in units if dimension == 'volume' and factor},
+            {density for _, density in densities} | {default_density},
+            self.density,
+            self.aliases
+        )
+
+        # Longest spellings first so "tablespoons" wins over "tablespoon"
+        spellings = sorted(self.aliases, key=len, reverse=True)
+        self.unit_pattern = re.compile(r'\b(?:' + '|'.join(map(re.escape, spellings)) + r')\b', re.IGNORECASE)
+
+    def canonical_unit(self, unit: Optional[str]) -> Optional[str]:
+        """Return the canonical name for a unit or any of its aliases, or None if unknown"""
+        if not unit:
+            return None
+        return self.aliases.get(unit.strip().lower())
+
+    def find_unit(self, text: str) -> Optional[re.Match]:
+        """Find the first known unit or alias appearing as a whole word in text"""
+        return self.unit_pattern.search(text)
+
+    def density(self, ingredient_name: str) -> float:
+        """Get the density of an ingredient in g/ml from its name"""
+        density = self.__density_memo.get(ingredient_name)
+        if density is None:
+            density = self.density_index.lookup(ingredient_name.lower())
+            if density is None:
+                density = self.default_density
+            if len(self.__density_memo) >= UnitRegistrySnapshot.MAX_DENSITY_MEMO:
+                self.__density_memo.clear()
+            self.__density_memo[ingredient_name] = density
+        return density
+
+    def units_by_dimension(self) -> Dict[str, List[Tuple[str, str]]]:
+        """Return (name, label) pairs grouped by dimension, in display order"""
+        grouped = {}
+        for name, label, dimension, _ in self.units:
+            grouped.setdefault(dimension, []).append((name, label))
+        return grouped
+
+class UnitRegistry:
+    """
+    Read-through, per-process cache of the unit registry tables
+
+    The first lookup loads Unit, UnitAlias and IngredientDensity into a
+    UnitRegistrySnapshot that every conversion and ingredient parser shares.
+    Saving or deleting any of those rows (e.g. in the admin) drops the
+    snapshot once the transaction commits (see measurement.apps); other
+    processes pick up changes when their snapshot expires after TTL seconds.
+    Until the tables are migrated and seeded the built-in defaults are used.
+    """
+    TTL = 300
+
+    __lock = threading.Lock()
+    __snapshot = None
+    __expires_at = 0.0
+
+    @staticmethod
+    def current() -> UnitRegistrySnapshot:
+        snapshot = UnitRegistry.__snapshot
+        if snapshot is not None and time.monotonic() < UnitRegistry.__expires_at:
+            return snapshot
+
+        with UnitRegistry.__lock:
+            if UnitRegistry.__snapshot is None or time.monotonic() >= UnitRegistry.__expires_at:
+                UnitRegistry.__snapshot = UnitRegistry.__load()
+                UnitRegistry.__expires_at = time.monotonic() + UnitRegistry.TTL
+            return UnitRegistry.__snapshot
+
+    @staticmethod
+    def invalidate() -> None:
+        with UnitRegistry.__lock:
+            UnitRegistry.__snapshot = None
+
+    @staticmethod
+    def defaults() -> UnitRegistrySnapshot:
+        """Build a snapshot from the built-in tables in unit_defaults"""
+        units = [
+            (name, unit_defaults.UNIT_LABELS.get(name, name), dimension, factor)
+            for dimension, conversions in (
+                ('weight', unit_defaults.WEIGHT_CONVERSIONS),
+                ('volume', unit_defaults.VOLUME_CONVERSIONS)
+            )
+            for name, factor in conversions.items()
+        ]
+        aliases = {
+            alias: name for name, unit_aliases in unit_defaults.UNIT_ALIASES.items() for alias in unit_aliases
+        }
+        return UnitRegistrySnapshot(
+            units,
+            aliases,
+            UnitRegistry.__default_densities(),
+            unit_defaults.DEFAULT_DENSITY
+        )
+
+    @staticmethod
+    def __default_densities() -> Iterable[Tuple[str, float]]:
+        # The lookup table first, then the category keywords
+        return list(unit_defaults.INGREDIENT_DENSITIES.items()) + [
+            (word, density) for words, density in unit_defaults.CATEGORY_DENSITY_KEYWORDS for word in words
+        ]
+
+    @staticmethod
+    def __load() -> UnitRegistrySnapshot:
+        try:
+            units = list(Unit.objects.order_by('id').values_list('name', 'label', 'dimension', 'factor'))
+            aliases = dict(UnitAlias.objects.values_list('alias', 'unit__name'))
+            densities = list(IngredientDensity.objects.order_by('priority', 'id').values_list('keyword', 'density'))
+        except DatabaseError as e:
+            logger.warning(f"Unit registry unavailable, using built-in units: {str(e)}")
+            units = []
+
+        if not units:
+            return UnitRegistry.defaults()
+        return UnitRegistrySnapshot(units, aliases, densities, unit_defaults.DEFAULT_DENSITY)
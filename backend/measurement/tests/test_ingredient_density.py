@@ -0,0 +1,48 @@
+from decimal import Decimal
+
+from django.test import TestCase
+
+from ingredient.models import Ingredient
+from ingredient.serializers import IngredientSerializer
+from ..services.ingredient_density import IngredientDensityService
+from ..services.unit_conversion import try_convert_units
+from ..services.unit_registry import UnitRegistry
+
+class IngredientDensityServiceTests(TestCase):
+    def setUp(self):
+        # Load the unit registry up front so query counts only cover the code under test
+        UnitRegistry.current()
+
+        self.flour = Ingredient.objects.create(name='Flour')
+        self.honey = Ingredient.objects.create(name='Honey', density=1.5)
+
+    def test_densities(self):
+        """Test known densities win over guesses, which aren't stored"""
+        with self.assertNumQueries(1):
+            densities = IngredientDensityService.densities([self.flour.id, self.honey.id, 9999])
+
+        self.assertEqual(densities, {self.flour.id: 0.53, self.honey.id: 1.5})
+        self.flour.refresh_from_db()
+        self.assertIsNone(self.flour.density)
+
+    def test_densities_follow_edits(self):
+        """Test an edited density is used straight away"""
+        IngredientDensityService.densities([self.honey.id])
+        Ingredient.objects.filter(id=self.honey.id).update(density=1.42)
+
+        self.assertEqual(IngredientDensityService.densities([self.honey.id]), {self.honey.id: 1.42})
+
+    def test_density(self):
+        """Test a loaded ingredient's density is guessed without a query when it has none"""
+        with self.assertNumQueries(0):
+            self.assertEqual(IngredientDensityService.density(self.flour), 0.53)
+            self.assertEqual(IngredientDensityService.density(self.honey), 1.5)
+        self.assertIsNone(Ingredient.objects.get(id=self.flour.id).density)
+
+    def test_density_must_be_positive(self):
+        """Test a zero density is rejected by the serializer and by conversions"""
+        serializer = IngredientSerializer(self.flour, data={'name': 'Flour', 'density': 0}, partial=True)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('density', serializer.errors)
+
+        self.assertIsNone(try_convert_units(Decimal(100), 'g', 'cup', 'flour', density=0))
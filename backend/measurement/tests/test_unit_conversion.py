@@ -1,6 +1,11 @@
 from django.test import TestCase
 from decimal import Decimal
-from ..services.unit_conversion import convert_units, get_unit_type
+from ..services.density_index import DensityIndex
+from ..management.commands.benchmark_unit_conversion import legacy_convert_units
+from ..services.unit_conversion import (
+    VOLUME_CONVERSIONS, WEIGHT_CONVERSIONS, UnitConverter, convert_units, convert_units_batch,
+    get_ingredient_density, get_unit_type, humanize_quantity
+)
 
 class UnitConversionTests(TestCase):
     def test_get_unit_type(self):
@@ -79,3 +84,81 @@ class UnitConversionTests(TestCase):
         # Cannot convert between weight and volume without ingredient
         with self.assertRaises(ValueError):
             convert_units(100, 'g', 'ml')
+
+    def test_compiled_matches_legacy(self):
+        """Test the compiled factor matrix agrees with the step-by-step conversion"""
+        units = list(WEIGHT_CONVERSIONS) + list(VOLUME_CONVERSIONS)
+        for ingredient_name in [None, 'flour', 'whole milk', 'dried lentils']:
+            for from_unit in units:
+                for to_unit in units:
+                    try:
+                        expected = legacy_convert_units(Decimal('3.5'), from_unit, to_unit, ingredient_name)
+                    except ValueError:
+                        with self.assertRaises(ValueError):
+                            convert_units(Decimal('3.5'), from_unit, to_unit, ingredient_name)
+                        continue
+                    converted = convert_units(Decimal('3.5'), from_unit, to_unit, ingredient_name)
+                    self.assertAlmostEqual(converted, expected, delta=expected * Decimal('1e-20'))
+
+    def test_converter_compiles_new_densities(self):
+        """Test a converter built without a density still converts with it"""
+        converter = UnitConverter({'g': 1, 'kg': 1000}, {'ml': 1}, densities=[], density_lookup=get_ingredient_density)
+        self.assertEqual(converter.convert(1, 'kg', 'ml', 'water'), Decimal('1000'))
+        self.assertEqual(converter.unit_type('KG'), 'weight')
+
+    def test_convert_units_batch(self):
+        """Test batch conversion returns per-row results and errors"""
+        results = convert_units_batch([
+            (1, 'kg', 'g', None, None),
+            (Decimal('2'), 'cup', 'ml', None, None),
+            (100, 'g', 'ml', 'flour', None),
+            (1, 'piece', 'slice', None, None),
+            ('lots', 'g', 'kg', None, None),
+            (3, '', '', None, None),
+            (100, 'g', 'ml', None, 0.5),
+        ])
+
+        self.assertEqual(results[0], {'converted_quantity': 1000.0})
+        self.assertAlmostEqual(results[1]['converted_quantity'], 473.18)
+        self.assertAlmostEqual(results[2]['converted_quantity'], 188.68, places=1)
+        self.assertIn('error', results[3])
+        self.assertIn('error', results[4])
+        self.assertEqual(results[5], {'converted_quantity': 3.0})
+        self.assertEqual(results[6], {'converted_quantity': 200.0})
+        self.assertEqual(convert_units_batch([]), [])
+
+    def test_get_ingredient_density(self):
+        """Test density lookup keeps the table's first-match order"""
+        self.assertEqual(get_ingredient_density('Whole milk'), 1.03)
+        # 'oil' is in the table, so it wins over the liquid category
+        self.assertEqual(get_ingredient_density('olive oil'), 0.92)
+        # 'flour' comes before 'sugar' in the table even though it appears later in the name
+        self.assertEqual(get_ingredient_density('sugar cookie flour'), 0.53)
+        self.assertEqual(get_ingredient_density('orange juice'), 1.0)
+        self.assertEqual(get_ingredient_density('chili powder'), 0.6)
+        self.assertEqual(get_ingredient_density('ground beef'), 1.1)
+        self.assertEqual(get_ingredient_density('rolled oats'), 0.8)
+
+    def test_density_index(self):
+        """Test the density index finds overlapping keywords"""
+        index = DensityIndex([('she', 1), ('he', 2), ('hers', 3), ('his', 4)])
+        self.assertEqual(index.lookup('ushers'), 1)
+        self.assertEqual(index.lookup('this'), 4)
+        self.assertEqual(index.lookup('ahem'), 2)
+        self.assertIsNone(index.lookup('xyz'))
+
+    def test_humanize_quantity(self):
+        """Test quantities are restated in the most readable unit of their system"""
+        def humanize(quantity, unit):
+            quantity, unit = humanize_quantity(quantity, unit)
+            return quantity.quantize(Decimal('0.01')), unit
+
+        self.assertEqual(humanize(48, 'tsp'), (Decimal('1.00'), 'cup'))
+        self.assertEqual(humanize(3, 'tsp'), (Decimal('1.00'), 'tbsp'))
+        self.assertEqual(humanize(2, 'tsp'), (Decimal('2.00'), 'tsp'))
+        self.assertEqual(humanize(1500, 'g'), (Decimal('1.50'), 'kg'))
+        self.assertEqual(humanize(8, 'oz'), (Decimal('8.00'), 'oz'))
+        # The original spelling is kept when it's already the best fit
+        self.assertEqual(humanize(2, 'Cups'), (Decimal('2.00'), 'Cups'))
+        self.assertEqual(humanize(3, 'clove'), (Decimal('3.00'), 'clove'))
+        self.assertEqual(humanize(2, None), (Decimal('2.00'), None))
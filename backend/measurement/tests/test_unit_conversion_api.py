@@ -0,0 +1,90 @@
+import json
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from ingredient.models import Ingredient
+from ..services.unit_registry import UnitRegistry
+
+User = get_user_model()
+
+class UnitConversionAPITests(TestCase):
+    def setUp(self):
+        # Load the unit registry up front so query counts only cover the code under test
+        UnitRegistry.current()
+
+        # Create a test user
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpassword'
+        )
+
+        # Create a test client
+        self.client = APIClient()
+
+        # Get token
+        refresh = RefreshToken.for_user(self.user)
+        access_token = str(refresh.access_token)
+
+        # Add token to client
+        self.client.credentials(HTTP_AUTHORIZATION=f'JWT {access_token}')
+
+        self.batch_url = '/api/measurement/convert-batch/'
+
+    def test_convert_batch(self):
+        """Test converting several quantities in one request"""
+        flour = Ingredient.objects.create(name='Flour')
+        water = Ingredient.objects.create(name='Water')
+
+        conversions = json.dumps({'conversions': [
+            {'quantity': 2, 'from_unit': 'kg', 'to_unit': 'g'},
+            {'quantity': 100, 'from_unit': 'g', 'to_unit': 'ml', 'ingredient_id': flour.id},
+            {'quantity': 1, 'from_unit': 'l', 'to_unit': 'g', 'ingredient_id': water.id},
+            {'quantity': 1, 'from_unit': 'g', 'to_unit': 'ml', 'ingredient_id': 9999},
+            {'quantity': 1, 'from_unit': 'g'},
+            {'quantity': 1, 'from_unit': 'g', 'to_unit': 'ml'},
+            {'quantity': 100, 'from_unit': 'g', 'to_unit': 'ml', 'ingredient_id': str(flour.id)},
+            {'quantity': 1, 'from_unit': 'g', 'to_unit': 'ml', 'ingredient_id': [flour.id]},
+            {'quantity': 1, 'from_unit': 'g', 'to_unit': 'ml', 'ingredient_id': {'id': flour.id}},
+        ]})
+
+        # authenticated user, then every ingredient at once
+        with self.assertNumQueries(2):
+            response = self.client.post(self.batch_url, data=conversions, content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(results[0], {'converted_quantity': 2000.0, 'from_unit': 'kg', 'to_unit': 'g', 'is_exact': True})
+        self.assertAlmostEqual(results[1]['converted_quantity'], 188.68, places=1)
+        self.assertFalse(results[1]['is_exact'])
+        self.assertAlmostEqual(results[2]['converted_quantity'], 1000.0)
+        self.assertEqual(results[3], {'error': 'Ingredient with ID 9999 not found'})
+        self.assertEqual(results[4], {'error': 'Missing required parameters'})
+        self.assertIn('error', results[5])
+        # IDs sent as strings are looked up, other types are rejected per row
+        self.assertEqual(results[6]['converted_quantity'], results[1]['converted_quantity'])
+        self.assertEqual(results[7], {'error': 'ingredient_id must be an integer'})
+        self.assertEqual(results[8], {'error': 'ingredient_id must be an integer'})
+
+        # The user is now cached, only the ingredients are looked up again
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self.client.post(self.batch_url, data=conversions, content_type='application/json').json()['results'],
+                results
+            )
+
+        # Guessed densities aren't stored
+        flour.refresh_from_db()
+        self.assertIsNone(flour.density)
+
+    def test_convert_batch_invalid_body(self):
+        """Test a body without a conversions list is rejected"""
+        response = self.client.post(
+            self.batch_url,
+            data=json.dumps({'quantity': 1}),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 400)
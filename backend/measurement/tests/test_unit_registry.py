@@ -0,0 +1,70 @@
+from decimal import Decimal
+from django.test import TestCase
+
+from ingredient.models import Ingredient
+from ..models import IngredientDensity, Unit, UnitAlias
+from ..services.ingredient_density import IngredientDensityService
+from ..services.unit_conversion import convert_units, get_ingredient_density, get_unit_type
+from ..services.unit_registry import UnitRegistry
+
+class UnitRegistryTests(TestCase):
+    def setUp(self):
+        UnitRegistry.invalidate()
+
+    def tearDown(self):
+        # Rolled back rows must not outlive the test in the cached registry
+        UnitRegistry.invalidate()
+
+    def test_seeded_aliases(self):
+        """Test seeded aliases resolve to their canonical unit"""
+        registry = UnitRegistry.current()
+        self.assertEqual(registry.canonical_unit('Tablespoons'), 'tbsp')
+        self.assertEqual(registry.canonical_unit('cup'), 'cup')
+        self.assertIsNone(registry.canonical_unit('cloves'))
+        self.assertEqual(registry.find_unit('2 tablespoons of sugar').group(0), 'tablespoons')
+
+        self.assertEqual(get_unit_type('pounds'), 'weight')
+        self.assertEqual(convert_units(2, 'cups', 'cup'), Decimal('2'))
+        self.assertAlmostEqual(float(convert_units(1, 'pounds', 'ounces')), 16, places=1)
+
+    def test_cached(self):
+        """Test the registry is loaded once"""
+        UnitRegistry.current()
+        with self.assertNumQueries(0):
+            UnitRegistry.current()
+            convert_units(1, 'kg', 'g')
+
+    def test_edits_invalidate(self):
+        """Test saving registry rows reloads the registry after commit"""
+        UnitRegistry.current()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            stick = Unit.objects.create(name='stick', label='Sticks', dimension='weight', factor=113)
+            UnitAlias.objects.create(alias='sticks', unit=stick)
+            IngredientDensity.objects.create(keyword='molasses', density=1.4)
+
+        self.assertAlmostEqual(float(convert_units(2, 'sticks', 'g')), 226)
+        self.assertEqual(get_ingredient_density('Blackstrap molasses'), 1.4)
+
+    def test_density_edits_apply_to_existing_ingredients(self):
+        """Test a new density keyword changes ingredients already converted with a guess"""
+        molasses = Ingredient.objects.create(name='Blackstrap molasses')
+        honey = Ingredient.objects.create(name='Molasses honey blend', density=1.35)
+        default_density = IngredientDensityService.densities([molasses.id])[molasses.id]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            IngredientDensity.objects.create(keyword='molasses', density=1.4, priority=0)
+
+        densities = IngredientDensityService.densities([molasses.id, honey.id])
+        self.assertNotEqual(default_density, 1.4)
+        # Guessed densities follow the registry, known ones are kept
+        self.assertEqual(densities, {molasses.id: 1.4, honey.id: 1.35})
+
+    def test_defaults_when_empty(self):
+        """Test the built-in units are used when the registry tables are empty"""
+        with self.captureOnCommitCallbacks(execute=True):
+            Unit.objects.all().delete()
+            IngredientDensity.objects.all().delete()
+
+        self.assertEqual(UnitRegistry.current().canonical_unit('teaspoons'), 'tsp')
+        self.assertEqual(get_ingredient_density('whole milk'), 1.03)
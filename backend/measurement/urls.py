@@ -1,7 +1,8 @@
 from django.urls import path
-from .apis.unit_conversion import convert_units_api, get_common_units
+from .apis.unit_conversion import convert_units_api, convert_units_batch_api, get_common_units
 
 urlpatterns = [
     path('convert/', convert_units_api, name='convert_units'),
+    path('convert-batch/', convert_units_batch_api, name='convert_units_batch'),
     path('common-units/', get_common_units, name='common_units'),
 ]
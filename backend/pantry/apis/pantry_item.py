@@ -3,7 +3,9 @@ import logging
 from django.http import JsonResponse
 from typing import Dict
 
-from ..services import PantryItemService
+from common.pagination import get_pagination_params
+from common.streaming import StreamingJsonResponse, wants_stream
+from ..services import PantryItemService, PantryShortfallService
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,15 @@ class PantryItemAPI:
             logger.info('pantry_item method "list" called')
             # Get user-specific pantry items if user is authenticated
             user_id = request.user.id if hasattr(request, 'user') and request.user.is_authenticated else None
+            if wants_stream(request):
+                return StreamingJsonResponse(PantryItemService.stream(user_id=user_id))
+            try:
+                pagination = get_pagination_params(request)
+                if pagination is not None:
+                    cursor, page_size = pagination
+                    return JsonResponse(PantryItemService.list_page(user_id=user_id, cursor=cursor, page_size=page_size))
+            except ValueError as e:
+                return JsonResponse({"error": str(e)}, status=400)
             return JsonResponse(PantryItemService.list(user_id=user_id), safe=False)
         elif request.method == 'POST':
             logger.info('pantry_item method "create" called')
@@ -51,3 +62,36 @@ class PantryItemAPI:
                 grocery_list_id=grocery_list_id,
                 user_id=user_id
             ))
+
+    @staticmethod
+    def generate_grocery_list(request) -> Dict:
+        """
+        Add what the pantry is missing for a meal plan, plus low and out of stock items, to a grocery list
+
+        Request body:
+        {
+            "recipes": [{"recipe_id": number, "multiplier": number (optional), "servings": number (optional)}] (optional),
+            "grocery_list_id": number (optional, a new list is created if omitted),
+            "title": string (optional, title for a new list),
+            "include_staples": boolean (optional, defaults to true)
+        }
+        """
+        if request.method == 'POST':
+            logger.info('pantry_item method "generate_grocery_list" called')
+            user_id = request.user.id if hasattr(request, 'user') and request.user.is_authenticated else None
+            if not user_id:
+                return JsonResponse({"status": "error", "message": "User not authenticated"}, status=401)
+
+            data = json.loads(request.body.decode("utf-8") or "{}")
+            recipes = data.get('recipes') or []
+            if not isinstance(recipes, list) or not all(isinstance(entry, dict) and entry.get('recipe_id') for entry in recipes):
+                return JsonResponse({"status": "error", "message": "recipes must be a list of objects with recipe_id"}, status=400)
+
+            result = PantryShortfallService.generate_grocery_list(
+                recipes=recipes,
+                user_id=user_id,
+                grocery_list_id=data.get('grocery_list_id'),
+                title=data.get('title'),
+                include_staples=data.get('include_staples', True)
+            )
+            return JsonResponse(result, status=200 if result['status'] == 'success' else 400)
@@ -84,3 +84,63 @@ def convert_grocery_to_pantry(request, grocery_item_id):
         return JsonResponse({
             'error': str(e)
         }, status=400)
+
+@require_http_methods(["POST"])
+def convert_grocery_items_to_pantry(request):
+    """
+    API endpoint to convert a batch of grocery list items to pantry items
+
+    Request body:
+    {
+        "items": [
+            {
+                "grocery_item_id": number,
+                "to_unit": string (optional)
+            }
+        ]
+    }
+
+    Response:
+    {
+        "results": [
+            {
+                "grocery_item_id": number,
+                "id": number,
+                "quantity": number,
+                "unit": string,
+                "stock_level": string,
+                "converted": boolean
+            }
+            or
+            {
+                "grocery_item_id": number,
+                "error": string
+            }
+        ]
+    }
+    """
+    try:
+        data = json.loads(request.body)
+        items = data.get('items')
+
+        if not isinstance(items, list) or not all(
+            isinstance(item, dict) and isinstance(item.get('grocery_item_id'), int) for item in items
+        ):
+            return JsonResponse({
+                'error': 'items must be a list of objects with an integer grocery_item_id'
+            }, status=400)
+
+        # Get the user ID from the request
+        user_id = request.user.id
+
+        results = PantryUnitConversionService.convert_grocery_items_to_pantry(
+            items=items,
+            user_id=user_id
+        )
+
+        return JsonResponse({'results': results})
+    except Exception as e:
+        logger.error(f"Error in convert_grocery_items_to_pantry: {str(e)}")
+        return JsonResponse({
+            'error': str(e)
+        }, status=400)
@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 12:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingredient', '0007_hot_path_indexes'),
+        ('pantry', '0002_pantryitem_stock_level_alter_pantryitem_quantity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pantryitem',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='pantry_items', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='pantryitem',
+            index=models.Index(fields=['user', 'ingredient'], name='pantry_user_ingredient_idx'),
+        ),
+    ]
@@ -14,7 +14,8 @@ class PantryItem(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
-        related_name='pantry_items'
+        related_name='pantry_items',
+        db_index=False  # Covered by pantry_user_ingredient_idx
     )
     ingredient = models.ForeignKey(
         Ingredient,
@@ -43,6 +44,10 @@ class PantryItem(models.Model):
 
     class Meta:
         ordering = ['ingredient__name']
+        indexes = [
+            # Pantry lookups are per user, usually for a set of ingredients
+            models.Index(fields=['user', 'ingredient'], name='pantry_user_ingredient_idx'),
+        ]
 
     def __str__(self):
         if self.quantity is not None:
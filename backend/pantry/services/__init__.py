@@ -1 +1,2 @@
 from .pantry_item import PantryItemService
+from .shortfall import PantryShortfallService
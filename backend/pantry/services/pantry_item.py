@@ -1,12 +1,23 @@
 import logging
-from typing import Dict, List
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional
 
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
+
+from common.pagination import CursorPaginator, paginated_response
+from common.streaming import stream_json_array
 from ..models import PantryItem
 from ..serializers import PantryItemSerializer
 from grocery_list.models import GroceryList, GroceryListItem
+from .unit_conversion import PantryUnitConversionService
 
 logger = logging.getLogger(__name__)
 
+# Matches PantryItem.Meta.ordering, with id as a tie-breaker
+PANTRY_ITEM_PAGINATOR = CursorPaginator(ordering=['ingredient__name', 'id'])
+
 class PantryItemService:
 
     @staticmethod
@@ -14,13 +25,26 @@ class PantryItemService:
         """
         List all pantry items, optionally filtered by user
         """
-        if user_id:
-            pantry_items = PantryItem.objects.filter(user_id=user_id).order_by('ingredient__name')
-        else:
-            pantry_items = PantryItem.objects.all().order_by('ingredient__name')
+        pantry_items = PantryItemService.__for_user(user_id)
         serializer = PantryItemSerializer(pantry_items, many=True)
         return serializer.data
 
+    @staticmethod
+    def list_page(user_id=None, cursor: Optional[str] = None, page_size: Optional[int] = None) -> Dict:
+        """
+        List one page of pantry items ordered by ingredient name, optionally filtered by user
+        """
+        page, next_cursor = PANTRY_ITEM_PAGINATOR.paginate(PantryItemService.__for_user(user_id), cursor, page_size)
+        serializer = PantryItemSerializer(page, many=True)
+        return paginated_response(serializer.data, next_cursor)
+
+    @staticmethod
+    def stream(user_id=None) -> Iterator[str]:
+        """
+        Stream all pantry items as a JSON array, optionally filtered by user
+        """
+        return stream_json_array(PantryItemService.__for_user(user_id), PantryItemSerializer)
+
     @staticmethod
     def get(id) -> Dict:
         """
@@ -66,45 +90,62 @@ class PantryItemService:
         Add all items from a completed grocery list to the user's pantry
         """
         try:
-            # Get the grocery list
-            grocery_list = GroceryList.objects.get(id=grocery_list_id)
-            
-            # Mark the grocery list as completed
-            grocery_list.completed = True
-            grocery_list.save()
-            
-            # Get all purchased items from the grocery list
-            grocery_items = GroceryListItem.objects.filter(
-                grocery_list_id=grocery_list_id,
-                purchased=True
-            )
-            
-            added_items = []
-            
-            # Add each purchased item to the pantry
-            for item in grocery_items:
-                # Check if the item already exists in the pantry
-                existing_item = PantryItem.objects.filter(
+            with transaction.atomic():
+                # Get the grocery list
+                grocery_list = GroceryList.objects.get(id=grocery_list_id)
+
+                # Mark the grocery list as completed
+                grocery_list.completed = True
+                grocery_list.save()
+
+                # Get all purchased items from the grocery list
+                grocery_items = list(GroceryListItem.objects.filter(
+                    grocery_list_id=grocery_list_id,
+                    purchased=True
+                ).select_related('ingredient'))
+
+                # Load every matching pantry row for the user at once
+                pantry_items = defaultdict(list)
+                for pantry_item in PantryItem.objects.filter(
                     user_id=user_id,
-                    ingredient_id=item.ingredient_id
-                ).first()
-                
-                if existing_item:
-                    # If the item exists, update the quantity
-                    existing_item.quantity += item.quantity
-                    existing_item.save()
-                    added_items.append(existing_item)
-                else:
-                    # If the item doesn't exist, create a new pantry item
-                    pantry_item = PantryItem.objects.create(
-                        user_id=user_id,
-                        ingredient_id=item.ingredient_id,
-                        quantity=item.quantity,
-                        unit=item.unit,
-                        notes=item.notes
-                    )
-                    added_items.append(pantry_item)
-            
+                    ingredient_id__in={item.ingredient_id for item in grocery_items}
+                ).select_related('ingredient').order_by('id'):
+                    pantry_items[pantry_item.ingredient_id].append(pantry_item)
+
+                updated_items = {}
+                new_items = []
+
+                # Reconcile each purchased item with the pantry in memory
+                for item in grocery_items:
+                    for pantry_item in pantry_items[item.ingredient_id]:
+                        if PantryUnitConversionService.reconcile(
+                            pantry_item, item.quantity, item.unit, item.ingredient.name, density=item.ingredient.density
+                        ) is not None:
+                            if pantry_item.pk:
+                                updated_items[pantry_item.pk] = pantry_item
+                            break
+                    else:
+                        # Nothing to add to in a compatible unit, so create a new pantry item
+                        pantry_item = PantryItem(
+                            user_id=user_id,
+                            ingredient=item.ingredient,
+                            quantity=item.quantity,
+                            unit=item.unit,
+                            notes=item.notes
+                        )
+                        pantry_items[item.ingredient_id].append(pantry_item)
+                        new_items.append(pantry_item)
+
+                # bulk_update skips auto_now, so stamp updated_at explicitly
+                now = timezone.now()
+                for pantry_item in updated_items.values():
+                    pantry_item.updated_at = now
+                PantryItem.objects.bulk_update(updated_items.values(), ['quantity', 'unit', 'updated_at'])
+                PantryItem.objects.bulk_create(new_items)
+
+            added_items = list(updated_items.values()) + new_items
+            prefetch_related_objects(added_items, 'ingredient__categories')
+
             # Return the added items
             serializer = PantryItemSerializer(added_items, many=True)
             return {
@@ -125,6 +166,18 @@ class PantryItemService:
                 "message": f"Error adding grocery list to pantry: {str(e)}"
             }
 
+    @staticmethod
+    def __for_user(user_id=None):
+        """
+        Helper method to build the serializer-ready pantry queryset for a user,
+        with the ingredient and categories PantryItemSerializer nests
+        """
+        if user_id:
+            pantry_items = PantryItem.objects.filter(user_id=user_id)
+        else:
+            pantry_items = PantryItem.objects.all()
+        return pantry_items.order_by('ingredient__name').select_related('ingredient').prefetch_related('ingredient__categories')
+
     @staticmethod
     def __get(id=id):
         """
@@ -0,0 +1,131 @@
+import logging
+from collections import defaultdict
+from decimal import Decimal, ROUND_UP
+from typing import Dict, List, Optional
+
+from django.db import transaction
+
+from ..models import PantryItem
+from grocery_list.models import GroceryList
+from grocery_list.services import GroceryListItemService
+from measurement.services.unit_conversion import try_convert_units
+from recipe.services import RecipeItemService
+
+logger = logging.getLogger(__name__)
+
+# Stock levels that put a pantry item on the shopping list by themselves
+RESTOCK_LEVELS = ('low', 'out')
+
+class PantryShortfallService:
+
+    @staticmethod
+    def generate_grocery_list(
+        recipes: List[Dict],
+        user_id: int,
+        grocery_list_id: Optional[int] = None,
+        title: Optional[str] = None,
+        include_staples: bool = True
+    ) -> Dict:
+        """
+        Build a grocery list of what the pantry is missing for a meal plan
+
+        The planned recipes' ingredients are summed with one recipe items query
+        and compared against one snapshot of the user's pantry, converting
+        pantry quantities to the recipe units. Only the shortfall is added to
+        the list, along with any pantry items running low or out of stock.
+
+        Args:
+            recipes: Dicts with a "recipe_id" and either a "multiplier" or a target
+                number of "servings", as accepted by RecipeItemService.aggregate_requirements
+            user_id: The ID of the user owning the recipes, pantry and grocery list
+            grocery_list_id: The grocery list to add to; a new list is created if omitted
+            title: The title for a new grocery list
+            include_staples: Whether to add low and out of stock pantry items
+
+        Returns:
+            Dict with the status, the grocery list ID and the number of items added
+        """
+        try:
+            with transaction.atomic():
+                requirements = RecipeItemService.aggregate_requirements(recipes, user_id=user_id) if recipes else []
+
+                pantry = defaultdict(list)
+                for pantry_item in PantryItem.objects.filter(user_id=user_id).select_related('ingredient'):
+                    pantry[pantry_item.ingredient_id].append(pantry_item)
+
+                entries = []
+                for requirement in requirements:
+                    shortfall = PantryShortfallService.__shortfall(
+                        requirement, pantry.get(requirement['ingredient'].id, ())
+                    )
+                    if shortfall > 0:
+                        entries.append({**requirement, "quantity": shortfall})
+
+                if include_staples:
+                    needed = {entry['ingredient'].id for entry in entries}
+                    for ingredient_id, pantry_items in pantry.items():
+                        if ingredient_id in needed:
+                            continue
+                        restock = next((item for item in pantry_items if item.stock_level in RESTOCK_LEVELS), None)
+                        if restock is not None:
+                            entries.append({
+                                "ingredient": restock.ingredient,
+                                "quantity": 1,
+                                "unit": None,
+                                "notes": f"Restock ({restock.stock_level})"
+                            })
+
+                if grocery_list_id is None:
+                    grocery_list_id = GroceryList.objects.create(
+                        title=title or "Shopping list",
+                        user_id=user_id
+                    ).id
+                elif not GroceryList.objects.filter(id=grocery_list_id, user_id=user_id).exists():
+                    return {
+                        "status": "error",
+                        "message": f"Grocery list with ID {grocery_list_id} not found"
+                    }
+
+                added_items = GroceryListItemService.merge_items(grocery_list_id, entries)
+
+            return {
+                "status": "success",
+                "message": f"Added {len(added_items)} items to grocery list",
+                "count": len(added_items),
+                "grocery_list_id": grocery_list_id
+            }
+
+        except Exception as e:
+            logger.error(f"Error generating grocery list from pantry: {str(e)}")
+            return {
+                "status": "error",
+                "message": f"Error generating grocery list from pantry: {str(e)}"
+            }
+
+    @staticmethod
+    def __shortfall(requirement: Dict, pantry_items) -> Decimal:
+        """
+        Helper method to work out how much of a requirement still has to be bought
+
+        Pantry items without a quantity cover the requirement when they are well
+        stocked, and out of stock items never count. Pantry quantities that can't
+        be converted to the requirement's unit are ignored.
+        """
+        needed = Decimal(str(requirement['quantity']))
+        on_hand = Decimal(0)
+        for pantry_item in pantry_items:
+            if pantry_item.stock_level == 'out':
+                continue
+            if pantry_item.quantity is None:
+                if pantry_item.stock_level not in RESTOCK_LEVELS:
+                    return Decimal(0)
+                continue
+            converted = try_convert_units(
+                pantry_item.quantity, pantry_item.unit, requirement['unit'], pantry_item.ingredient.name,
+                density=pantry_item.ingredient.density
+            )
+            if converted is not None:
+                on_hand += converted
+
+        # Round up so a shortfall is never written as zero
+        return max(needed - on_hand, Decimal(0)).quantize(Decimal('0.01'), rounding=ROUND_UP)
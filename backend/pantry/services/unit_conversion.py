@@ -1,6 +1,12 @@
-from typing import Dict, Optional
+from decimal import Decimal
+from typing import Dict, List, Optional, Union
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 
 from measurement.services.unit_conversion import convert_units as measurement_convert_units
+from measurement.services.unit_conversion import try_convert_units
 from ..models import PantryItem
 
 class PantryUnitConversionService:
@@ -41,7 +47,8 @@ class PantryUnitConversionService:
                 pantry_item.quantity,
                 pantry_item.unit,
                 to_unit,
-                pantry_item.ingredient.name
+                pantry_item.ingredient.name,
+                pantry_item.ingredient.density
             )
 
             # Update the pantry item
@@ -58,6 +65,56 @@ class PantryUnitConversionService:
         except Exception as e:
             raise ValueError(f"Failed to convert units: {str(e)}")
 
+    @staticmethod
+    def reconcile(
+        pantry_item: PantryItem,
+        quantity: Union[float, Decimal],
+        unit: Optional[str],
+        ingredient_name: str,
+        to_unit: Optional[str] = None,
+        density: Optional[float] = None
+    ) -> Optional[bool]:
+        """
+        Add a quantity to a pantry item in memory, reconciling their units
+
+        Follows the same rules as convert_grocery_to_pantry: matching units are
+        added directly, otherwise both sides are converted to to_unit when given,
+        or the quantity is converted to the pantry item's unit. A pantry item
+        without a quantity simply takes the new quantity and unit. Nothing is
+        saved, and the pantry item is left untouched when conversion fails.
+
+        Args:
+            pantry_item: The pantry item to add to
+            quantity: The quantity to add
+            unit: The unit of the quantity
+            ingredient_name: Ingredient name for density-based conversions
+            to_unit: Optional unit to store the combined quantity in
+            density: The ingredient's own density in g/ml, if it has one
+
+        Returns:
+            Whether a unit conversion was needed, or None if the units can't be reconciled
+        """
+        quantity = Decimal(str(quantity))
+
+        if pantry_item.quantity is None:
+            pantry_item.quantity = quantity
+            pantry_item.unit = unit
+            return False
+
+        if (pantry_item.unit or '').lower() == (unit or '').lower():
+            pantry_item.quantity += quantity
+            return False
+
+        target_unit = to_unit or pantry_item.unit
+        pantry_quantity = try_convert_units(pantry_item.quantity, pantry_item.unit, target_unit, ingredient_name, density)
+        added_quantity = try_convert_units(quantity, unit, target_unit, ingredient_name, density)
+        if pantry_quantity is None or added_quantity is None:
+            return None
+
+        pantry_item.quantity = pantry_quantity + added_quantity
+        pantry_item.unit = target_unit
+        return True
+
     @staticmethod
     def convert_grocery_to_pantry(grocery_item_id: int, user_id: int, to_unit: Optional[str] = None) -> Dict:
         """
@@ -73,135 +130,108 @@ class PantryUnitConversionService:
         """
         from grocery_list.models import GroceryListItem
 
-        grocery_item = GroceryListItem.objects.get(id=grocery_item_id)
+        result = PantryUnitConversionService.convert_grocery_items_to_pantry(
+            [{"grocery_item_id": grocery_item_id, "to_unit": to_unit}],
+            user_id
+        )[0]
+        if "error" in result:
+            raise GroceryListItem.DoesNotExist(result["error"])
+
+        result.pop("grocery_item_id")
+        return result
+
+    @staticmethod
+    def convert_grocery_items_to_pantry(items: List[Dict], user_id: int) -> List[Dict]:
+        """
+        Convert a batch of grocery list items to pantry items
 
-        # Check if this ingredient already exists in the user's pantry
-        existing_pantry_item = PantryItem.objects.filter(
+        The grocery items and the user's matching pantry items are each loaded
+        with a single query, quantities are reconciled in memory, and all
+        changes are written in one transaction. Items whose units can't be
+        reconciled with the existing pantry item are added as new pantry items.
+
+        Args:
+            items: List of {"grocery_item_id": int, "to_unit": Optional[str]} entries
+            user_id: The ID of the user
+
+        Returns:
+            One result per entry, in order, describing the pantry item after the batch
+            or an "error" for grocery items that don't exist or are on another user's list
+        """
+        from grocery_list.models import GroceryListItem
+
+        # Lists without a user predate list ownership and stay usable by everyone
+        grocery_items = GroceryListItem.objects.filter(
+            Q(grocery_list__user_id=user_id) | Q(grocery_list__user__isnull=True),
+            id__in={item["grocery_item_id"] for item in items}
+        ).select_related('ingredient', 'grocery_list').in_bulk()
+
+        # The first pantry item for each ingredient is the one quantities are added to
+        pantry_items = {}
+        for pantry_item in PantryItem.objects.filter(
             user_id=user_id,
-            ingredient=grocery_item.ingredient
-        ).first()
-
-        if existing_pantry_item:
-            # If the item exists with the same unit, just add quantities
-            if existing_pantry_item.unit == grocery_item.unit:
-                existing_pantry_item.quantity += grocery_item.quantity
-                existing_pantry_item.save()
-                return {
-                    "id": existing_pantry_item.id,
-                    "quantity": float(existing_pantry_item.quantity),
-                    "unit": existing_pantry_item.unit,
-                    "stock_level": existing_pantry_item.stock_level,
-                    "converted": False
-                }
-            # If to_unit is specified, use that as the target unit
-            elif to_unit:
-                try:
-                    # First convert pantry item to the target unit if needed
-                    if existing_pantry_item.unit != to_unit:
-                        pantry_converted_quantity = measurement_convert_units(
-                            existing_pantry_item.quantity,
-                            existing_pantry_item.unit,
-                            to_unit,
-                            existing_pantry_item.ingredient.name
-                        )
-                        existing_pantry_item.quantity = pantry_converted_quantity
-                        existing_pantry_item.unit = to_unit
-
-                    # Then convert grocery item to the target unit
-                    grocery_converted_quantity = measurement_convert_units(
-                        grocery_item.quantity,
-                        grocery_item.unit,
-                        to_unit,
-                        grocery_item.ingredient.name
-                    )
-
-                    # Update the pantry item
-                    existing_pantry_item.quantity += grocery_converted_quantity
-                    existing_pantry_item.save()
-
-                    return {
-                        "id": existing_pantry_item.id,
-                        "quantity": float(existing_pantry_item.quantity),
-                        "unit": to_unit,
-                        "stock_level": existing_pantry_item.stock_level,
-                        "converted": True
-                    }
-                except Exception:
-                    # If conversion fails, create a new item with the original unit
-                    new_item = PantryItem.objects.create(
-                        user_id=user_id,
-                        ingredient=grocery_item.ingredient,
-                        quantity=grocery_item.quantity,
-                        unit=grocery_item.unit,
-                        stock_level='high',  # New items start at high stock
-                        notes=f"Added from grocery list: {grocery_item.grocery_list.title}"
-                    )
-
-                    return {
-                        "id": new_item.id,
-                        "quantity": float(new_item.quantity),
-                        "unit": new_item.unit,
-                        "stock_level": new_item.stock_level,
-                        "converted": False
-                    }
+            ingredient_id__in={grocery_item.ingredient_id for grocery_item in grocery_items.values()}
+        ).order_by('id'):
+            pantry_items.setdefault(pantry_item.ingredient_id, pantry_item)
+
+        outcomes = []
+        updated_items = {}
+        new_items = []
+        for item in items:
+            grocery_item = grocery_items.get(item["grocery_item_id"])
+            if grocery_item is None:
+                outcomes.append((item["grocery_item_id"], None, False))
+                continue
+
+            pantry_item = pantry_items.get(grocery_item.ingredient_id)
+            converted = None
+            if pantry_item is not None:
+                converted = PantryUnitConversionService.reconcile(
+                    pantry_item,
+                    grocery_item.quantity,
+                    grocery_item.unit,
+                    grocery_item.ingredient.name,
+                    item.get("to_unit"),
+                    density=grocery_item.ingredient.density
+                )
+
+            if converted is None:
+                # No pantry item, or conversion failed, so create a new item with the original unit
+                new_item = PantryItem(
+                    user_id=user_id,
+                    ingredient=grocery_item.ingredient,
+                    quantity=grocery_item.quantity,
+                    unit=grocery_item.unit,
+                    stock_level='high',  # New items start at high stock
+                    notes=f"Added from grocery list: {grocery_item.grocery_list.title}"
+                )
+                pantry_items.setdefault(grocery_item.ingredient_id, new_item)
+                new_items.append(new_item)
+                outcomes.append((grocery_item.id, new_item, False))
             else:
-                # Different units - try to convert
-                try:
-                    # Use pantry item's unit as the target unit
-                    target_unit = existing_pantry_item.unit
-
-                    # Convert grocery item to pantry item's unit
-                    grocery_converted_quantity = measurement_convert_units(
-                        grocery_item.quantity,
-                        grocery_item.unit,
-                        target_unit,
-                        grocery_item.ingredient.name
-                    )
-
-                    # Update the pantry item
-                    existing_pantry_item.quantity += grocery_converted_quantity
-                    existing_pantry_item.save()
-
-                    return {
-                        "id": existing_pantry_item.id,
-                        "quantity": float(existing_pantry_item.quantity),
-                        "unit": target_unit,
-                        "stock_level": existing_pantry_item.stock_level,
-                        "converted": True
-                    }
-                except Exception:
-                    # If conversion fails, create a new item with the original unit
-                    new_item = PantryItem.objects.create(
-                        user_id=user_id,
-                        ingredient=grocery_item.ingredient,
-                        quantity=grocery_item.quantity,
-                        unit=grocery_item.unit,
-                        stock_level='high',  # New items start at high stock
-                        notes=f"Added from grocery list: {grocery_item.grocery_list.title}"
-                    )
-
-                    return {
-                        "id": new_item.id,
-                        "quantity": float(new_item.quantity),
-                        "unit": new_item.unit,
-                        "stock_level": new_item.stock_level,
-                        "converted": False
-                    }
-        else:
-            # Create a new pantry item
-            new_item = PantryItem.objects.create(
-                user_id=user_id,
-                ingredient=grocery_item.ingredient,
-                quantity=grocery_item.quantity,
-                unit=grocery_item.unit,
-                stock_level='high',  # New items start at high stock
-                notes=f"Added from grocery list: {grocery_item.grocery_list.title}"
-            )
-
-            return {
-                "id": new_item.id,
-                "quantity": float(new_item.quantity),
-                "unit": new_item.unit,
-                "stock_level": new_item.stock_level,
-                "converted": False
-            }
+                if pantry_item.pk:
+                    updated_items[pantry_item.pk] = pantry_item
+                outcomes.append((grocery_item.id, pantry_item, converted))
+
+        with transaction.atomic():
+            # bulk_update skips auto_now, so stamp updated_at explicitly
+            now = timezone.now()
+            for pantry_item in updated_items.values():
+                pantry_item.updated_at = now
+            PantryItem.objects.bulk_update(updated_items.values(), ['quantity', 'unit', 'updated_at'])
+            PantryItem.objects.bulk_create(new_items)
+
+        results = []
+        for grocery_item_id, pantry_item, converted in outcomes:
+            if pantry_item is None:
+                results.append({"grocery_item_id": grocery_item_id, "error": "Grocery item not found"})
+                continue
+            results.append({
+                "grocery_item_id": grocery_item_id,
+                "id": pantry_item.id,
+                "quantity": float(pantry_item.quantity),
+                "unit": pantry_item.unit,
+                "stock_level": pantry_item.stock_level,
+                "converted": converted
+            })
+        return results
@@ -0,0 +1,59 @@
+import json
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from grocery_list.models import GroceryListItem
+from ingredient.models import Ingredient
+from recipe.models import Recipe, RecipeItem
+from ...models import PantryItem
+
+User = get_user_model()
+
+class PantryItemAPITests(TestCase):
+    def setUp(self):
+        # Create a test user
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpassword'
+        )
+
+        # Create a test client
+        self.client = APIClient()
+
+        # Get token
+        refresh = RefreshToken.for_user(self.user)
+        access_token = str(refresh.access_token)
+
+        # Add token to client
+        self.client.credentials(HTTP_AUTHORIZATION=f'JWT {access_token}')
+
+        self.url = '/api/pantry/generate-grocery-list/'
+
+    def test_generate_grocery_list(self):
+        """Test generating a grocery list from a meal plan and pantry stock"""
+        rice = Ingredient.objects.create(name='Rice')
+        beans = Ingredient.objects.create(name='Beans')
+        recipe = Recipe.objects.create(title='Rice and beans', user=self.user)
+        RecipeItem.objects.create(recipe=recipe, ingredient=rice, quantity=2, unit='cup')
+        PantryItem.objects.create(user=self.user, ingredient=rice, quantity=5, unit='cup')
+        PantryItem.objects.create(user=self.user, ingredient=beans, stock_level='out')
+
+        response = self.client.post(
+            self.url,
+            json.dumps({"recipes": [{"recipe_id": recipe.id}], "title": "Restock"}),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['count'], 1)
+        item = GroceryListItem.objects.get(grocery_list_id=data['grocery_list_id'])
+        self.assertEqual(item.ingredient, beans)
+
+    def test_generate_grocery_list_invalid_recipes(self):
+        """Test malformed recipes are rejected"""
+        response = self.client.post(self.url, json.dumps({"recipes": [{}]}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
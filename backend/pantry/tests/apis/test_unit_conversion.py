@@ -0,0 +1,68 @@
+import json
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from grocery_list.models import GroceryList, GroceryListItem
+from ingredient.models import Ingredient
+from ...models import PantryItem
+
+User = get_user_model()
+
+class UnitConversionAPITests(TestCase):
+    def setUp(self):
+        # Create a test user
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpassword'
+        )
+
+        # Create a test client
+        self.client = APIClient()
+
+        # Get token
+        refresh = RefreshToken.for_user(self.user)
+        access_token = str(refresh.access_token)
+
+        # Add token to client
+        self.client.credentials(HTTP_AUTHORIZATION=f'JWT {access_token}')
+
+        self.batch_url = '/api/pantry/add-from-grocery/'
+
+        self.grocery_list = GroceryList.objects.create(user=self.user, title='Checkout')
+
+    def test_batch_add_from_grocery(self):
+        """Test converting several grocery items in one call"""
+        rice = Ingredient.objects.create(name='Rice')
+        beans = Ingredient.objects.create(name='Beans')
+        PantryItem.objects.create(user=self.user, ingredient=rice, quantity=1, unit='cup')
+        rice_item = GroceryListItem.objects.create(grocery_list=self.grocery_list, ingredient=rice, quantity=1, unit='cup')
+        beans_item = GroceryListItem.objects.create(grocery_list=self.grocery_list, ingredient=beans, quantity=2)
+
+        response = self.client.post(
+            self.batch_url,
+            data=json.dumps({'items': [
+                {'grocery_item_id': rice_item.id},
+                {'grocery_item_id': beans_item.id, 'to_unit': 'g'},
+            ]}),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]['quantity'], 2.0)
+        self.assertEqual(results[1]['stock_level'], 'high')
+        self.assertEqual(PantryItem.objects.filter(user=self.user).count(), 2)
+
+    def test_batch_add_from_grocery_invalid_body(self):
+        """Test a malformed batch is rejected"""
+        response = self.client.post(
+            self.batch_url,
+            data=json.dumps({'items': [1, 2]}),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,96 @@
+from decimal import Decimal
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from pantry.models import PantryItem
+from pantry.services import PantryItemService
+from grocery_list.models import GroceryList, GroceryListItem
+from ingredient.models import Ingredient
+from measurement.services.unit_registry import UnitRegistry
+
+User = get_user_model()
+
+class PantryItemServiceTest(TestCase):
+    def setUp(self):
+        # Load the unit registry up front so query counts only cover the code under test
+        UnitRegistry.current()
+
+        # Create a test user
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpassword'
+        )
+
+        self.flour = Ingredient.objects.create(name='Flour')
+        self.milk = Ingredient.objects.create(name='Milk')
+        self.eggs = Ingredient.objects.create(name='Eggs')
+
+        self.flour_pantry_item = PantryItem.objects.create(
+            user=self.user, ingredient=self.flour, quantity=500, unit='g'
+        )
+        self.milk_pantry_item = PantryItem.objects.create(
+            user=self.user, ingredient=self.milk, quantity=None, unit=None, stock_level='out'
+        )
+
+        self.grocery_list = GroceryList.objects.create(user=self.user, title='Trip')
+
+    def test_add_grocery_list_to_pantry(self):
+        """Test purchased items are merged into the pantry with unit conversion"""
+        GroceryListItem.objects.create(grocery_list=self.grocery_list, ingredient=self.flour,
+                                       quantity=1, unit='kg', purchased=True)
+        GroceryListItem.objects.create(grocery_list=self.grocery_list, ingredient=self.milk,
+                                       quantity=2, unit='l', purchased=True)
+        GroceryListItem.objects.create(grocery_list=self.grocery_list, ingredient=self.eggs,
+                                       quantity=12, purchased=True, notes='free range')
+        GroceryListItem.objects.create(grocery_list=self.grocery_list, ingredient=self.eggs,
+                                       quantity=6, purchased=False)
+
+        result = PantryItemService.add_grocery_list_to_pantry(self.grocery_list.id, self.user.id)
+
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(len(result['items']), 3)
+
+        self.grocery_list.refresh_from_db()
+        self.assertTrue(self.grocery_list.completed)
+
+        # 500 g + 1 kg, kept in the pantry's unit
+        self.flour_pantry_item.refresh_from_db()
+        self.assertEqual((self.flour_pantry_item.quantity, self.flour_pantry_item.unit), (Decimal('1500'), 'g'))
+        # A pantry item without a quantity takes the purchased quantity
+        self.milk_pantry_item.refresh_from_db()
+        self.assertEqual((self.milk_pantry_item.quantity, self.milk_pantry_item.unit), (Decimal('2'), 'l'))
+        # Unpurchased items are ignored
+        eggs = PantryItem.objects.get(user=self.user, ingredient=self.eggs)
+        self.assertEqual((eggs.quantity, eggs.notes), (Decimal('12'), 'free range'))
+
+    def test_add_grocery_list_to_pantry_unconvertible_units(self):
+        """Test quantities in an unconvertible unit become a separate pantry item"""
+        GroceryListItem.objects.create(grocery_list=self.grocery_list, ingredient=self.flour,
+                                       quantity=1, unit='bag', purchased=True)
+
+        PantryItemService.add_grocery_list_to_pantry(self.grocery_list.id, self.user.id)
+
+        self.flour_pantry_item.refresh_from_db()
+        self.assertEqual(self.flour_pantry_item.quantity, Decimal('500'))
+        self.assertEqual(PantryItem.objects.get(ingredient=self.flour, unit='bag').quantity, Decimal('1'))
+
+    def test_add_grocery_list_to_pantry_query_count(self):
+        """Test closing out a long list takes a fixed number of queries"""
+        for i in range(40):
+            ingredient = Ingredient.objects.create(name=f'Ingredient {i}')
+            if i % 2:
+                PantryItem.objects.create(user=self.user, ingredient=ingredient, quantity=1, unit='cup')
+            GroceryListItem.objects.create(grocery_list=self.grocery_list, ingredient=ingredient,
+                                           quantity=2, unit='tbsp', purchased=True)
+
+        # savepoint, get list, save list, grocery items, pantry items, bulk update,
+        # bulk insert, release savepoint, category prefetch
+        with self.assertNumQueries(9):
+            result = PantryItemService.add_grocery_list_to_pantry(self.grocery_list.id, self.user.id)
+        self.assertEqual(len(result['items']), 40)
+
+    def test_add_missing_grocery_list_to_pantry(self):
+        """Test an unknown grocery list is reported as an error"""
+        result = PantryItemService.add_grocery_list_to_pantry(9999, self.user.id)
+        self.assertEqual(result['status'], 'error')
@@ -0,0 +1,107 @@
+from decimal import Decimal
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from grocery_list.models import GroceryList, GroceryListItem
+from ingredient.models import Ingredient
+from measurement.services.unit_registry import UnitRegistry
+from recipe.models import Recipe, RecipeItem
+from ...models import PantryItem
+from ...services import PantryShortfallService
+
+User = get_user_model()
+
+class PantryShortfallServiceTests(TestCase):
+    def setUp(self):
+        # Load the unit registry up front so query counts only cover the code under test
+        UnitRegistry.current()
+
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.flour = Ingredient.objects.create(name='Flour')
+        self.milk = Ingredient.objects.create(name='Milk')
+        self.eggs = Ingredient.objects.create(name='Eggs')
+        self.salt = Ingredient.objects.create(name='Salt')
+
+        self.recipe = Recipe.objects.create(title='Pancakes', user=self.user, servings=2)
+        RecipeItem.objects.create(recipe=self.recipe, ingredient=self.flour, quantity=500, unit='g')
+        RecipeItem.objects.create(recipe=self.recipe, ingredient=self.milk, quantity=2, unit='cup')
+        RecipeItem.objects.create(recipe=self.recipe, ingredient=self.eggs, quantity=2)
+
+    def _items(self, grocery_list_id):
+        return {
+            item.ingredient.name: item
+            for item in GroceryListItem.objects.filter(grocery_list_id=grocery_list_id).select_related('ingredient')
+        }
+
+    def test_only_shortfall_is_added(self):
+        """
+        Test pantry quantities are converted and subtracted from the requirements
+        """
+        PantryItem.objects.create(user=self.user, ingredient=self.flour, quantity=Decimal('0.2'), unit='kg')
+        PantryItem.objects.create(user=self.user, ingredient=self.eggs, quantity=12)
+
+        result = PantryShortfallService.generate_grocery_list(
+            [{"recipe_id": self.recipe.id, "servings": 4}], user_id=self.user.id
+        )
+
+        self.assertEqual(result['status'], 'success')
+        items = self._items(result['grocery_list_id'])
+        self.assertEqual(set(items), {'Flour', 'Milk'})
+        self.assertEqual(items['Flour'].quantity, Decimal('800.00'))
+        self.assertEqual(items['Flour'].unit, 'g')
+        self.assertEqual(items['Milk'].quantity, Decimal('4.00'))
+
+    def test_stock_levels(self):
+        """
+        Test well stocked items without quantities cover a requirement and low or out items are restocked
+        """
+        PantryItem.objects.create(user=self.user, ingredient=self.flour, stock_level='high')
+        PantryItem.objects.create(user=self.user, ingredient=self.milk, quantity=10, unit='cup', stock_level='out')
+        PantryItem.objects.create(user=self.user, ingredient=self.salt, stock_level='low')
+
+        result = PantryShortfallService.generate_grocery_list(
+            [{"recipe_id": self.recipe.id}], user_id=self.user.id
+        )
+
+        items = self._items(result['grocery_list_id'])
+        self.assertEqual(set(items), {'Milk', 'Eggs', 'Salt'})
+        self.assertEqual(items['Milk'].quantity, Decimal('2.00'))
+        self.assertEqual(items['Salt'].notes, 'Restock (low)')
+
+        result = PantryShortfallService.generate_grocery_list(
+            [], user_id=self.user.id, include_staples=False
+        )
+        self.assertEqual(result['count'], 0)
+
+    def test_adds_to_existing_list(self):
+        """
+        Test the shortfall is merged into an existing grocery list of the user
+        """
+        grocery_list = GroceryList.objects.create(user=self.user, title='Weekly')
+        GroceryListItem.objects.create(grocery_list=grocery_list, ingredient=self.eggs, quantity=6)
+
+        result = PantryShortfallService.generate_grocery_list(
+            [{"recipe_id": self.recipe.id}], user_id=self.user.id, grocery_list_id=grocery_list.id
+        )
+
+        self.assertEqual(result['grocery_list_id'], grocery_list.id)
+        self.assertEqual(self._items(grocery_list.id)['Eggs'].quantity, Decimal('8.00'))
+
+        other_user = User.objects.create_user(username='other', password='password')
+        result = PantryShortfallService.generate_grocery_list([], user_id=other_user.id, grocery_list_id=grocery_list.id)
+        self.assertEqual(result['status'], 'error')
+
+    def test_query_count_is_constant(self):
+        """
+        Test the pantry and recipe items are each read once however large they are
+        """
+        for i in range(20):
+            ingredient = Ingredient.objects.create(name=f'Spice {i}')
+            PantryItem.objects.create(user=self.user, ingredient=ingredient, quantity=1, unit='tsp', stock_level='low')
+            RecipeItem.objects.create(recipe=self.recipe, ingredient=ingredient, quantity=2, unit='tbsp')
+
+        with self.assertNumQueries(9):
+            result = PantryShortfallService.generate_grocery_list(
+                [{"recipe_id": self.recipe.id}], user_id=self.user.id
+            )
+        self.assertEqual(result['count'], 23)
@@ -6,11 +6,15 @@ from pantry.models import PantryItem
 from pantry.services.unit_conversion import PantryUnitConversionService
 from grocery_list.models import GroceryList, GroceryListItem
 from ingredient.models import Ingredient
+from measurement.services.unit_registry import UnitRegistry
 
 User = get_user_model()
 
 class PantryUnitConversionServiceTest(TestCase):
     def setUp(self):
+        # Load the unit registry up front so query counts only cover the code under test
+        UnitRegistry.current()
+
         # Create a test user
         self.user = User.objects.create_user(
             username='testuser',
@@ -155,3 +159,93 @@ class PantryUnitConversionServiceTest(TestCase):
         self.assertEqual(sugar_pantry_item.unit, 'g')
         self.assertEqual(float(sugar_pantry_item.quantity), 500)
         self.assertEqual(sugar_pantry_item.stock_level, 'high')  # New items start at high
+
+    def test_convert_grocery_items_to_pantry(self):
+        """Test converting a batch of grocery items to pantry items"""
+        sugar = Ingredient.objects.create(name='Sugar')
+        sugar_grocery_item = GroceryListItem.objects.create(
+            grocery_list=self.grocery_list,
+            ingredient=sugar,
+            quantity=1,
+            unit='cup'
+        )
+        flour_bag_item = GroceryListItem.objects.create(
+            grocery_list=self.grocery_list,
+            ingredient=self.flour,
+            quantity=1,
+            unit='bag'
+        )
+
+        results = PantryUnitConversionService.convert_grocery_items_to_pantry(
+            items=[
+                {'grocery_item_id': self.flour_grocery_item.id},
+                {'grocery_item_id': self.water_grocery_item.id, 'to_unit': 'ml'},
+                {'grocery_item_id': sugar_grocery_item.id},
+                {'grocery_item_id': flour_bag_item.id},
+                {'grocery_item_id': 9999},
+            ],
+            user_id=self.user.id
+        )
+
+        self.assertEqual([result['grocery_item_id'] for result in results], [
+            self.flour_grocery_item.id, self.water_grocery_item.id, sugar_grocery_item.id, flour_bag_item.id, 9999
+        ])
+
+        # 500g + 2kg kept in the pantry's unit
+        self.assertEqual(results[0]['id'], self.flour_pantry_item.id)
+        self.assertTrue(results[0]['converted'])
+        self.flour_pantry_item.refresh_from_db()
+        self.assertEqual((float(self.flour_pantry_item.quantity), self.flour_pantry_item.unit), (2500, 'g'))
+
+        # 1l + 500ml stored in the requested unit
+        self.water_pantry_item.refresh_from_db()
+        self.assertEqual((float(self.water_pantry_item.quantity), self.water_pantry_item.unit), (1500, 'ml'))
+
+        # New ingredients and unconvertible units become new pantry items
+        sugar_pantry_item = PantryItem.objects.get(id=results[2]['id'])
+        self.assertEqual(sugar_pantry_item.ingredient, sugar)
+        self.assertEqual(sugar_pantry_item.notes, 'Added from grocery list: Test Grocery List')
+        self.assertEqual(PantryItem.objects.get(id=results[3]['id']).unit, 'bag')
+        self.assertFalse(results[3]['converted'])
+
+        self.assertEqual(results[4]['error'], 'Grocery item not found')
+
+    def test_convert_grocery_items_to_pantry_query_count(self):
+        """Test a batch takes a fixed number of queries regardless of its size"""
+        items = []
+        for i in range(20):
+            ingredient = Ingredient.objects.create(name=f'Ingredient {i}')
+            if i % 2:
+                PantryItem.objects.create(user=self.user, ingredient=ingredient, quantity=1, unit='cup')
+            grocery_item = GroceryListItem.objects.create(
+                grocery_list=self.grocery_list, ingredient=ingredient, quantity=2, unit='tbsp'
+            )
+            items.append({'grocery_item_id': grocery_item.id})
+
+        # grocery items, pantry items, savepoint, bulk update, bulk insert, release savepoint
+        with self.assertNumQueries(6):
+            results = PantryUnitConversionService.convert_grocery_items_to_pantry(items, self.user.id)
+        self.assertEqual(len(results), 20)
+
+    def test_convert_other_users_grocery_item(self):
+        """Test grocery items on another user's list are not converted"""
+        other_user = User.objects.create_user(username='other', email='other@example.com', password='password')
+
+        with self.assertRaises(GroceryListItem.DoesNotExist):
+            PantryUnitConversionService.convert_grocery_to_pantry(
+                grocery_item_id=self.flour_grocery_item.id,
+                user_id=other_user.id
+            )
+
+    def test_convert_grocery_item_on_list_without_user(self):
+        """Test grocery items on lists without a user can still be converted, as before lists had owners"""
+        shared_list = GroceryList.objects.create(title="Shared")
+        grocery_item = GroceryListItem.objects.create(
+            grocery_list=shared_list, ingredient=self.flour, quantity=1, unit='kg'
+        )
+
+        result = PantryUnitConversionService.convert_grocery_to_pantry(
+            grocery_item_id=grocery_item.id,
+            user_id=self.user.id
+        )
+        self.assertIn('id', result)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Recipe, RecipeItem, RecipeStep
+from .models import Recipe, RecipeItem, RecipeStep, ScanJob, ScanResult
 
 class RecipeItemInline(admin.TabularInline):
     model = RecipeItem
@@ -27,6 +27,17 @@ class RecipeStepAdmin(admin.ModelAdmin):
     search_fields = ('description',)
     ordering = ['recipe', 'step_number']
 
+class ScanJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'url', 'status', 'user', 'created_at', 'started_at', 'finished_at')
+    list_filter = ('status',)
+    search_fields = ('url',)
+
+class ScanResultAdmin(admin.ModelAdmin):
+    list_display = ('id', 'url', 'content_hash', 'size', 'created_at', 'last_used_at')
+    search_fields = ('url',)
+
 admin.site.register(Recipe, RecipeAdmin)
 admin.site.register(RecipeItem, RecipeItemAdmin)
 admin.site.register(RecipeStep, RecipeStepAdmin)
+admin.site.register(ScanJob, ScanJobAdmin)
+admin.site.register(ScanResult, ScanResultAdmin)
@@ -3,7 +3,9 @@ import logging
 from django.http import JsonResponse
 from typing import Dict
 
-from ..services import RecipeService
+from common.pagination import get_pagination_params
+from common.streaming import StreamingJsonResponse, wants_stream
+from ..services import RecipeService, RecipeMatchService
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,15 @@ class RecipeAPI:
             logger.info('recipe method "list" called')
             # Get user-specific recipes if user is authenticated
             user_id = request.user.id if hasattr(request, 'user') and request.user.is_authenticated else None
+            if wants_stream(request):
+                return StreamingJsonResponse(RecipeService.stream(user_id=user_id))
+            try:
+                pagination = get_pagination_params(request)
+                if pagination is not None:
+                    cursor, page_size = pagination
+                    return JsonResponse(RecipeService.list_page(user_id=user_id, cursor=cursor, page_size=page_size))
+            except ValueError as e:
+                return JsonResponse({"error": str(e)}, status=400)
             return JsonResponse(RecipeService.list(user_id=user_id), safe=False)
         elif request.method == 'POST':
             logger.info('recipe method "create" called')
@@ -35,3 +46,37 @@ class RecipeAPI:
         elif request.method == 'DELETE':
             logger.info(f'recipe method "delete" called with id {id}')
             return JsonResponse(RecipeService.delete(id=id))
+
+    @staticmethod
+    def scale(request, id) -> Dict:
+        if request.method == 'GET':
+            logger.info(f'recipe method "scale" called with id {id}')
+            user_id = request.user.id if hasattr(request, 'user') and request.user.is_authenticated else None
+            try:
+                servings = int(request.GET.get('servings', ''))
+            except ValueError:
+                return JsonResponse({"error": "servings must be a positive number"}, status=400)
+            try:
+                scaled = RecipeService.scale(id=id, servings=servings, user_id=user_id)
+            except ValueError as e:
+                return JsonResponse({"error": str(e)}, status=400)
+            if scaled is None:
+                return JsonResponse({"error": "Recipe not found"}, status=404)
+            return JsonResponse(scaled)
+
+    @staticmethod
+    def cookable(request) -> Dict:
+        if request.method == 'GET':
+            logger.info('recipe method "cookable" called')
+            if not (hasattr(request, 'user') and request.user.is_authenticated):
+                return JsonResponse({"error": "Authentication required"}, status=401)
+            try:
+                min_score = float(request.GET.get('min_score', 0))
+                limit = int(request.GET.get('limit', 20))
+            except ValueError:
+                return JsonResponse({"error": "min_score and limit must be numbers"}, status=400)
+            if not 0 <= min_score <= 1 or limit < 1:
+                return JsonResponse({"error": "min_score must be between 0 and 1 and limit must be positive"}, status=400)
+            return JsonResponse(RecipeMatchService.cookable(
+                user_id=request.user.id, min_score=min_score, limit=limit
+            ), safe=False)
@@ -38,3 +38,31 @@ class RecipeItemAPI:
         if request.method == 'POST':
             logger.info(f'recipe_item method "add_to_grocery_list" called with recipe_id {recipe_id} and grocery_list_id {grocery_list_id}')
             return JsonResponse(RecipeItemService.add_to_grocery_list(recipe_id=recipe_id, grocery_list_id=grocery_list_id))
+
+    @staticmethod
+    def add_meal_plan_to_grocery_list(request) -> Dict:
+        """
+        Add several recipes, each with a serving multiplier, to one grocery list
+
+        Request body:
+        {
+            "recipes": [{"recipe_id": number, "multiplier": number (optional), "servings": number (optional)}],
+            "grocery_list_id": number (optional, a new list is created if omitted),
+            "title": string (optional, title for a new list)
+        }
+        """
+        if request.method == 'POST':
+            logger.info('recipe_item method "add_meal_plan_to_grocery_list" called')
+            data = json.loads(request.body.decode("utf-8"))
+            recipes = data.get('recipes')
+            if not recipes or not all(isinstance(entry, dict) and entry.get('recipe_id') for entry in recipes):
+                return JsonResponse({"status": "error", "message": "A list of recipes with recipe_id is required"}, status=400)
+
+            user_id = request.user.id if hasattr(request, 'user') and request.user.is_authenticated else None
+            result = RecipeItemService.add_recipes_to_grocery_list(
+                recipes=recipes,
+                grocery_list_id=data.get('grocery_list_id'),
+                user_id=user_id,
+                title=data.get('title')
+            )
+            return JsonResponse(result, status=200 if result['status'] == 'success' else 400)
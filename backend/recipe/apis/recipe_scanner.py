@@ -1,9 +1,11 @@
 import json
 import logging
+import math
 from django.http import JsonResponse
 from typing import Dict
 
-from ..services import RecipeScannerService
+from common.rate_limit import RateLimited
+from ..services import RecipeScannerService, ScanJobService
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +14,10 @@ class RecipeScannerAPI:
     @staticmethod
     def scan(request) -> Dict:
         """
-        Scan a URL for recipe data
+        Queue a URL to be scanned for recipe data by a background worker
+
+        Responds 202 with the job; poll scan/<id>/ for its progress and result.
+        Responds 429 with a Retry-After header if the user is scanning too often.
         """
         if request.method == 'POST':
             logger.info('recipe_scanner method "scan" called')
@@ -28,14 +33,28 @@ class RecipeScannerAPI:
                 # Get user ID if authenticated
                 user_id = request.user.id if hasattr(request, 'user') and request.user.is_authenticated else None
 
-                # Scan the URL
-                recipe_data = RecipeScannerService.scan_url(url=url, user_id=user_id)
-                return JsonResponse(recipe_data)
+                # Queue the scan
+                job = ScanJobService.enqueue(url=url, user_id=user_id)
+                return JsonResponse(job, status=202)
+            except RateLimited as e:
+                response = JsonResponse({"error": str(e)}, status=429)
+                response['Retry-After'] = str(math.ceil(e.retry_after))
+                return response
             except ValueError as e:
                 return JsonResponse({"error": str(e)}, status=400)
-            except Exception as e:
-                logger.error(f"Error scanning URL: {str(e)}")
-                return JsonResponse({"error": "Failed to scan recipe URL"}, status=500)
+
+    @staticmethod
+    def scan_job(request, id) -> Dict:
+        """
+        Get the progress of a scan job, and the scanned recipe once it's complete
+        """
+        if request.method == 'GET':
+            logger.info(f'recipe_scanner method "scan_job" called with id {id}')
+            user_id = request.user.id if hasattr(request, 'user') and request.user.is_authenticated else None
+            job = ScanJobService.get(id=id, user_id=user_id)
+            if job is None:
+                return JsonResponse({"error": "Scan job not found"}, status=404)
+            return JsonResponse(job)
 
     @staticmethod
     def create_from_scan(request) -> Dict:
@@ -0,0 +1,30 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+class RecipeConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'recipe'
+
+    def ready(self):
+        from ingredient.models import Ingredient
+        from .models import Recipe, RecipeItem
+        from .services.recipe_match import RecipeMatchService
+
+        def recipe_changed(sender, instance, **kwargs):
+            RecipeMatchService.recipe_changed(instance.pk, instance.user_id)
+
+        def recipe_item_changed(sender, instance, **kwargs):
+            RecipeMatchService.recipe_changed(instance.recipe_id)
+
+        def ingredient_changed(sender, instance, created, update_fields=None, **kwargs):
+            # Scaled recipes show ingredient names and are memoized on updated_at
+            if created or not instance.name_changed():
+                return
+            Recipe.objects.filter(items__ingredient_id=instance.pk).update(updated_at=timezone.now())
+
+        post_save.connect(recipe_changed, sender=Recipe, weak=False, dispatch_uid='recipe.match.recipe.save')
+        post_delete.connect(recipe_changed, sender=Recipe, weak=False, dispatch_uid='recipe.match.recipe.delete')
+        post_save.connect(recipe_item_changed, sender=RecipeItem, weak=False, dispatch_uid='recipe.match.item.save')
+        post_delete.connect(recipe_item_changed, sender=RecipeItem, weak=False, dispatch_uid='recipe.match.item.delete')
+        post_save.connect(ingredient_changed, sender=Ingredient, weak=False, dispatch_uid='recipe.scale.ingredient.save')
@@ -0,0 +1,39 @@
+import logging
+import signal
+
+from django.core.management.base import BaseCommand
+
+from recipe.services import ScanJobService
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Run queued recipe URL scans; start several for more throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is empty')
+
+    def handle(self, *args, **options):
+        stopping = []
+
+        def stop(signum, frame):
+            # Finish the current job, then exit
+            logger.info("Scan worker stopping after the current job")
+            stopping.append(signum)
+
+        previous_handlers = {signum: signal.signal(signum, stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+
+        # Then again every HOUSEKEEPING_INTERVAL seconds while jobs run
+        logger.info(f"Scan worker started, housekeeping: {ScanJobService.housekeep()}")
+
+        try:
+            count = ScanJobService.work(
+                poll_interval=options['poll_interval'],
+                once=options['once'],
+                should_stop=lambda: bool(stopping)
+            )
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+        self.stdout.write(f"Ran {count} scan jobs")
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 12:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0003_scanjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scanjob',
+            name='run_after',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-18 12:19
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0004_scanjob_run_after'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScanResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.CharField(max_length=2048)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('result', models.JSONField()),
+                ('size', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['last_used_at'], name='scan_result_last_used_idx')],
+                'unique_together': {('url', 'content_hash')},
+            },
+        ),
+    ]
@@ -1,3 +1,5 @@
 from .recipe import Recipe
 from .recipe_item import RecipeItem
 from .recipe_step import RecipeStep
+from .scan_job import ScanJob
+from .scan_result import ScanResult
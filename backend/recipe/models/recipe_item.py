@@ -6,7 +6,8 @@ class RecipeItem(models.Model):
     recipe = models.ForeignKey(
         Recipe,
         on_delete=models.CASCADE,
-        related_name='items'
+        related_name='items',
+        db_index=False  # Covered by recipe_item_recipe_ingr_idx
     )
     ingredient = models.ForeignKey(
         Ingredient,
@@ -23,6 +24,9 @@ class RecipeItem(models.Model):
 
     class Meta:
         ordering = ['ingredient__name']
+        indexes = [
+            models.Index(fields=['recipe', 'ingredient'], name='recipe_item_recipe_ingr_idx'),
+        ]
 
     def __str__(self):
         return f"{self.quantity} {self.unit or ''} {self.ingredient.name}"
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db import models
+
+class ScanJob(models.Model):
+    """A recipe URL scan queued for a background worker"""
+    STATUSES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('complete', 'Complete'),
+        ('error', 'Error')
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='scan_jobs',
+        null=True
+    )
+    url = models.URLField(max_length=2048)
+    status = models.CharField(max_length=10, choices=STATUSES, default='queued')
+    # The scanner's progress dict: status, progress (0-100) and message
+    progress = models.JSONField(default=dict)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Bumped by the worker as the scan progresses, so live jobs aren't taken for stale ones
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    # Times a worker has claimed the job
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Set when the job is deferred by a rate limit; workers skip it until then
+    run_after = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # Workers claim the oldest queued job
+            models.Index(fields=['status', 'created_at'], name='scan_job_status_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.url} ({self.status})"
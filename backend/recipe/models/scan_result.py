@@ -0,0 +1,24 @@
+from django.db import models
+from django.utils import timezone
+
+class ScanResult(models.Model):
+    """A scanned recipe, reused while the page it came from is unchanged"""
+    # Normalized by recipe.services.page_fetcher.normalize_url
+    url = models.CharField(max_length=2048)
+    # SHA-256 of the page body the recipe was parsed from
+    content_hash = models.CharField(max_length=64)
+    result = models.JSONField()
+    # Length of the serialized result, for evicting by total size
+    size = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ['url', 'content_hash']
+        indexes = [
+            # Eviction removes the least recently used results first
+            models.Index(fields=['last_used_at'], name='scan_result_last_used_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.url} ({self.content_hash[:12]})"
@@ -21,4 +21,7 @@ class RecipeSerializer(serializers.ModelSerializer):
         }
 
     def get_item_count(self, obj):
+        # Use the count annotated by RecipeQueryPlan when available
+        if hasattr(obj, 'annotated_item_count'):
+            return obj.annotated_item_count
         return obj.items.count()
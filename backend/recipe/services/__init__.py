@@ -1,5 +1,10 @@
 from .recipe import RecipeService
 from .recipe_item import RecipeItemService
+from .recipe_match import RecipeMatchService
 from .recipe_step import RecipeStepService
+from .page_fetcher import PageFetcherService
 from .recipe_scanner import RecipeScannerService
+from .scan_result import ScanResultService
+from .scan_job import ScanJobService
 from .recipe_image_scanner import RecipeImageScannerService
+from .query_plan import RecipeQueryPlan
@@ -0,0 +1,300 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+
+logger = logging.getLogger(__name__)
+
+# How long a page is reused without asking the site, unless it sends Cache-Control: max-age
+DEFAULT_TTL = 60 * 60
+# Entries not used or revalidated in this long are deleted by purge()
+MAX_ENTRY_AGE = 7 * 24 * 60 * 60
+# Once the cache directory passes this size, purge() deletes the least recently used entries
+MAX_CACHE_SIZE = 200 * 1024 * 1024
+# Query parameters that only track where a link was shared and never change the page
+TRACKING_PARAMS = re.compile(r'^(utm_\w+|fbclid|gclid|mc_cid|mc_eid)$', re.IGNORECASE)
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Seconds to wait for a connection, and then between bytes of the response
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 15
+# Seconds a whole download may take, so a site trickling bytes can't hold a worker
+TOTAL_TIMEOUT = 30
+# Pages larger than this are abandoned mid-download
+MAX_RESPONSE_BYTES = 5 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Hosts with pooled connections, and idle keep-alive connections kept per host
+POOL_HOSTS = 20
+POOL_CONNECTIONS_PER_HOST = 4
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL, so links to the same page share a cache entry:
+    lowercase scheme and host, no default port, fragment or tracking
+    parameters, and the remaining query parameters sorted
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or '').lower()
+    if parsed.port and parsed.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parsed.port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not TRACKING_PARAMS.match(key)
+    )
+    return urlunparse((scheme, host, parsed.path or '/', parsed.params, urlencode(query), ''))
+
+class ResponseTooLarge(requests.RequestException):
+    """Raised when a page is larger than MAX_RESPONSE_BYTES"""
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """
+    The process's shared session, so scans of the same site reuse keep-alive connections
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_CONNECTIONS_PER_HOST)
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers['User-Agent'] = USER_AGENT
+            _session = session
+        return _session
+
+class FetchedPage:
+    """The body of a fetched page and the encoding to decode it with"""
+
+    def __init__(self, url: str, content: bytes, encoding: Optional[str], from_cache: bool = False):
+        self.url = url
+        self.content = content
+        self.encoding = encoding
+        self.from_cache = from_cache
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+class PageFetcherService:
+    """
+    Fetches recipe pages through an on-disk HTTP cache in settings.SCAN_CACHE_DIR
+
+    A cached page is reused until its TTL runs out, then revalidated with
+    If-None-Match/If-Modified-Since so an unchanged page costs a 304 instead
+    of a download. Entries are single files replaced atomically, so web and
+    worker processes can share the directory. Pages are downloaded with the
+    shared session, within the timeouts and MAX_RESPONSE_BYTES.
+    """
+
+    @staticmethod
+    def fetch(url: str) -> FetchedPage:
+        """
+        Get a page, from the cache if possible
+
+        Args:
+            url: The page URL
+
+        Returns:
+            The fetched page
+
+        Raises:
+            requests.RequestException: If the page can't be fetched
+        """
+        key = normalize_url(url)
+        path = PageFetcherService.__path(key)
+        entry = PageFetcherService.__read(path)
+        now = time.time()
+
+        if entry and entry[0]['expires_at'] > now:
+            logger.info(f"Using cached page for {key}")
+            PageFetcherService.__touch(path)
+            return FetchedPage(url, entry[1], entry[0]['encoding'], from_cache=True)
+
+        headers = {}
+        if entry:
+            if entry[0].get('etag'):
+                headers['If-None-Match'] = entry[0]['etag']
+            if entry[0].get('last_modified'):
+                headers['If-Modified-Since'] = entry[0]['last_modified']
+
+        with get_session().get(url, headers=headers, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), stream=True) as response:
+            if entry and response.status_code == 304:
+                logger.info(f"Cached page for {key} is still current")
+                meta, content = entry
+                meta.update(PageFetcherService.__freshness(response, now, meta))
+                PageFetcherService.__write(path, meta, content)
+                return FetchedPage(url, content, meta['encoding'], from_cache=True)
+
+            response.raise_for_status()
+            content = PageFetcherService.__download(response)
+
+        # Without a charset requests assumes ISO-8859-1 for text/html, so detect it instead
+        charset_given = 'charset' in response.headers.get('Content-Type', '').lower()
+        encoding = response.encoding if charset_given else chardet.detect(content)['encoding']
+
+        if 'no-store' not in response.headers.get('Cache-Control', '').lower():
+            meta = {'url': key, 'encoding': encoding}
+            meta.update(PageFetcherService.__freshness(response, now, meta))
+            PageFetcherService.__write(path, meta, content)
+
+        return FetchedPage(url, content, encoding)
+
+    @staticmethod
+    def purge(max_age: float = MAX_ENTRY_AGE, max_size: int = MAX_CACHE_SIZE) -> int:
+        """
+        Delete cache entries that haven't been used or revalidated in max_age
+        seconds, then the least recently used until the rest total at most max_size
+
+        Returns:
+            The number of entries deleted
+        """
+        directory = PageFetcherService.__directory()
+        cutoff = time.time() - max_age
+        deleted = 0
+        kept = []
+        size = 0
+        for entry in os.scandir(directory):
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                if stat.st_mtime < cutoff:
+                    os.remove(entry.path)
+                    deleted += 1
+                else:
+                    kept.append((stat.st_mtime, stat.st_size, entry.path))
+                    size += stat.st_size
+            except FileNotFoundError:
+                # Another process purged or replaced it first
+                pass
+
+        kept.sort()
+        for _, entry_size, path in kept:
+            if size <= max_size:
+                break
+            try:
+                os.remove(path)
+                deleted += 1
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+        return deleted
+
+    @staticmethod
+    def __download(response: requests.Response) -> bytes:
+        """
+        Helper method to read a streamed response body, giving up once it passes
+        MAX_RESPONSE_BYTES or TOTAL_TIMEOUT
+        """
+        declared_length = response.headers.get('Content-Length')
+        if declared_length and declared_length.isdigit() and int(declared_length) > MAX_RESPONSE_BYTES:
+            raise ResponseTooLarge(f"Page is larger than {MAX_RESPONSE_BYTES} bytes")
+
+        deadline = time.monotonic() + TOTAL_TIMEOUT
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > MAX_RESPONSE_BYTES:
+                raise ResponseTooLarge(f"Page is larger than {MAX_RESPONSE_BYTES} bytes")
+            if time.monotonic() > deadline:
+                raise requests.Timeout(f"Page took longer than {TOTAL_TIMEOUT}s to download")
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    @staticmethod
+    def __freshness(response: requests.Response, now: float, meta: Dict) -> Dict:
+        """
+        Helper method to get the validators and expiry time from a response, keeping
+        the cached validators if a 304 doesn't repeat them
+        """
+        ttl = DEFAULT_TTL
+        match = re.search(r'max-age=(\d+)', response.headers.get('Cache-Control', ''))
+        if match:
+            ttl = int(match.group(1))
+        if 'no-cache' in response.headers.get('Cache-Control', '').lower():
+            ttl = 0
+        return {
+            'etag': response.headers.get('ETag') or meta.get('etag'),
+            'last_modified': response.headers.get('Last-Modified') or meta.get('last_modified'),
+            'expires_at': now + ttl
+        }
+
+    @staticmethod
+    def __touch(path: str) -> None:
+        """
+        Helper method to mark a cache entry as used, so purge() keeps it longer
+        """
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def __directory() -> str:
+        """
+        Helper method to get the cache directory, creating it on first use
+        """
+        directory = str(settings.SCAN_CACHE_DIR)
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    @staticmethod
+    def __path(key: str) -> str:
+        """
+        Helper method to get the file of a normalized URL's cache entry
+        """
+        return os.path.join(PageFetcherService.__directory(), hashlib.sha256(key.encode('utf-8')).hexdigest())
+
+    @staticmethod
+    def __read(path: str) -> Optional[Tuple[Dict, bytes]]:
+        """
+        Helper method to read a cache entry: a JSON metadata line followed by the body
+
+        Returns:
+            Tuple of the metadata dict and the body, or None if there is no usable entry
+        """
+        try:
+            with open(path, 'rb') as f:
+                header = f.readline()
+                content = f.read()
+            return json.loads(header), content
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning(f"Ignoring corrupt page cache entry {path}")
+            return None
+
+    @staticmethod
+    def __write(path: str, meta: Dict, content: bytes) -> None:
+        """
+        Helper method to replace a cache entry atomically
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json.dumps(meta).encode('utf-8') + b'\n')
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write page cache entry {path}: {str(e)}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,33 @@
+from django.db.models import Count, Prefetch
+
+from ..models import Recipe, RecipeItem, RecipeStep
+
+class RecipeQueryPlan:
+    """
+    Builds recipe querysets shaped for the serializer that will render them,
+    so nested relations are loaded in a fixed number of queries
+    """
+
+    @staticmethod
+    def recipes(queryset=None):
+        """
+        Queryset for RecipeSerializer: items with their ingredient and categories,
+        steps, and an annotated item count
+        """
+        if queryset is None:
+            queryset = Recipe.objects.all()
+        return queryset.annotate(
+            annotated_item_count=Count('items', distinct=True)
+        ).prefetch_related(
+            Prefetch('items', queryset=RecipeQueryPlan.recipe_items()),
+            Prefetch('steps', queryset=RecipeStep.objects.order_by('step_number')),
+        )
+
+    @staticmethod
+    def recipe_items(queryset=None):
+        """
+        Queryset for RecipeItemSerializer: ingredient joined, categories prefetched
+        """
+        if queryset is None:
+            queryset = RecipeItem.objects.all()
+        return queryset.select_related('ingredient').prefetch_related('ingredient__categories')
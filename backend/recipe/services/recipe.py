@@ -1,34 +1,127 @@
 import logging
-from typing import Dict
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Dict, Iterator, Optional
 
-from ..models import Recipe
+from common.pagination import CursorPaginator, paginated_response
+from common.streaming import stream_json_array
+from measurement.services.unit_conversion import humanize_quantity
+from ..models import Recipe, RecipeItem
 from ..serializers import RecipeSerializer
+from .query_plan import RecipeQueryPlan
 
 logger = logging.getLogger(__name__)
 
+# Matches Recipe.Meta.ordering, with id as a tie-breaker
+RECIPE_PAGINATOR = CursorPaginator(ordering=['-created_at', '-id'])
+
+# How many scaled recipes to keep memoized per process
+SCALED_RECIPE_CACHE_SIZE = 512
+
 class RecipeService:
+    __scaled_lock = threading.Lock()
+    __scaled = OrderedDict()
 
     @staticmethod
     def list(user_id=None) -> Dict:
         """
         List all recipes, optionally filtered by user
         """
-        if user_id:
-            recipes = Recipe.objects.filter(user_id=user_id)
-        else:
-            recipes = Recipe.objects.all()
+        recipes = RecipeService.__for_user(user_id)
         serializer = RecipeSerializer(recipes, many=True)
         return serializer.data
 
+    @staticmethod
+    def list_page(user_id=None, cursor: Optional[str] = None, page_size: Optional[int] = None) -> Dict:
+        """
+        List one page of recipes, newest first, optionally filtered by user
+        """
+        page, next_cursor = RECIPE_PAGINATOR.paginate(RecipeService.__for_user(user_id), cursor, page_size)
+        serializer = RecipeSerializer(page, many=True)
+        return paginated_response(serializer.data, next_cursor)
+
+    @staticmethod
+    def stream(user_id=None) -> Iterator[str]:
+        """
+        Stream all recipes as a JSON array, optionally filtered by user
+        """
+        return stream_json_array(RecipeService.__for_user(user_id), RecipeSerializer)
+
     @staticmethod
     def get(id) -> Dict:
         """
         Get a specific recipe by ID
         """
-        recipe = RecipeService.__get(id=id)
+        recipe = RecipeQueryPlan.recipes(Recipe.objects.filter(id=id)).first()
         serializer = RecipeSerializer(recipe)
         return serializer.data
 
+    @staticmethod
+    def scale(id, servings: int, user_id=None) -> Optional[Dict]:
+        """
+        Scale a recipe's items to a number of servings
+
+        Each scaled quantity is restated in the most readable unit of its
+        measuring system (48 tsp becomes 1 cup). The items are loaded with one
+        query and results are memoized per (recipe, updated_at, servings);
+        changing the recipe, its items or their ingredients bumps updated_at.
+
+        Args:
+            id: The ID of the recipe
+            servings: The number of servings to scale to
+            user_id: Optional ID of the user the recipe must belong to
+
+        Returns:
+            The scaled recipe, or None if it doesn't exist
+        """
+        if servings < 1:
+            raise ValueError("servings must be a positive number")
+
+        recipes = Recipe.objects.filter(id=id)
+        if user_id:
+            recipes = recipes.filter(user_id=user_id)
+        recipe = recipes.only('id', 'title', 'servings', 'updated_at').first()
+        if recipe is None:
+            return None
+        if not recipe.servings:
+            raise ValueError("Recipe has no servings to scale from")
+
+        key = (recipe.id, recipe.updated_at, servings)
+        with RecipeService.__scaled_lock:
+            scaled = RecipeService.__scaled.get(key)
+            if scaled is not None:
+                RecipeService.__scaled.move_to_end(key)
+                return scaled
+
+        multiplier = Decimal(servings) / Decimal(recipe.servings)
+        items = []
+        for item in RecipeItem.objects.filter(recipe_id=recipe.id).select_related('ingredient'):
+            quantity, unit = humanize_quantity(item.quantity * multiplier, item.unit)
+            items.append({
+                "id": item.id,
+                "ingredient": {"id": item.ingredient_id, "name": item.ingredient.name},
+                "quantity": float(quantity.quantize(Decimal('0.01'))),
+                "unit": unit,
+                "original_quantity": float(item.quantity),
+                "original_unit": item.unit,
+                "notes": item.notes
+            })
+
+        scaled = {
+            "id": recipe.id,
+            "title": recipe.title,
+            "servings": servings,
+            "original_servings": recipe.servings,
+            "multiplier": float(multiplier),
+            "items": items
+        }
+        with RecipeService.__scaled_lock:
+            RecipeService.__scaled[key] = scaled
+            while len(RecipeService.__scaled) > SCALED_RECIPE_CACHE_SIZE:
+                RecipeService.__scaled.popitem(last=False)
+        return scaled
+
     @staticmethod
     def create(validated_data, user_id=None) -> Dict:
         """
@@ -63,6 +156,17 @@ class RecipeService:
         recipe.delete()
         return {"status_code": 200}
 
+    @staticmethod
+    def __for_user(user_id=None):
+        """
+        Helper method to build the serializer-ready recipe queryset for a user
+        """
+        if user_id:
+            recipes = Recipe.objects.filter(user_id=user_id)
+        else:
+            recipes = Recipe.objects.all()
+        return RecipeQueryPlan.recipes(recipes)
+
     @staticmethod
     def __get(id=id):
         """
@@ -9,6 +9,8 @@ import nltk
 from PIL import Image
 from typing import Dict, List, Optional, Tuple
 
+from measurement.services.unit_registry import UnitRegistry
+
 logger = logging.getLogger(__name__)
 
 # Set NLTK data path from environment variable or use a default path
@@ -375,9 +377,8 @@ class RecipeImageScannerService:
         """Parse ingredient lines into structured data with a simpler approach"""
         ingredients = []
 
-        # Basic units for matching
-        basic_units = ["cup", "tbsp", "tsp", "tablespoon", "teaspoon", "oz", "ounce", "lb", "pound",
-                      "g", "gram", "ml", "liter", "l", "quart", "pint", "gallon"]
+        # Known units and their aliases
+        unit_registry = UnitRegistry.current()
 
         # Process each line as a complete ingredient
         for line in ingredient_lines:
@@ -419,7 +420,7 @@ class RecipeImageScannerService:
                             ingredient["quantity"] = float(quantity_str)
 
                         # Check if the second part is a unit
-                        if possible_unit and any(unit in possible_unit.lower() for unit in basic_units):
+                        if unit_registry.canonical_unit(possible_unit):
                             ingredient["unit"] = possible_unit.lower()
                             ingredient["name"] = name_part.strip()
                         else:
@@ -1,9 +1,17 @@
 import logging
-from typing import Dict, List
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional
 
-from ..models import RecipeItem
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import Recipe, RecipeItem
 from ..serializers import RecipeItemSerializer
-from grocery_list.models import GroceryListItem
+from grocery_list.models import GroceryList
+from grocery_list.services import GroceryListItemService
+from measurement.services.unit_conversion import try_convert_units
+from .query_plan import RecipeQueryPlan
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +22,9 @@ class RecipeItemService:
         """
         List all items for a recipe
         """
-        items = RecipeItem.objects.filter(recipe_id=recipe_id).order_by('ingredient__name')
+        items = RecipeQueryPlan.recipe_items(
+            RecipeItem.objects.filter(recipe_id=recipe_id).order_by('ingredient__name')
+        )
         serializer = RecipeItemSerializer(items, many=True)
         return serializer.data
 
@@ -34,7 +44,8 @@ class RecipeItemService:
         """
         serializer = RecipeItemSerializer(data=validated_data)
         if serializer.is_valid():
-            serializer.save()
+            item = serializer.save()
+            RecipeItemService.__touch_recipes(item.recipe_id)
         return serializer.data
 
     @staticmethod
@@ -43,9 +54,11 @@ class RecipeItemService:
         Update an existing recipe item
         """
         item = RecipeItemService.__get(id=id)
+        previous_recipe_id = item.recipe_id
         serializer = RecipeItemSerializer(instance=item, data=validated_data)
         if serializer.is_valid():
             serializer.save()
+            RecipeItemService.__touch_recipes(previous_recipe_id, item.recipe_id)
         return serializer.data
 
     @staticmethod
@@ -55,6 +68,7 @@ class RecipeItemService:
         """
         item = RecipeItemService.__get(id=id)
         item.delete()
+        RecipeItemService.__touch_recipes(item.recipe_id)
         return {"status_code": 200}
 
     @staticmethod
@@ -64,35 +78,19 @@ class RecipeItemService:
         """
         try:
             # Get all items from the recipe
-            recipe_items = RecipeItem.objects.filter(recipe_id=recipe_id)
-            
-            added_items = []
-            
-            # Add each recipe item to the grocery list
-            for item in recipe_items:
-                # Check if the item already exists in the grocery list
-                existing_item = GroceryListItem.objects.filter(
-                    grocery_list_id=grocery_list_id,
-                    ingredient_id=item.ingredient_id
-                ).first()
-                
-                if existing_item:
-                    # If the item exists, update the quantity
-                    existing_item.quantity += item.quantity
-                    existing_item.save()
-                    added_items.append(existing_item)
-                else:
-                    # If the item doesn't exist, create a new grocery list item
-                    grocery_item = GroceryListItem.objects.create(
-                        grocery_list_id=grocery_list_id,
-                        ingredient_id=item.ingredient_id,
-                        quantity=item.quantity,
-                        unit=item.unit,
-                        notes=item.notes,
-                        purchased=False
-                    )
-                    added_items.append(grocery_item)
-            
+            recipe_items = RecipeItem.objects.filter(recipe_id=recipe_id).select_related('ingredient')
+
+            # Merge them into the grocery list in one pass
+            added_items = GroceryListItemService.merge_items(grocery_list_id, [
+                {
+                    "ingredient": item.ingredient,
+                    "quantity": item.quantity,
+                    "unit": item.unit,
+                    "notes": item.notes
+                }
+                for item in recipe_items
+            ])
+
             # Return the added items
             return {
                 "status": "success",
@@ -107,6 +105,158 @@ class RecipeItemService:
                 "message": f"Error adding recipe items to grocery list: {str(e)}"
             }
 
+    @staticmethod
+    def add_recipes_to_grocery_list(recipes: List[Dict], grocery_list_id=None, user_id=None, title=None) -> Dict:
+        """
+        Add a whole meal plan to a grocery list in one pass
+
+        Args:
+            recipes: Dicts with a "recipe_id" and either a "multiplier" or a target
+                number of "servings"; a recipe may appear more than once
+            grocery_list_id: The grocery list to add to; a new list is created if omitted
+            user_id: The ID of the user, used to restrict recipes and grocery lists and own a new list
+            title: The title for a new grocery list
+
+        Returns:
+            Dict with the status, the grocery list ID and the number of items added
+        """
+        try:
+            with transaction.atomic():
+                entries = RecipeItemService.aggregate_requirements(recipes, user_id=user_id)
+
+                if grocery_list_id is None:
+                    grocery_list_id = GroceryList.objects.create(
+                        title=title or "Meal plan",
+                        user_id=user_id
+                    ).id
+                elif not GroceryList.objects.filter(id=grocery_list_id, user_id=user_id).exists():
+                    return {
+                        "status": "error",
+                        "message": f"Grocery list with ID {grocery_list_id} not found"
+                    }
+
+                added_items = GroceryListItemService.merge_items(grocery_list_id, entries)
+
+            return {
+                "status": "success",
+                "message": f"Added {len(added_items)} items to grocery list",
+                "count": len(added_items),
+                "grocery_list_id": grocery_list_id
+            }
+
+        except Exception as e:
+            logger.error(f"Error adding meal plan to grocery list: {str(e)}")
+            return {
+                "status": "error",
+                "message": f"Error adding meal plan to grocery list: {str(e)}"
+            }
+
+    @staticmethod
+    def aggregate_requirements(recipes: List[Dict], user_id=None) -> List[Dict]:
+        """
+        Sum the ingredients needed by several scaled recipes
+
+        All recipe items are read in a single query. Quantities of the same
+        ingredient are added together, converting to the first unit seen for that
+        ingredient; quantities that can't be converted are kept as separate entries.
+
+        Args:
+            recipes: Dicts with a "recipe_id" and either a "multiplier" or a target
+                number of "servings", both positive numbers
+            user_id: If given, the recipes must belong to this user
+
+        Returns:
+            List of dicts with "ingredient", "quantity", "unit" and "notes", in the
+            format accepted by GroceryListItemService.merge_items
+
+        Raises:
+            ValueError: If an entry is invalid, or a recipe doesn't exist or belongs to another user
+        """
+        plan = defaultdict(list)
+        for entry in recipes:
+            recipe_id = entry.get('recipe_id')
+            if isinstance(recipe_id, str) and recipe_id.strip().isdigit():
+                recipe_id = int(recipe_id)
+            if isinstance(recipe_id, bool) or not isinstance(recipe_id, int):
+                raise ValueError(f"Invalid recipe_id: {recipe_id!r}")
+            for key in ('multiplier', 'servings'):
+                if entry.get(key) is not None:
+                    RecipeItemService.__positive_number(entry[key], key)
+            plan[recipe_id].append(entry)
+
+        recipe_items = RecipeItem.objects.filter(recipe_id__in=plan.keys()).select_related('recipe', 'ingredient')
+        if user_id:
+            recipe_items = recipe_items.filter(recipe__user_id=user_id)
+
+        totals = defaultdict(list)
+        found = set()
+        for item in recipe_items:
+            found.add(item.recipe_id)
+            multiplier = sum(
+                RecipeItemService.__multiplier(entry, item.recipe.servings)
+                for entry in plan[item.recipe_id]
+            )
+            quantity = item.quantity * multiplier
+
+            for total in totals[item.ingredient_id]:
+                converted = try_convert_units(
+                    quantity, item.unit, total['unit'], item.ingredient.name, density=item.ingredient.density
+                )
+                if converted is not None:
+                    total['quantity'] += converted
+                    total['notes'] = total['notes'] or item.notes
+                    break
+            else:
+                totals[item.ingredient_id].append({
+                    "ingredient": item.ingredient,
+                    "quantity": quantity,
+                    "unit": item.unit,
+                    "notes": item.notes
+                })
+
+        # Recipes without items don't show up above, so only those need looking up
+        missing = set(plan) - found
+        if missing:
+            existing = Recipe.objects.filter(id__in=missing)
+            if user_id:
+                existing = existing.filter(user_id=user_id)
+            missing -= set(existing.values_list('id', flat=True))
+        if missing:
+            raise ValueError(f"Recipes not found: {', '.join(str(recipe_id) for recipe_id in sorted(missing))}")
+
+        return [total for ingredient_totals in totals.values() for total in ingredient_totals]
+
+    @staticmethod
+    def __multiplier(entry: Dict, recipe_servings: Optional[int]) -> Decimal:
+        """
+        Helper method to turn a meal plan entry into a quantity multiplier
+        """
+        if entry.get('servings') is not None and recipe_servings:
+            return RecipeItemService.__positive_number(entry['servings'], 'servings') / Decimal(recipe_servings)
+        if entry.get('multiplier') is None:
+            return Decimal(1)
+        return RecipeItemService.__positive_number(entry['multiplier'], 'multiplier')
+
+    @staticmethod
+    def __positive_number(value, name: str) -> Decimal:
+        """
+        Helper method to read a meal plan number, which must be positive and finite
+        """
+        try:
+            number = Decimal(str(value)) if not isinstance(value, bool) else None
+        except InvalidOperation:
+            number = None
+        if number is None or not number.is_finite() or number <= 0:
+            raise ValueError(f"{name} must be a positive number")
+        return number
+
+    @staticmethod
+    def __touch_recipes(*recipe_ids):
+        """
+        Helper method to bump updated_at on recipes whose items changed
+        """
+        Recipe.objects.filter(id__in=set(recipe_ids)).update(updated_at=timezone.now())
+
     @staticmethod
     def __get(id=id):
         """
@@ -0,0 +1,235 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from django.db.models import Count, Max, Q
+from measurement.services.unit_conversion import try_convert_units
+from pantry.models import PantryItem
+from ..models import Recipe, RecipeItem
+
+logger = logging.getLogger(__name__)
+
+# How much of an ingredient counts as on hand at each pantry stock level
+STOCK_LEVEL_WEIGHTS = {
+    'high': Decimal(1),
+    'medium': Decimal(1),
+    'low': Decimal('0.5'),
+    'out': Decimal(0),
+}
+
+class RecipeMatchIndex:
+    """
+    Inverted index from ingredient ID to the IDs of one user's recipes using it
+    """
+
+    def __init__(self, user_id: int, stamp: Dict):
+        self.user_id = user_id
+        self.titles = {}
+        # recipe ID -> [(ingredient ID, ingredient name, ingredient density, quantity, unit)]
+        self.items = {}
+        self.by_ingredient = defaultdict(set)
+        self.dirty = set()
+        # Count and latest updated_at of the user's recipes when they were indexed
+        self.stamp = stamp
+        self.loaded_at = time.monotonic()
+        self.lock = threading.Lock()
+        self.__load(Recipe.objects.filter(user_id=user_id))
+
+    def refresh(self, stamp: Dict) -> bool:
+        """
+        Reload the recipes marked dirty, plus those updated since the index's
+        stamp if it differs from the given one
+
+        Returns:
+            Whether the index now holds as many recipes as the stamp counts;
+            if not, recipes were deleted elsewhere and it must be rebuilt
+        """
+        changed = Q(id__in=self.dirty)
+        if stamp != self.stamp:
+            if self.stamp['last_updated'] is None:
+                return False
+            changed |= Q(updated_at__gte=self.stamp['last_updated'])
+        elif not self.dirty:
+            return True
+
+        recipe_ids, self.dirty = self.dirty, set()
+        for recipe_id in recipe_ids:
+            self.__remove(recipe_id)
+        self.__load(Recipe.objects.filter(changed, user_id=self.user_id))
+        self.stamp = stamp
+        return len(self.titles) == stamp['count']
+
+    def __load(self, recipes) -> None:
+        for recipe_id, title in recipes.values_list('id', 'title'):
+            self.__remove(recipe_id)
+            self.titles[recipe_id] = title
+            self.items[recipe_id] = []
+
+        for recipe_id, ingredient_id, name, density, quantity, unit in RecipeItem.objects.filter(
+            recipe__in=recipes
+        ).values_list('recipe_id', 'ingredient_id', 'ingredient__name', 'ingredient__density', 'quantity', 'unit'):
+            self.items[recipe_id].append((ingredient_id, name, density, quantity, unit))
+            self.by_ingredient[ingredient_id].add(recipe_id)
+
+    def __remove(self, recipe_id: int) -> None:
+        self.titles.pop(recipe_id, None)
+        for ingredient_id, *_ in self.items.pop(recipe_id, []):
+            recipe_ids = self.by_ingredient[ingredient_id]
+            recipe_ids.discard(recipe_id)
+            if not recipe_ids:
+                del self.by_ingredient[ingredient_id]
+
+class RecipeMatchService:
+    """
+    Ranks a user's recipes by how much of each can be made from their pantry
+
+    Each user's recipes are kept in a per-process RecipeMatchIndex. Recipe and
+    RecipeItem signals (see recipe.apps) mark changed recipes so only those
+    are reloaded. Every call also compares the count and latest updated_at of
+    the user's recipes with the index's, so changes made by other processes
+    are picked up too, and whole indexes are rebuilt after TTL seconds. The
+    pantry is read fresh on every call with a single query, so it is never
+    stale, and only recipes sharing an ingredient with the pantry are scored.
+    """
+    TTL = 600
+
+    __lock = threading.Lock()
+    __indexes = {}
+
+    @staticmethod
+    def cookable(user_id: int, min_score: float = 0.0, limit: Optional[int] = 20) -> List[Dict]:
+        """
+        Rank the user's recipes by pantry coverage
+
+        Each recipe item counts for the share of it that is on hand: nothing if
+        the pantry doesn't have it or it's out of stock, half if stock is low,
+        and scaled down further when pantry and recipe quantities can be
+        compared (after unit conversion) and the pantry has less than needed.
+
+        Args:
+            user_id: The ID of the user
+            min_score: Only return recipes scoring above this, between 0 and 1
+            limit: Maximum number of recipes to return
+
+        Returns:
+            Recipes, best first, with their score and the items still missing
+        """
+        pantry = defaultdict(list)
+        for ingredient_id, quantity, unit, stock_level in PantryItem.objects.filter(
+            user_id=user_id
+        ).values_list('ingredient_id', 'quantity', 'unit', 'stock_level'):
+            pantry[ingredient_id].append((quantity, unit, stock_level))
+
+        index = RecipeMatchService.__index(user_id)
+        with index.lock:
+            candidates = set()
+            for ingredient_id in pantry:
+                candidates.update(index.by_ingredient.get(ingredient_id, ()))
+            recipes = [(recipe_id, index.titles[recipe_id], index.items[recipe_id]) for recipe_id in candidates]
+
+        matches = []
+        for recipe_id, title, items in recipes:
+            covered = Decimal(0)
+            missing = []
+            for ingredient_id, name, density, quantity, unit in items:
+                coverage = RecipeMatchService.__coverage(pantry.get(ingredient_id, ()), name, density, quantity, unit)
+                covered += coverage
+                if coverage < 1:
+                    missing.append({
+                        "ingredient_id": ingredient_id,
+                        "name": name,
+                        "quantity": float(quantity),
+                        "unit": unit,
+                        "coverage": float(coverage)
+                    })
+
+            score = covered / len(items)
+            if score > min_score:
+                matches.append({
+                    "recipe_id": recipe_id,
+                    "title": title,
+                    "score": float(score),
+                    "matched": len(items) - len(missing),
+                    "total": len(items),
+                    "missing": missing
+                })
+
+        matches.sort(key=lambda match: (-match["score"], len(match["missing"]), match["title"]))
+        return matches[:limit] if limit else matches
+
+    @staticmethod
+    def recipe_changed(recipe_id: int, user_id: Optional[int] = None) -> None:
+        """
+        Mark a recipe for reindexing, looking up its owner among the loaded indexes if not given
+        """
+        with RecipeMatchService.__lock:
+            if user_id is None:
+                user_id = next(
+                    (index.user_id for index in RecipeMatchService.__indexes.values() if recipe_id in index.titles),
+                    None
+                )
+            index = RecipeMatchService.__indexes.get(user_id)
+        if index is not None:
+            with index.lock:
+                index.dirty.add(recipe_id)
+
+    @staticmethod
+    def invalidate(user_ids: Optional[Iterable[int]] = None) -> None:
+        """
+        Drop the indexes of the given users, or of everyone, e.g. after bulk updates that skip signals
+        """
+        with RecipeMatchService.__lock:
+            if user_ids is None:
+                RecipeMatchService.__indexes.clear()
+            else:
+                for user_id in user_ids:
+                    RecipeMatchService.__indexes.pop(user_id, None)
+
+    @staticmethod
+    def __index(user_id: int) -> RecipeMatchIndex:
+        """
+        Helper method to get the user's index, brought up to date with their recipes
+
+        Indexes are loaded without holding the service lock, so a slow load
+        only holds up calls for the same user.
+        """
+        stamp = Recipe.objects.filter(user_id=user_id).aggregate(count=Count('id'), last_updated=Max('updated_at'))
+        with RecipeMatchService.__lock:
+            index = RecipeMatchService.__indexes.get(user_id)
+
+        if index is not None and time.monotonic() - index.loaded_at <= RecipeMatchService.TTL:
+            with index.lock:
+                if index.refresh(stamp):
+                    return index
+
+        index = RecipeMatchIndex(user_id, stamp)
+        with RecipeMatchService.__lock:
+            RecipeMatchService.__indexes[user_id] = index
+        return index
+
+    @staticmethod
+    def __coverage(pantry_items, name: str, density: Optional[float], quantity: Decimal, unit: Optional[str]) -> Decimal:
+        """
+        Helper method to work out the share of a recipe item the pantry covers
+        """
+        weight = Decimal(0)
+        on_hand = Decimal(0)
+        comparable = bool(quantity)
+        for pantry_quantity, pantry_unit, stock_level in pantry_items:
+            weight = max(weight, STOCK_LEVEL_WEIGHTS.get(stock_level, Decimal(0)))
+            if stock_level == 'out':
+                continue
+            converted = None
+            if pantry_quantity is not None:
+                converted = try_convert_units(pantry_quantity, pantry_unit, unit, name, density)
+            if converted is None:
+                comparable = False
+            else:
+                on_hand += converted
+
+        if weight == 0 or not comparable:
+            return weight
+        return weight * min(Decimal(1), on_hand / quantity)
@@ -1,38 +1,54 @@
 import logging
 import re
 import time
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Union
 from urllib.parse import urlparse
 
-import requests
 from bs4 import BeautifulSoup
 from django.conf import settings
-from ratelimit import limits, sleep_and_retry
-from recipe_scrapers import scrape_me, SCRAPERS
+from django.db import transaction
+from recipe_scrapers import scrape_html, SCRAPERS
 
 from ingredient.models import Ingredient
 from ingredient.services import IngredientService
+from measurement.services.unit_registry import UnitRegistry
 from ..models import Recipe, RecipeItem, RecipeStep
+from .page_fetcher import FetchedPage, PageFetcherService
+from .query_plan import RecipeQueryPlan
+from .scan_result import ScanResultService
 
 logger = logging.getLogger(__name__)
 
-# Rate limiting configuration
-CALLS_PER_MINUTE = 10
-ONE_MINUTE = 60
+class ScanProgress(dict):
+    """
+    The progress dict returned with scan results, which also reports every
+    stage to an optional callback so background scan jobs can expose it
+    """
+
+    def __init__(self, on_change: Optional[Callable[[Dict], None]] = None):
+        super().__init__(status="processing", progress=0, message="Starting URL processing...")
+        self.on_change = on_change
+
+    def advance(self, percent: int, message: str, status: Optional[str] = None) -> None:
+        self["progress"] = percent
+        self["message"] = message
+        if status:
+            self["status"] = status
+        if self.on_change:
+            self.on_change(dict(self))
 
 class RecipeScannerService:
     """Service for scanning and extracting recipe data from URLs"""
 
     @staticmethod
-    @sleep_and_retry
-    @limits(calls=CALLS_PER_MINUTE, period=ONE_MINUTE)
-    def scan_url(url: str, user_id: int) -> Dict:
+    def scan_url(url: str, user_id: int, on_progress: Optional[Callable[[Dict], None]] = None) -> Dict:
         """
         Scan a URL for recipe data using a hybrid approach
 
         Args:
             url: The URL to scan
             user_id: The ID of the user making the request
+            on_progress: Called with a copy of the progress dict at every stage
 
         Returns:
             Dict containing the extracted recipe data and progress updates
@@ -40,11 +56,7 @@ class RecipeScannerService:
         logger.info(f"Scanning URL: {url}")
 
         # Initialize progress tracking
-        progress = {
-            "status": "processing",
-            "progress": 0,
-            "message": "Starting URL processing..."
-        }
+        progress = ScanProgress(on_progress)
 
         # Validate URL
         parsed_url = urlparse(url)
@@ -54,31 +66,48 @@ class RecipeScannerService:
         # Try specialized recipe scraper first
         try:
             # Update progress - 20%
-            progress["progress"] = 20
-            progress["message"] = "Analyzing website content..."
+            progress.advance(20, "Analyzing website content...")
+
+            # Fetched once, through the page cache, for whichever scraper ends up parsing it
+            page = PageFetcherService.fetch(url)
+
+            # Reuse the recipe if this version of the page has been scanned before
+            recipe_data = ScanResultService.get(url, page.content)
+            if recipe_data is not None:
+                logger.info(f"Using stored scan result for {url}")
+                progress.advance(100, "Recipe processing complete!", status="complete")
+                recipe_data["progress"] = progress
+                return recipe_data
 
             domain = parsed_url.netloc.lower()
             if any(scraper.lower() in domain for scraper in SCRAPERS.keys()):
                 logger.info(f"Using specialized scraper for {domain}")
-                return RecipeScannerService._use_specialized_scraper(url, progress)
+                recipe_data = RecipeScannerService._use_specialized_scraper(url, page, progress)
             else:
                 logger.info(f"No specialized scraper for {domain}, using fallback method")
-                return RecipeScannerService._use_fallback_scraper(url, progress)
+                recipe_data = RecipeScannerService._use_fallback_scraper(url, page, progress)
+
+            try:
+                # In a savepoint, so a failed store can't break an enclosing transaction
+                with transaction.atomic():
+                    ScanResultService.store(url, page.content, recipe_data)
+            except Exception as e:
+                # The store only saves parsing next time; the scan itself succeeded
+                logger.warning(f"Could not store scan result for {url}: {str(e)}")
+            return recipe_data
         except Exception as e:
             logger.error(f"Error scanning URL: {str(e)}")
-            progress["status"] = "error"
-            progress["message"] = f"Error: {str(e)}"
+            progress.advance(progress["progress"], f"Error: {str(e)}", status="error")
             raise ValueError(f"Failed to extract recipe data: {str(e)}")
 
     @staticmethod
-    def _use_specialized_scraper(url: str, progress: Dict) -> Dict:
+    def _use_specialized_scraper(url: str, page: FetchedPage, progress: ScanProgress) -> Dict:
         """Use the recipe-scrapers library for supported sites"""
         try:
             # Update progress - 40%
-            progress["progress"] = 40
-            progress["message"] = "Recognized recipe website, extracting data..."
+            progress.advance(40, "Recognized recipe website, extracting data...")
 
-            scraper = scrape_me(url)
+            scraper = scrape_html(page.text, org_url=url)
 
             # Extract basic recipe data
             recipe_data = {
@@ -126,36 +155,24 @@ class RecipeScannerService:
                 logger.warning(f"Error extracting instructions: {str(e)}")
 
             # Update progress - 100%
-            progress["progress"] = 100
-            progress["message"] = "Recipe processing complete!"
-            progress["status"] = "complete"
+            progress.advance(100, "Recipe processing complete!", status="complete")
 
             return recipe_data
         except Exception as e:
             logger.warning(f"Specialized scraper failed: {str(e)}, falling back to general scraper")
-            progress["progress"] = 30
-            progress["message"] = "Specialized scraper failed, trying alternative method..."
-            return RecipeScannerService._use_fallback_scraper(url, progress)
+            progress.advance(30, "Specialized scraper failed, trying alternative method...")
+            return RecipeScannerService._use_fallback_scraper(url, page, progress)
 
     @staticmethod
-    def _use_fallback_scraper(url: str, progress: Dict) -> Dict:
+    def _use_fallback_scraper(url: str, page: FetchedPage, progress: ScanProgress) -> Dict:
         """Fallback method using BeautifulSoup for unsupported sites"""
         # Update progress - 40%
-        progress["progress"] = 40
-        progress["message"] = "Analyzing webpage content..."
-
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
+        progress.advance(40, "Analyzing webpage content...")
 
         # Update progress - 60%
-        progress["progress"] = 60
-        progress["message"] = "Extracting recipe content..."
+        progress.advance(60, "Extracting recipe content...")
 
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(page.content, 'html.parser')
 
         # Initialize recipe data
         recipe_data = {
@@ -170,9 +187,7 @@ class RecipeScannerService:
         }
 
         # Update progress - 100%
-        progress["progress"] = 100
-        progress["message"] = "Recipe processing complete!"
-        progress["status"] = "complete"
+        progress.advance(100, "Recipe processing complete!", status="complete")
 
         return recipe_data
 
@@ -412,23 +427,14 @@ class RecipeScannerService:
                 pass
 
         # Try to extract unit
-        common_units = ['cup', 'cups', 'tablespoon', 'tablespoons', 'tbsp', 'teaspoon', 'teaspoons', 'tsp',
-                        'ounce', 'ounces', 'oz', 'pound', 'pounds', 'lb', 'gram', 'grams', 'g',
-                        'kilogram', 'kilograms', 'kg', 'milliliter', 'milliliters', 'ml', 'liter', 'liters', 'l']
-
-        for unit in common_units:
-            unit_pattern = r'\b' + unit + r'\b'
-            unit_match = re.search(unit_pattern, ingredient_data["name"].lower())
-            if unit_match:
-                ingredient_data["unit"] = unit
-                # Remove unit from name and clean up
-                name_parts = re.split(unit_pattern, ingredient_data["name"], flags=re.IGNORECASE, maxsplit=1)
-                if len(name_parts) > 1:
-                    ingredient_data["name"] = name_parts[1].strip()
-                    # Check for "of" after unit
-                    if ingredient_data["name"].lower().startswith('of '):
-                        ingredient_data["name"] = ingredient_data["name"][3:].strip()
-                break
+        unit_match = UnitRegistry.current().find_unit(ingredient_data["name"])
+        if unit_match:
+            ingredient_data["unit"] = unit_match.group(0).lower()
+            # Remove unit from name and clean up
+            ingredient_data["name"] = ingredient_data["name"][unit_match.end():].strip()
+            # Check for "of" after unit
+            if ingredient_data["name"].lower().startswith('of '):
+                ingredient_data["name"] = ingredient_data["name"][3:].strip()
 
         # Check for notes in parentheses
         notes_match = re.search(r'\((.*?)\)', ingredient_data["name"])
@@ -470,47 +476,53 @@ class RecipeScannerService:
         Returns:
             Dict containing the created recipe data
         """
-        # Create the recipe
-        recipe = Recipe.objects.create(
-            title=scan_data.get('title', 'Untitled Recipe'),
-            description=scan_data.get('description', ''),
-            prep_time=scan_data.get('prep_time'),
-            cook_time=scan_data.get('cook_time'),
-            servings=scan_data.get('servings'),
-            user_id=user_id
-        )
-
-        # Create recipe items (ingredients)
-        for ingredient_data in scan_data.get('ingredients', []):
-            # Try to find or create the ingredient
-            ingredient_name = ingredient_data.get('name', '').strip()
-            if not ingredient_name:
-                continue
-
-            # Find or create ingredient
-            ingredient = IngredientService.find_or_create_ingredient(
-                name=ingredient_name,
+        with transaction.atomic():
+            # Create the recipe
+            recipe = Recipe.objects.create(
+                title=scan_data.get('title', 'Untitled Recipe'),
+                description=scan_data.get('description', ''),
+                prep_time=scan_data.get('prep_time'),
+                cook_time=scan_data.get('cook_time'),
+                servings=scan_data.get('servings'),
                 user_id=user_id
             )
 
-            # Create recipe item
-            RecipeItem.objects.create(
-                recipe=recipe,
-                ingredient=ingredient,
-                quantity=ingredient_data.get('quantity', 1),
-                unit=ingredient_data.get('unit'),
-                notes=ingredient_data.get('notes')
+            # Resolve every ingredient name in one pass
+            ingredient_lines = [
+                ingredient_data for ingredient_data in scan_data.get('ingredients', [])
+                if ingredient_data.get('name', '').strip()
+            ]
+            ingredients = IngredientService.find_or_create_ingredients(
+                ingredient_data['name'] for ingredient_data in ingredient_lines
             )
 
-        # Create recipe steps
-        for step_data in scan_data.get('steps', []):
-            RecipeStep.objects.create(
-                recipe=recipe,
-                step_number=step_data.get('step_number', 1),
-                description=step_data.get('description', '')
-            )
+            # Create recipe items (ingredients)
+            RecipeItem.objects.bulk_create([
+                RecipeItem(
+                    recipe=recipe,
+                    ingredient=ingredients[ingredient_data['name'].strip().lower()],
+                    quantity=ingredient_data.get('quantity', 1),
+                    unit=ingredient_data.get('unit'),
+                    notes=ingredient_data.get('notes')
+                )
+                for ingredient_data in ingredient_lines
+            ])
+
+            # Create recipe steps, renumbering them if the scan repeated a step number
+            steps_data = scan_data.get('steps', [])
+            step_numbers = [step_data.get('step_number', 1) for step_data in steps_data]
+            if len(set(step_numbers)) != len(step_numbers):
+                step_numbers = range(1, len(steps_data) + 1)
+            RecipeStep.objects.bulk_create([
+                RecipeStep(
+                    recipe=recipe,
+                    step_number=step_number,
+                    description=step_data.get('description', '')
+                )
+                for step_number, step_data in zip(step_numbers, steps_data)
+            ])
 
         # Return the created recipe data
         from ..serializers import RecipeSerializer
-        serializer = RecipeSerializer(recipe)
+        serializer = RecipeSerializer(RecipeQueryPlan.recipes(Recipe.objects.filter(id=recipe.id)).first())
         return serializer.data
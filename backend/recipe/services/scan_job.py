@@ -0,0 +1,274 @@
+import logging
+import time
+from datetime import timedelta
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from django.db import DatabaseError
+from django.db.models import F, Q
+from django.utils import timezone
+
+from common.rate_limit import RateLimiter
+from ..models import ScanJob
+from .page_fetcher import PageFetcherService
+from .recipe_scanner import RecipeScannerService
+from .scan_result import ScanResultService
+
+logger = logging.getLogger(__name__)
+
+# A running job whose worker hasn't reported progress in this long is assumed lost and queued again
+STALE_JOB_TIMEOUT = timedelta(minutes=10)
+# Claims before a job that keeps failing or getting lost is given up on
+MAX_JOB_ATTEMPTS = 3
+# How long a job whose run failed unexpectedly waits before it's retried
+RETRY_DELAY = timedelta(seconds=30)
+# Seconds between a worker's housekeeping runs, so lost jobs are picked up by the other
+# workers and the caches and rate limit buckets stay bounded however long it runs
+HOUSEKEEPING_INTERVAL = 60
+# Finished jobs are kept this long so clients can still fetch the result
+FINISHED_JOB_RETENTION = timedelta(days=7)
+# Queued jobs looked at per claim attempt, in case other workers take the first ones
+CLAIM_CANDIDATES = 10
+# Scans a user may queue: a burst of 10, refilling over a minute
+USER_SCAN_LIMIT = (10, 60)
+# Fetches from one site: a burst of 5, refilling over a minute, so a slow site only delays its own scans
+DOMAIN_SCAN_LIMIT = (5, 60)
+
+class ScanJobService:
+    """
+    Queue of recipe URL scans run by `manage.py run_scan_worker` processes
+
+    Jobs live in the database, so any number of workers can share them:
+    a worker claims a job with a conditional UPDATE from queued to running,
+    which only one of them can win. Running jobs record a heartbeat with each
+    progress stage, and jobs are retried up to MAX_JOB_ATTEMPTS times.
+    """
+
+    @staticmethod
+    def enqueue(url: str, user_id: Optional[int]) -> Dict:
+        """
+        Queue a URL for scanning
+
+        Args:
+            url: The recipe URL
+            user_id: The ID of the user requesting the scan
+
+        Returns:
+            Dict with the job's ID, status and progress
+
+        Raises:
+            RateLimited: If the user has queued too many scans recently
+        """
+        parsed_url = urlparse(url)
+        if parsed_url.scheme not in ('http', 'https') or not parsed_url.netloc:
+            raise ValueError("Invalid URL provided")
+
+        RateLimiter.check(
+            f"scan-user:{user_id or 'anonymous'}", *USER_SCAN_LIMIT,
+            message="Too many recipe scans, please wait a moment and try again"
+        )
+
+        job = ScanJob.objects.create(
+            url=url,
+            user_id=user_id,
+            progress={"status": "queued", "progress": 0, "message": "Waiting to start scanning..."}
+        )
+        logger.info(f"Queued scan job {job.id} for {url}")
+        return ScanJobService.__serialize(job)
+
+    @staticmethod
+    def get(id: int, user_id: Optional[int]) -> Optional[Dict]:
+        """
+        Get a job of the user, with the scanned recipe once it's complete
+        """
+        job = ScanJob.objects.filter(id=id, user_id=user_id).first()
+        return ScanJobService.__serialize(job) if job else None
+
+    @staticmethod
+    def claim_next() -> Optional[ScanJob]:
+        """
+        Take the oldest queued job that isn't deferred and mark it running, or return None if there is none
+        """
+        candidates = ScanJob.objects.filter(
+            Q(run_after__isnull=True) | Q(run_after__lte=timezone.now()), status='queued'
+        ).order_by('created_at', 'id').values_list('id', flat=True)
+        for job_id in candidates[:CLAIM_CANDIDATES]:
+            now = timezone.now()
+            if ScanJob.objects.filter(id=job_id, status='queued').update(
+                status='running', started_at=now, heartbeat_at=now, attempts=F('attempts') + 1
+            ):
+                return ScanJob.objects.get(id=job_id)
+        return None
+
+    @staticmethod
+    def run(job: ScanJob) -> bool:
+        """
+        Scan a claimed job's URL, saving each progress stage as it happens and then the result
+
+        Returns:
+            False if the job's site is rate limited and the job was deferred instead
+        """
+        domain = urlparse(job.url).hostname or ''
+        wait = RateLimiter.acquire(f"scan-domain:{domain}", *DOMAIN_SCAN_LIMIT)
+        if wait:
+            ScanJobService.__defer(job, wait, f"Waiting to fetch from {domain}...")
+            return False
+
+        def save_progress(progress: Dict) -> None:
+            ScanJob.objects.filter(id=job.id).update(progress=progress, heartbeat_at=timezone.now())
+
+        try:
+            result = RecipeScannerService.scan_url(url=job.url, user_id=job.user_id, on_progress=save_progress)
+        except Exception as e:
+            logger.error(f"Scan job {job.id} failed: {str(e)}")
+            job.status = 'error'
+            job.error = str(e) if isinstance(e, ValueError) else "Failed to scan recipe URL"
+            job.refresh_from_db(fields=['progress'])
+            job.progress = {**job.progress, "status": "error", "message": f"Error: {job.error}"}
+        else:
+            job.status = 'complete'
+            job.progress = result.pop('progress', None) or {
+                "status": "complete", "progress": 100, "message": "Recipe processing complete!"
+            }
+            job.result = result
+
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'progress', 'result', 'error', 'finished_at'])
+        return True
+
+    @staticmethod
+    def requeue_stale(timeout: timedelta = STALE_JOB_TIMEOUT) -> int:
+        """
+        Put running jobs whose worker seems to have died back in the queue,
+        failing those that have already used up their attempts
+
+        Returns:
+            The number of jobs requeued
+        """
+        cutoff = timezone.now() - timeout
+        stale = ScanJob.objects.filter(
+            Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff), status='running'
+        )
+        stale.filter(attempts__gte=MAX_JOB_ATTEMPTS).update(
+            status='error', error="Failed to scan recipe URL", finished_at=timezone.now()
+        )
+        return stale.update(status='queued', started_at=None, heartbeat_at=None)
+
+    @staticmethod
+    def purge_finished(retention: timedelta = FINISHED_JOB_RETENTION) -> int:
+        """
+        Delete finished jobs older than the retention period
+        """
+        deleted, _ = ScanJob.objects.filter(
+            status__in=['complete', 'error'], finished_at__lt=timezone.now() - retention
+        ).delete()
+        return deleted
+
+    @staticmethod
+    def housekeep() -> Dict[str, int]:
+        """
+        Requeue stale jobs and clear out what scanning accumulates: finished
+        jobs, idle rate limit buckets, cached pages and unused scan results
+
+        Returns:
+            Dict with the number of items each step requeued or deleted
+        """
+        return {
+            "requeued": ScanJobService.requeue_stale(),
+            "purged_jobs": ScanJobService.purge_finished(),
+            "purged_buckets": RateLimiter.purge_idle(),
+            "purged_pages": PageFetcherService.purge(),
+            "evicted_results": ScanResultService.evict(),
+        }
+
+    @staticmethod
+    def work(poll_interval: float = 1.0, once: bool = False, should_stop: Callable[[], bool] = lambda: False) -> int:
+        """
+        Run queued jobs until should_stop returns True, or until the queue is empty if once is set
+
+        housekeep() runs every HOUSEKEEPING_INTERVAL seconds along the way.
+
+        Returns:
+            The number of jobs run, not counting deferred ones
+        """
+        count = 0
+        next_housekeeping = time.monotonic() + HOUSEKEEPING_INTERVAL
+        while not should_stop():
+            if time.monotonic() >= next_housekeeping:
+                try:
+                    logger.info(f"Scan worker housekeeping: {ScanJobService.housekeep()}")
+                except Exception as e:
+                    logger.warning(f"Scan worker housekeeping failed: {str(e)}")
+                next_housekeeping = time.monotonic() + HOUSEKEEPING_INTERVAL
+
+            try:
+                job = ScanJobService.claim_next()
+            except DatabaseError as e:
+                # e.g. SQLite "database is locked" while another worker writes
+                logger.warning(f"Could not claim a scan job: {str(e)}")
+                time.sleep(poll_interval)
+                continue
+
+            if job is None:
+                if once:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            try:
+                if ScanJobService.run(job):
+                    count += 1
+            except Exception as e:
+                logger.exception(f"Scan job {job.id} failed unexpectedly: {str(e)}")
+                ScanJobService.__retry_later(job)
+        return count
+
+    @staticmethod
+    def __defer(job: ScanJob, seconds: float, message: str) -> None:
+        """
+        Helper method to put a claimed job back in the queue until a rate limit allows it
+        """
+        logger.info(f"Deferring scan job {job.id} for {seconds:.1f}s")
+        job.status = 'queued'
+        job.started_at = None
+        job.heartbeat_at = None
+        job.run_after = timezone.now() + timedelta(seconds=seconds)
+        job.progress = {"status": "queued", "progress": 0, "message": message}
+        # Waiting on a rate limit doesn't use up an attempt
+        job.attempts = F('attempts') - 1
+        job.save(update_fields=['status', 'started_at', 'heartbeat_at', 'run_after', 'progress', 'attempts'])
+
+    @staticmethod
+    def __retry_later(job: ScanJob) -> None:
+        """
+        Helper method to queue a job whose run raised again after RETRY_DELAY,
+        or fail it once it has used up its attempts
+        """
+        if job.attempts >= MAX_JOB_ATTEMPTS:
+            changes = {'status': 'error', 'error': "Failed to scan recipe URL", 'finished_at': timezone.now()}
+        else:
+            changes = {'status': 'queued', 'started_at': None, 'heartbeat_at': None, 'run_after': timezone.now() + RETRY_DELAY}
+        try:
+            ScanJob.objects.filter(id=job.id, status='running').update(**changes)
+        except DatabaseError as e:
+            # Left running, so the stale job sweep picks it up
+            logger.warning(f"Could not release scan job {job.id}: {str(e)}")
+
+    @staticmethod
+    def __serialize(job: ScanJob) -> Dict:
+        """
+        Helper method to turn a job into its API representation
+        """
+        data = {
+            "id": job.id,
+            "url": job.url,
+            "status": job.status,
+            "progress": job.progress,
+            "created_at": job.created_at.isoformat(),
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None
+        }
+        if job.status == 'complete':
+            data["result"] = job.result
+        elif job.status == 'error':
+            data["error"] = job.error
+        return data
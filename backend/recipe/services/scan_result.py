@@ -0,0 +1,107 @@
+import hashlib
+import json
+import logging
+from datetime import timedelta
+from typing import Dict, Optional
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from ..models import ScanResult
+from .page_fetcher import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# Results not used in this long are evicted
+MAX_RESULT_AGE = timedelta(days=30)
+# Once the stored results pass either limit, the least recently used are evicted
+MAX_RESULTS = 5000
+MAX_RESULTS_SIZE = 50 * 1024 * 1024
+# Results deleted per query when evicting
+EVICT_BATCH_SIZE = 500
+
+class ScanResultService:
+    """
+    Store of scanned recipes keyed by normalized URL and page content hash,
+    so scanning an unchanged page again skips parsing it
+    """
+
+    @staticmethod
+    def get(url: str, content: bytes) -> Optional[Dict]:
+        """
+        Get the recipe scanned from this URL when its page had this content
+
+        Args:
+            url: The scanned URL
+            content: The page body
+
+        Returns:
+            The recipe data, or None if this version of the page hasn't been scanned
+        """
+        stored = ScanResult.objects.filter(
+            url=normalize_url(url), content_hash=ScanResultService.__hash(content)
+        ).only('id', 'result').first()
+        if stored is None:
+            return None
+        ScanResult.objects.filter(id=stored.id).update(last_used_at=timezone.now())
+        return stored.result
+
+    @staticmethod
+    def store(url: str, content: bytes, result: Dict) -> None:
+        """
+        Store the recipe scanned from a page, replacing any from older versions of it
+
+        Args:
+            url: The scanned URL
+            content: The page body
+            result: The recipe data; its progress is not stored
+        """
+        result = {key: value for key, value in result.items() if key != 'progress'}
+        key = normalize_url(url)
+        with transaction.atomic():
+            ScanResult.objects.filter(url=key).delete()
+            ScanResult.objects.create(
+                url=key,
+                content_hash=ScanResultService.__hash(content),
+                result=result,
+                size=len(json.dumps(result))
+            )
+        ScanResultService.evict()
+
+    @staticmethod
+    def evict(max_age: timedelta = MAX_RESULT_AGE, max_results: int = MAX_RESULTS, max_size: int = MAX_RESULTS_SIZE) -> int:
+        """
+        Delete results unused for max_age, then the least recently used until
+        there are at most max_results totalling at most max_size
+
+        Returns:
+            The number of results deleted
+        """
+        deleted, _ = ScanResult.objects.filter(last_used_at__lt=timezone.now() - max_age).delete()
+
+        totals = ScanResult.objects.aggregate(count=Count('id'), size=Sum('size'))
+        count, size = totals['count'], totals['size'] or 0
+        if count <= max_results and size <= max_size:
+            return deleted
+
+        evicted = []
+        for id, result_size in ScanResult.objects.order_by('last_used_at', 'id').values_list('id', 'size').iterator():
+            if count <= max_results and size <= max_size:
+                break
+            evicted.append(id)
+            count -= 1
+            size -= result_size
+        evicted_count = 0
+        for start in range(0, len(evicted), EVICT_BATCH_SIZE):
+            batch_deleted, _ = ScanResult.objects.filter(id__in=evicted[start:start + EVICT_BATCH_SIZE]).delete()
+            evicted_count += batch_deleted
+        logger.info(f"Evicted {evicted_count} scan results over the store limits")
+        return deleted + evicted_count
+
+    @staticmethod
+    def __hash(content: bytes) -> str:
+        """
+        Helper method to hash a page body
+        """
+        return hashlib.sha256(content).hexdigest()
@@ -0,0 +1,79 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from ingredient.models import Ingredient
+from pantry.models import PantryItem
+from ...models import Recipe, RecipeItem
+from ...services import RecipeMatchService
+
+User = get_user_model()
+
+class RecipeAPITests(TestCase):
+    def setUp(self):
+        # Recipe IDs are reused between tests, so start from an empty match index
+        RecipeMatchService.invalidate()
+
+        # Create a test user
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpassword'
+        )
+
+        # Create a test client
+        self.client = APIClient()
+
+        # Get token
+        refresh = RefreshToken.for_user(self.user)
+        access_token = str(refresh.access_token)
+
+        # Add token to client
+        self.client.credentials(HTTP_AUTHORIZATION=f'JWT {access_token}')
+
+        self.recipe = Recipe.objects.create(title='Pancakes', user=self.user, servings=4)
+        RecipeItem.objects.create(
+            recipe=self.recipe, ingredient=Ingredient.objects.create(name='Flour'), quantity=500, unit='g'
+        )
+
+    def test_scale(self):
+        """Test scaling a recipe by servings"""
+        response = self.client.get(f'/api/recipes/{self.recipe.id}/scale/?servings=12')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['servings'], 12)
+        self.assertEqual(data['original_servings'], 4)
+        self.assertEqual(data['items'][0]['quantity'], 1.5)
+        self.assertEqual(data['items'][0]['unit'], 'kg')
+
+    def test_scale_invalid_servings(self):
+        """Test scaling without a valid servings count is rejected"""
+        self.assertEqual(self.client.get(f'/api/recipes/{self.recipe.id}/scale/').status_code, 400)
+        self.assertEqual(self.client.get(f'/api/recipes/{self.recipe.id}/scale/?servings=-1').status_code, 400)
+
+    def test_scale_other_users_recipe(self):
+        """Test another user's recipe can't be scaled"""
+        other_user = User.objects.create_user(username='other', password='password')
+        recipe = Recipe.objects.create(title='Secret', user=other_user, servings=2)
+
+        response = self.client.get(f'/api/recipes/{recipe.id}/scale/?servings=4')
+        self.assertEqual(response.status_code, 404)
+
+    def test_cookable(self):
+        """Test listing recipes that can be made from the pantry"""
+        PantryItem.objects.create(user=self.user, ingredient=self.recipe.items.get().ingredient, quantity=1, unit='kg')
+
+        response = self.client.get('/api/recipes/cookable/?min_score=0.5')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]['recipe_id'], self.recipe.id)
+        self.assertEqual(data[0]['score'], 1.0)
+
+    def test_cookable_invalid_params(self):
+        """Test invalid cookable parameters are rejected"""
+        self.assertEqual(self.client.get('/api/recipes/cookable/?limit=abc').status_code, 400)
+        self.assertEqual(self.client.get('/api/recipes/cookable/?min_score=2').status_code, 400)
@@ -0,0 +1,77 @@
+import json
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from grocery_list.models import GroceryList, GroceryListItem
+from ingredient.models import Ingredient
+from ...models import Recipe, RecipeItem
+
+User = get_user_model()
+
+class RecipeItemAPITests(TestCase):
+    def setUp(self):
+        # Create a test user
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpassword'
+        )
+
+        # Create a test client
+        self.client = APIClient()
+
+        # Get token
+        refresh = RefreshToken.for_user(self.user)
+        access_token = str(refresh.access_token)
+
+        # Add token to client
+        self.client.credentials(HTTP_AUTHORIZATION=f'JWT {access_token}')
+
+        self.meal_plan_url = '/api/recipes/meal-plan/add-to-grocery-list/'
+
+    def test_meal_plan_endpoint(self):
+        """Test adding several recipes to a new grocery list"""
+        rice = Ingredient.objects.create(name='Rice')
+        recipes = []
+        for title in ['Risotto', 'Fried rice']:
+            recipe = Recipe.objects.create(title=title, user=self.user)
+            RecipeItem.objects.create(recipe=recipe, ingredient=rice, quantity=1, unit='cup')
+            recipes.append(recipe)
+
+        response = self.client.post(
+            self.meal_plan_url,
+            data=json.dumps({
+                'recipes': [{'recipe_id': recipes[0].id, 'multiplier': 2}, {'recipe_id': recipes[1].id}],
+                'title': 'Rice week'
+            }),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        item = GroceryListItem.objects.get(grocery_list_id=data['grocery_list_id'])
+        self.assertEqual(float(item.quantity), 3)
+        self.assertEqual(item.unit, 'cup')
+
+    def test_meal_plan_endpoint_requires_recipes(self):
+        """Test the meal plan endpoint rejects a body without recipes"""
+        response = self.client.post(self.meal_plan_url, data=json.dumps({}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_meal_plan_endpoint_invalid_entries(self):
+        """Test the meal plan endpoint rejects bad multipliers and recipes that aren't the user's"""
+        recipe = Recipe.objects.create(title='Risotto', user=self.user)
+        for recipes in [
+            [{'recipe_id': recipe.id, 'multiplier': 0}],
+            [{'recipe_id': recipe.id, 'multiplier': 'two'}],
+            [{'recipe_id': recipe.id}, {'recipe_id': recipe.id + 1000}],
+        ]:
+            with self.subTest(recipes=recipes):
+                response = self.client.post(
+                    self.meal_plan_url, data=json.dumps({'recipes': recipes}), content_type='application/json'
+                )
+                self.assertEqual(response.status_code, 400)
+        self.assertIn(str(recipe.id + 1000), response.json()['message'])
+        self.assertEqual(GroceryList.objects.count(), 0)
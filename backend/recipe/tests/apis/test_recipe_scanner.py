@@ -1,16 +1,21 @@
 import json
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from unittest.mock import patch
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from ...models import Recipe
+from common.rate_limit import RateLimiter
+from ...models import Recipe, ScanJob
+from ...services import ScanJobService
 
 User = get_user_model()
 
+@override_settings(RATE_LIMIT_DB=':memory:')
 class RecipeScannerAPITests(TestCase):
     def setUp(self):
+        RateLimiter.reset()
+
         # Create a test user
         self.user = User.objects.create_user(
             username='testuser',
@@ -32,9 +37,61 @@ class RecipeScannerAPITests(TestCase):
         self.scan_url = '/api/recipes/scan/'
         self.create_from_scan_url = '/api/recipes/create-from-scan/'
 
-    @patch('recipe.services.RecipeScannerService.scan_url')
-    def test_scan_endpoint(self, mock_scan_url):
-        """Test the scan endpoint"""
+    def test_scan_endpoint(self):
+        """Test the scan endpoint queues a job"""
+        # Make a POST request to the scan endpoint
+        response = self.client.post(
+            self.scan_url,
+            json.dumps({'url': 'https://example.com/recipe'}),
+            content_type='application/json'
+        )
+
+        # Verify the response
+        self.assertEqual(response.status_code, 202)
+        data = json.loads(response.content)
+        self.assertEqual(data['status'], 'queued')
+        self.assertEqual(data['progress']['progress'], 0)
+
+        # Verify the job was stored for the user
+        job = ScanJob.objects.get(id=data['id'])
+        self.assertEqual(job.url, 'https://example.com/recipe')
+        self.assertEqual(job.user, self.user)
+
+    def test_scan_endpoint_invalid_url(self):
+        """Test the scan endpoint with a URL that can't be scanned"""
+        response = self.client.post(
+            self.scan_url,
+            json.dumps({'url': 'ftp://example.com/recipe'}),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ScanJob.objects.exists())
+
+    def test_scan_endpoint_rate_limited(self):
+        """Test the scan endpoint once the user has scanned too often"""
+        for i in range(10):
+            response = self.client.post(
+                self.scan_url,
+                json.dumps({'url': f'https://example.com/recipe-{i}'}),
+                content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 202)
+
+        response = self.client.post(
+            self.scan_url,
+            json.dumps({'url': 'https://example.com/recipe-10'}),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('error', json.loads(response.content))
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(ScanJob.objects.count(), 10)
+
+    @patch('recipe.services.scan_job.RecipeScannerService.scan_url')
+    def test_scan_job_endpoint(self, mock_scan_url):
+        """Test polling a scan job until its result is ready"""
         # Mock the scan_url method
         mock_scan_url.return_value = {
             'title': 'Test Recipe',
@@ -50,22 +107,38 @@ class RecipeScannerAPITests(TestCase):
             ]
         }
 
-        # Make a POST request to the scan endpoint
-        response = self.client.post(
+        job_id = json.loads(self.client.post(
             self.scan_url,
             json.dumps({'url': 'https://example.com/recipe'}),
             content_type='application/json'
-        )
+        ).content)['id']
 
-        # Verify the response
+        # Before a worker picks it up the job is still queued
+        response = self.client.get(f'{self.scan_url}{job_id}/')
         self.assertEqual(response.status_code, 200)
         data = json.loads(response.content)
-        self.assertEqual(data['title'], 'Test Recipe')
-        self.assertEqual(len(data['ingredients']), 1)
-        self.assertEqual(len(data['steps']), 1)
+        self.assertEqual(data['status'], 'queued')
+        self.assertNotIn('result', data)
 
-        # Verify the service was called with the correct arguments
-        mock_scan_url.assert_called_once_with(url='https://example.com/recipe', user_id=self.user.id)
+        # Run it like a worker would
+        ScanJobService.run(ScanJobService.claim_next())
+
+        response = self.client.get(f'{self.scan_url}{job_id}/')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['status'], 'complete')
+        self.assertEqual(data['progress']['progress'], 100)
+        self.assertEqual(data['result']['title'], 'Test Recipe')
+        self.assertEqual(len(data['result']['ingredients']), 1)
+        self.assertEqual(len(data['result']['steps']), 1)
+
+    def test_scan_job_endpoint_other_user(self):
+        """Test that a user can't see another user's scan job"""
+        other_user = User.objects.create_user(username='otheruser', password='testpassword')
+        job = ScanJob.objects.create(url='https://example.com/recipe', user=other_user)
+
+        response = self.client.get(f'{self.scan_url}{job.id}/')
+        self.assertEqual(response.status_code, 404)
 
     def test_scan_endpoint_missing_url(self):
         """Test the scan endpoint with a missing URL"""
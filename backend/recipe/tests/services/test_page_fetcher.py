@@ -0,0 +1,255 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from ...services import PageFetcherService
+from ...services.page_fetcher import ResponseTooLarge, normalize_url
+
+HTML = "<html><body>Café recipe</body></html>".encode('utf-8')
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves the responses set on the server by path, recording each request"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        self.server.requests.append({
+            'path': path,
+            'headers': dict(self.headers),
+            'client_port': self.client_address[1]
+        })
+        status, headers, body, delay = self.server.routes.get(path, (404, {}, b'Not found', 0))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if headers.get('Connection') == 'close':
+            # No length, the body ends when the connection closes
+            self.close_connection = True
+        elif 'Content-Length' not in headers:
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            if delay:
+                # Trickle the body out so reads wait between chunks
+                for i in range(0, len(body), 16):
+                    time.sleep(delay)
+                    self.wfile.write(body[i:i + 16])
+                    self.wfile.flush()
+            else:
+                self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The fetcher gave up on the response
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+class PageFetcherServiceTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.routes = {}
+        self.server.requests = []
+
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.cache_dir = cache_dir.name
+        settings_override = override_settings(SCAN_CACHE_DIR=self.cache_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def serve(self, path, body=HTML, status=200, headers=None, delay=0):
+        self.server.routes[path] = (status, headers or {'Content-Type': 'text/html; charset=utf-8'}, body, delay)
+
+    def test_normalize_url(self):
+        """Test links to the same page normalize to the same URL"""
+        self.assertEqual(
+            normalize_url('HTTPS://Example.com:443/recipe?b=2&utm_source=feed&a=1#comments'),
+            'https://example.com/recipe?a=1&b=2'
+        )
+        self.assertEqual(normalize_url('http://example.com'), 'http://example.com/')
+        self.assertEqual(normalize_url('http://example.com:8080/x'), 'http://example.com:8080/x')
+
+    def test_fetch(self):
+        """Test a page is fetched and decoded"""
+        self.serve('/recipe')
+
+        page = PageFetcherService.fetch(f'{self.base_url}/recipe')
+
+        self.assertFalse(page.from_cache)
+        self.assertEqual(page.content, HTML)
+        self.assertEqual(page.text, "<html><body>Café recipe</body></html>")
+        self.assertIn('Mozilla', self.server.requests[0]['headers']['User-Agent'])
+
+    def test_fetch_detects_encoding(self):
+        """Test the encoding is detected when the response doesn't give a charset"""
+        self.serve('/recipe', headers={'Content-Type': 'text/html'})
+
+        page = PageFetcherService.fetch(f'{self.base_url}/recipe')
+
+        self.assertEqual(page.text, "<html><body>Café recipe</body></html>")
+
+    def test_fetch_reuses_connection(self):
+        """Test fetches from the same site share a keep-alive connection"""
+        self.serve('/one', headers={'Cache-Control': 'no-store'})
+        self.serve('/two', headers={'Cache-Control': 'no-store'})
+
+        PageFetcherService.fetch(f'{self.base_url}/one')
+        PageFetcherService.fetch(f'{self.base_url}/two')
+
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.server.requests[0]['client_port'], self.server.requests[1]['client_port'])
+
+    def test_fetch_caches_page(self):
+        """Test a fresh page is served from the cache without a request"""
+        self.serve('/recipe')
+
+        PageFetcherService.fetch(f'{self.base_url}/recipe')
+        page = PageFetcherService.fetch(f'{self.base_url}/recipe?utm_medium=email')
+
+        self.assertTrue(page.from_cache)
+        self.assertEqual(page.content, HTML)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_fetch_revalidates_expired_page(self):
+        """Test an expired page is revalidated with its validators and reused on 304"""
+        self.serve('/recipe', headers={
+            'Cache-Control': 'max-age=0',
+            'ETag': '"v1"',
+            'Last-Modified': 'Wed, 01 Jan 2025 00:00:00 GMT'
+        })
+        PageFetcherService.fetch(f'{self.base_url}/recipe')
+
+        self.serve('/recipe', status=304, body=b'', headers={'ETag': '"v1"'})
+        page = PageFetcherService.fetch(f'{self.base_url}/recipe')
+
+        headers = self.server.requests[1]['headers']
+        self.assertEqual(headers['If-None-Match'], '"v1"')
+        self.assertEqual(headers['If-Modified-Since'], 'Wed, 01 Jan 2025 00:00:00 GMT')
+        self.assertTrue(page.from_cache)
+        self.assertEqual(page.content, HTML)
+
+        # The 304 has the default TTL, so the page is fresh again
+        PageFetcherService.fetch(f'{self.base_url}/recipe')
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_fetch_replaces_changed_page(self):
+        """Test a changed page replaces the cached one"""
+        self.serve('/recipe', headers={'Cache-Control': 'no-cache', 'ETag': '"v1"'})
+        PageFetcherService.fetch(f'{self.base_url}/recipe')
+
+        self.serve('/recipe', body=b"<html>new</html>", headers={'ETag': '"v2"'})
+        page = PageFetcherService.fetch(f'{self.base_url}/recipe')
+
+        self.assertFalse(page.from_cache)
+        self.assertEqual(page.content, b"<html>new</html>")
+        self.assertEqual(PageFetcherService.fetch(f'{self.base_url}/recipe').content, b"<html>new</html>")
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_fetch_no_store(self):
+        """Test pages marked no-store aren't cached"""
+        self.serve('/recipe', headers={'Cache-Control': 'private, no-store'})
+
+        PageFetcherService.fetch(f'{self.base_url}/recipe')
+        PageFetcherService.fetch(f'{self.base_url}/recipe')
+
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_fetch_error(self):
+        """Test error responses raise and aren't cached"""
+        with self.assertRaises(requests.HTTPError):
+            PageFetcherService.fetch(f'{self.base_url}/missing')
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    @patch('recipe.services.page_fetcher.MAX_RESPONSE_BYTES', 1024)
+    def test_fetch_too_large(self):
+        """Test pages over the size limit are rejected, whether or not they declare their length"""
+        self.serve('/declared', body=b'x' * 2048)
+        self.serve('/undeclared', body=b'x' * 2048, headers={'Content-Type': 'text/html', 'Connection': 'close'})
+
+        with self.assertRaises(ResponseTooLarge):
+            PageFetcherService.fetch(f'{self.base_url}/declared')
+        with self.assertRaises(ResponseTooLarge):
+            PageFetcherService.fetch(f'{self.base_url}/undeclared')
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    @patch('recipe.services.page_fetcher.READ_TIMEOUT', 0.2)
+    def test_fetch_read_timeout(self):
+        """Test a site that stops sending is abandoned after the read timeout"""
+        self.serve('/slow', delay=1)
+
+        with self.assertRaises(requests.RequestException):
+            PageFetcherService.fetch(f'{self.base_url}/slow')
+
+    @patch('recipe.services.page_fetcher.TOTAL_TIMEOUT', 0.3)
+    def test_fetch_total_timeout(self):
+        """Test a site trickling bytes within the read timeout is abandoned after the total timeout"""
+        self.serve('/trickle', body=b'x' * 256, delay=0.05)
+
+        with patch('recipe.services.page_fetcher.DOWNLOAD_CHUNK_SIZE', 16), self.assertRaises(requests.Timeout):
+            PageFetcherService.fetch(f'{self.base_url}/trickle')
+
+    def test_fetch_ignores_corrupt_entry(self):
+        """Test an unreadable entry is fetched again"""
+        self.serve('/recipe')
+        PageFetcherService.fetch(f'{self.base_url}/recipe')
+        entry_path = os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0])
+        with open(entry_path, 'wb') as f:
+            f.write(b'not json\n')
+
+        page = PageFetcherService.fetch(f'{self.base_url}/recipe')
+
+        self.assertFalse(page.from_cache)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_purge(self):
+        """Test only entries older than the max age are deleted"""
+        self.serve('/old')
+        self.serve('/recent')
+        PageFetcherService.fetch(f'{self.base_url}/old')
+        PageFetcherService.fetch(f'{self.base_url}/recent')
+        old_path = os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0])
+        os.utime(old_path, (0, 0))
+
+        self.assertEqual(PageFetcherService.purge(max_age=60), 1)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+    def test_purge_by_size(self):
+        """Test the least recently used entries are deleted to get under the size limit"""
+        now = time.time()
+        sizes = {}
+        for age, path in enumerate(['/three', '/two', '/one'], start=1):
+            self.serve(path)
+            PageFetcherService.fetch(f'{self.base_url}{path}')
+            key = normalize_url(f'{self.base_url}{path}')
+            entry_path = os.path.join(self.cache_dir, hashlib.sha256(key.encode('utf-8')).hexdigest())
+            os.utime(entry_path, (now - 100 * age, now - 100 * age))
+            sizes[path] = os.path.getsize(entry_path)
+
+        # A cache hit marks /one as used, leaving /two the least recently used
+        self.assertTrue(PageFetcherService.fetch(f'{self.base_url}/one').from_cache)
+
+        self.assertEqual(PageFetcherService.purge(max_size=sizes['/one'] + sizes['/three']), 1)
+        self.assertTrue(PageFetcherService.fetch(f'{self.base_url}/one').from_cache)
+        self.assertTrue(PageFetcherService.fetch(f'{self.base_url}/three').from_cache)
+        self.assertFalse(PageFetcherService.fetch(f'{self.base_url}/two').from_cache)
@@ -0,0 +1,185 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from ingredient.models import Ingredient, IngredientCategory
+from measurement.services.unit_registry import UnitRegistry
+from ...models import Recipe, RecipeItem, RecipeStep
+from ...services import RecipeService, RecipeItemService
+
+User = get_user_model()
+
+class RecipeServiceTests(TestCase):
+    def setUp(self):
+        # Load the unit registry up front so query counts only cover the code under test
+        UnitRegistry.current()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpassword'
+        )
+        self.category = IngredientCategory.objects.create(name='Spices')
+        self.ingredients = []
+        for name in ['Salt', 'Pepper', 'Cumin']:
+            ingredient = Ingredient.objects.create(name=name)
+            ingredient.categories.add(self.category)
+            self.ingredients.append(ingredient)
+
+    def _create_recipes(self, count):
+        for i in range(count):
+            recipe = Recipe.objects.create(title=f'Recipe {i}', user=self.user)
+            for ingredient in self.ingredients:
+                RecipeItem.objects.create(recipe=recipe, ingredient=ingredient, quantity=1, unit='tsp')
+            RecipeStep.objects.create(recipe=recipe, step_number=1, description='Mix.')
+
+    def test_list_query_count_is_constant(self):
+        """
+        Test list() uses the same number of queries regardless of recipe count
+        """
+        self._create_recipes(2)
+        with self.assertNumQueries(4):
+            recipes = RecipeService.list(user_id=self.user.id)
+        self.assertEqual(len(recipes), 2)
+
+        self._create_recipes(10)
+        with self.assertNumQueries(4):
+            recipes = RecipeService.list(user_id=self.user.id)
+        self.assertEqual(len(recipes), 12)
+
+    def test_list_serializes_nested_data(self):
+        """
+        Test list() still returns items, ingredient details, steps and item counts
+        """
+        self._create_recipes(1)
+        recipe = RecipeService.list(user_id=self.user.id)[0]
+        self.assertEqual(recipe['item_count'], 3)
+        self.assertEqual([item['ingredient_details']['name'] for item in recipe['items']],
+                         ['Cumin', 'Pepper', 'Salt'])
+        self.assertEqual(recipe['items'][0]['ingredient_details']['categories'][0]['name'], 'Spices')
+        self.assertEqual(len(recipe['steps']), 1)
+
+    def test_get_query_count(self):
+        """
+        Test get() loads a recipe with its nested data in a fixed number of queries
+        """
+        self._create_recipes(1)
+        recipe_id = Recipe.objects.first().id
+        with self.assertNumQueries(4):
+            recipe = RecipeService.get(id=recipe_id)
+        self.assertEqual(recipe['item_count'], 3)
+
+    def test_item_list_query_count(self):
+        """
+        Test RecipeItemService.list() loads ingredients and categories up front
+        """
+        self._create_recipes(1)
+        recipe_id = Recipe.objects.first().id
+        with self.assertNumQueries(2):
+            items = RecipeItemService.list(recipe_id=recipe_id)
+        self.assertEqual(len(items), 3)
+
+    def test_add_to_grocery_list(self):
+        """
+        Test add_to_grocery_list() merges a recipe into a list in a fixed number of queries
+        """
+        from grocery_list.models import GroceryList, GroceryListItem
+
+        self._create_recipes(1)
+        recipe = Recipe.objects.first()
+        grocery_list = GroceryList.objects.create(title='Shopping', user=self.user)
+        GroceryListItem.objects.create(grocery_list=grocery_list, ingredient=self.ingredients[0], quantity=1, unit='tbsp')
+
+        with self.assertNumQueries(6):
+            result = RecipeItemService.add_to_grocery_list(recipe_id=recipe.id, grocery_list_id=grocery_list.id)
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['count'], 3)
+
+        # 1 tbsp of salt plus 1 tsp converted to tbsp
+        salt_item = GroceryListItem.objects.get(grocery_list=grocery_list, ingredient=self.ingredients[0])
+        self.assertEqual(salt_item.unit, 'tbsp')
+        self.assertAlmostEqual(float(salt_item.quantity), 1.33, places=2)
+        self.assertEqual(GroceryListItem.objects.filter(grocery_list=grocery_list).count(), 3)
+
+    def test_scale(self):
+        """
+        Test scale() multiplies quantities and restates them in readable units
+        """
+        recipe = Recipe.objects.create(title='Spice rub', user=self.user, servings=2)
+        RecipeItem.objects.create(recipe=recipe, ingredient=self.ingredients[0], quantity=2, unit='tsp')
+        RecipeItem.objects.create(recipe=recipe, ingredient=self.ingredients[1], quantity=1, unit='cups')
+        RecipeItem.objects.create(recipe=recipe, ingredient=self.ingredients[2], quantity=3, unit='pinch')
+
+        # recipe, then items with their ingredients
+        with self.assertNumQueries(2):
+            scaled = RecipeService.scale(id=recipe.id, servings=48, user_id=self.user.id)
+
+        self.assertEqual(scaled['multiplier'], 24)
+        items = {item['ingredient']['name']: item for item in scaled['items']}
+        # 48 tsp
+        self.assertEqual((items['Salt']['quantity'], items['Salt']['unit']), (1.0, 'cup'))
+        # 24 cups, restated in gallons
+        self.assertEqual((items['Pepper']['quantity'], items['Pepper']['unit']), (1.5, 'gallon'))
+        # Units without a ladder are only multiplied
+        self.assertEqual((items['Cumin']['quantity'], items['Cumin']['unit']), (72.0, 'pinch'))
+        self.assertEqual(items['Salt']['original_unit'], 'tsp')
+
+    def test_scale_memoized(self):
+        """
+        Test scale() reuses results until the recipe's items change
+        """
+        recipe = Recipe.objects.create(title='Spice rub', user=self.user, servings=2)
+        RecipeItem.objects.create(recipe=recipe, ingredient=self.ingredients[0], quantity=2, unit='tsp')
+
+        RecipeService.scale(id=recipe.id, servings=4)
+        with self.assertNumQueries(1):
+            RecipeService.scale(id=recipe.id, servings=4)
+
+        RecipeItemService.create({
+            'recipe': recipe.id,
+            'ingredient': self.ingredients[1].id,
+            'quantity': 1,
+            'unit': 'tsp'
+        })
+        self.assertEqual(len(RecipeService.scale(id=recipe.id, servings=4)['items']), 2)
+
+    def test_scale_ingredient_renamed(self):
+        """
+        Test scale() shows an ingredient's new name after it is renamed
+        """
+        recipe = Recipe.objects.create(title='Spice rub', user=self.user, servings=2)
+        RecipeItem.objects.create(recipe=recipe, ingredient=self.ingredients[0], quantity=2, unit='tsp')
+        RecipeService.scale(id=recipe.id, servings=4)
+
+        self.ingredients[0].name = 'Sea salt'
+        self.ingredients[0].save()
+
+        scaled = RecipeService.scale(id=recipe.id, servings=4)
+        self.assertEqual(scaled['items'][0]['ingredient']['name'], 'Sea salt')
+
+    def test_scale_ingredient_other_change(self):
+        """
+        Test scale() keeps its memo when an ingredient changes without being renamed
+        """
+        recipe = Recipe.objects.create(title='Spice rub', user=self.user, servings=2)
+        RecipeItem.objects.create(recipe=recipe, ingredient=self.ingredients[0], quantity=2, unit='tsp')
+        RecipeService.scale(id=recipe.id, servings=4)
+
+        ingredient = Ingredient.objects.get(id=self.ingredients[0].id)
+        ingredient.description = 'Fine sea salt'
+        ingredient.density = 1.2
+        ingredient.save()
+
+        with self.assertNumQueries(1):
+            RecipeService.scale(id=recipe.id, servings=4)
+
+    def test_scale_invalid(self):
+        """
+        Test scale() rejects recipes without servings and unknown recipes
+        """
+        recipe = Recipe.objects.create(title='No servings', user=self.user)
+
+        with self.assertRaises(ValueError):
+            RecipeService.scale(id=recipe.id, servings=4)
+        with self.assertRaises(ValueError):
+            RecipeService.scale(id=recipe.id, servings=0)
+        self.assertIsNone(RecipeService.scale(id=9999, servings=4))
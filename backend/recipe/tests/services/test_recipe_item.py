@@ -0,0 +1,133 @@
+from decimal import Decimal
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from grocery_list.models import GroceryList, GroceryListItem
+from ingredient.models import Ingredient
+from measurement.services.unit_registry import UnitRegistry
+from ...models import Recipe, RecipeItem
+from ...services import RecipeItemService
+
+User = get_user_model()
+
+class RecipeItemServiceMealPlanTests(TestCase):
+    def setUp(self):
+        # Load the unit registry up front so query counts only cover the code under test
+        UnitRegistry.current()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpassword'
+        )
+        self.flour = Ingredient.objects.create(name='Flour')
+        self.milk = Ingredient.objects.create(name='Milk')
+        self.eggs = Ingredient.objects.create(name='Eggs')
+
+        self.pancakes = Recipe.objects.create(title='Pancakes', servings=4, user=self.user)
+        RecipeItem.objects.create(recipe=self.pancakes, ingredient=self.flour, quantity=200, unit='g')
+        RecipeItem.objects.create(recipe=self.pancakes, ingredient=self.milk, quantity=1, unit='cup')
+        RecipeItem.objects.create(recipe=self.pancakes, ingredient=self.eggs, quantity=2)
+
+        self.bread = Recipe.objects.create(title='Bread', servings=1, user=self.user)
+        RecipeItem.objects.create(recipe=self.bread, ingredient=self.flour, quantity=1, unit='kg')
+        RecipeItem.objects.create(recipe=self.bread, ingredient=self.milk, quantity=100, unit='ml')
+
+    def test_aggregate_requirements(self):
+        """Test quantities are scaled and summed per ingredient across recipes"""
+        with self.assertNumQueries(1):
+            entries = RecipeItemService.aggregate_requirements([
+                {'recipe_id': self.pancakes.id, 'servings': 8},
+                {'recipe_id': self.bread.id},
+                {'recipe_id': self.bread.id, 'multiplier': 2},
+            ])
+        totals = {entry['ingredient'].name: entry for entry in entries}
+        self.assertEqual(len(entries), 3)
+
+        # 400 g from pancakes, 3 kg from bread in the first unit seen for flour
+        self.assertEqual(totals['Flour']['unit'], 'g')
+        self.assertEqual(totals['Flour']['quantity'], Decimal('3400'))
+        # 2 cups from pancakes plus 300 ml from bread
+        self.assertEqual(totals['Milk']['unit'], 'cup')
+        self.assertAlmostEqual(float(totals['Milk']['quantity']), 2 + 300 / 236.59, places=2)
+        self.assertEqual(totals['Eggs']['quantity'], Decimal('4'))
+
+    def test_aggregate_requirements_rejects_other_users(self):
+        """Test recipes owned by another user or missing are reported rather than skipped"""
+        other_user = User.objects.create_user(username='other', password='testpassword')
+        other_recipe = Recipe.objects.create(title='Secret', user=other_user)
+        RecipeItem.objects.create(recipe=other_recipe, ingredient=self.eggs, quantity=12)
+        empty = Recipe.objects.create(title='Empty', user=self.user)
+
+        with self.assertRaisesMessage(ValueError, f"Recipes not found: {other_recipe.id}, 999"):
+            RecipeItemService.aggregate_requirements(
+                [{'recipe_id': self.bread.id}, {'recipe_id': other_recipe.id}, {'recipe_id': 999}],
+                user_id=self.user.id
+            )
+        # A recipe of the user's own without items is fine
+        self.assertEqual(RecipeItemService.aggregate_requirements([{'recipe_id': empty.id}], user_id=self.user.id), [])
+
+    def test_aggregate_requirements_invalid_entries(self):
+        """Test multipliers and servings must be positive finite numbers"""
+        for entry in [
+            {'recipe_id': self.bread.id, 'multiplier': 0},
+            {'recipe_id': self.bread.id, 'multiplier': -1},
+            {'recipe_id': self.bread.id, 'multiplier': 'NaN'},
+            {'recipe_id': self.bread.id, 'multiplier': 'Infinity'},
+            {'recipe_id': self.bread.id, 'multiplier': 'lots'},
+            {'recipe_id': self.bread.id, 'servings': 0},
+            {'recipe_id': self.bread.id, 'servings': [2]},
+            {'recipe_id': 'bread'},
+        ]:
+            with self.subTest(entry=entry), self.assertRaises(ValueError):
+                RecipeItemService.aggregate_requirements([entry], user_id=self.user.id)
+
+    def test_add_recipes_to_new_grocery_list(self):
+        """Test a meal plan creates a consolidated grocery list"""
+        result = RecipeItemService.add_recipes_to_grocery_list(
+            [{'recipe_id': self.pancakes.id}, {'recipe_id': self.bread.id}],
+            user_id=self.user.id,
+            title='This week'
+        )
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['count'], 3)
+
+        grocery_list = GroceryList.objects.get(id=result['grocery_list_id'])
+        self.assertEqual(grocery_list.title, 'This week')
+        self.assertEqual(grocery_list.user, self.user)
+        flour_item = GroceryListItem.objects.get(grocery_list=grocery_list, ingredient=self.flour)
+        self.assertEqual((flour_item.quantity, flour_item.unit), (Decimal('1200'), 'g'))
+
+    def test_add_recipes_to_existing_grocery_list(self):
+        """Test a meal plan merges into an existing grocery list in a handful of queries"""
+        grocery_list = GroceryList.objects.create(title='Existing', user=self.user)
+        GroceryListItem.objects.create(grocery_list=grocery_list, ingredient=self.flour, quantity=1, unit='kg')
+
+        with self.assertNumQueries(9):
+            result = RecipeItemService.add_recipes_to_grocery_list(
+                [{'recipe_id': self.pancakes.id, 'multiplier': 2}, {'recipe_id': self.bread.id}],
+                grocery_list_id=grocery_list.id,
+                user_id=self.user.id
+            )
+        self.assertEqual(result['grocery_list_id'], grocery_list.id)
+
+        flour_item = GroceryListItem.objects.get(grocery_list=grocery_list, ingredient=self.flour)
+        self.assertEqual((flour_item.quantity, flour_item.unit), (Decimal('2.4'), 'kg'))
+        self.assertEqual(GroceryListItem.objects.filter(grocery_list=grocery_list).count(), 3)
+
+    def test_add_recipes_to_missing_grocery_list(self):
+        """Test an unknown grocery list is reported as an error"""
+        result = RecipeItemService.add_recipes_to_grocery_list([{'recipe_id': self.bread.id}], grocery_list_id=9999)
+        self.assertEqual(result['status'], 'error')
+
+    def test_add_recipes_to_other_users_grocery_list(self):
+        """Test a meal plan can't be merged into another user's grocery list"""
+        other_user = User.objects.create_user(username='otheruser', password='testpassword')
+        grocery_list = GroceryList.objects.create(title='Not yours', user=other_user)
+
+        result = RecipeItemService.add_recipes_to_grocery_list(
+            [{'recipe_id': self.bread.id}], grocery_list_id=grocery_list.id, user_id=self.user.id
+        )
+
+        self.assertEqual(result['status'], 'error')
+        self.assertFalse(GroceryListItem.objects.filter(grocery_list=grocery_list).exists())
@@ -0,0 +1,121 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from ingredient.models import Ingredient
+from measurement.services.unit_registry import UnitRegistry
+from pantry.models import PantryItem
+from ...models import Recipe, RecipeItem
+from ...services import RecipeMatchService
+
+User = get_user_model()
+
+class RecipeMatchServiceTests(TestCase):
+    def setUp(self):
+        # Load the unit registry up front so query counts only cover the code under test
+        UnitRegistry.current()
+        RecipeMatchService.invalidate()
+
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.flour = Ingredient.objects.create(name='Flour')
+        self.eggs = Ingredient.objects.create(name='Eggs')
+        self.milk = Ingredient.objects.create(name='Milk')
+
+        self.pancakes = Recipe.objects.create(title='Pancakes', user=self.user)
+        RecipeItem.objects.create(recipe=self.pancakes, ingredient=self.flour, quantity=200, unit='g')
+        RecipeItem.objects.create(recipe=self.pancakes, ingredient=self.eggs, quantity=2)
+        RecipeItem.objects.create(recipe=self.pancakes, ingredient=self.milk, quantity=1, unit='cup')
+
+        self.omelette = Recipe.objects.create(title='Omelette', user=self.user)
+        RecipeItem.objects.create(recipe=self.omelette, ingredient=self.eggs, quantity=3)
+
+    def tearDown(self):
+        RecipeMatchService.invalidate()
+
+    def test_ranks_recipes_by_coverage(self):
+        """
+        Test recipes are ranked by how much of them the pantry covers
+        """
+        PantryItem.objects.create(user=self.user, ingredient=self.eggs, quantity=6)
+        PantryItem.objects.create(user=self.user, ingredient=self.flour, quantity=1, unit='kg')
+
+        matches = RecipeMatchService.cookable(user_id=self.user.id)
+
+        self.assertEqual([match['title'] for match in matches], ['Omelette', 'Pancakes'])
+        self.assertEqual(matches[0]['score'], 1.0)
+        self.assertAlmostEqual(matches[1]['score'], 2 / 3)
+        self.assertEqual(matches[1]['matched'], 2)
+        self.assertEqual([item['name'] for item in matches[1]['missing']], ['Milk'])
+
+    def test_partial_quantities_and_stock_levels(self):
+        """
+        Test short quantities and low or out of stock items count for less
+        """
+        PantryItem.objects.create(user=self.user, ingredient=self.eggs, quantity=1)
+        PantryItem.objects.create(user=self.user, ingredient=self.flour, stock_level='low')
+        PantryItem.objects.create(user=self.user, ingredient=self.milk, stock_level='out')
+
+        matches = {match['title']: match for match in RecipeMatchService.cookable(user_id=self.user.id)}
+
+        self.assertAlmostEqual(matches['Omelette']['score'], 1 / 3)
+        self.assertAlmostEqual(matches['Pancakes']['score'], (0.5 + 0.5 + 0) / 3)
+
+    def test_min_score_and_limit(self):
+        """
+        Test recipes below min_score are dropped and results are limited
+        """
+        PantryItem.objects.create(user=self.user, ingredient=self.eggs, quantity=6)
+
+        self.assertEqual(len(RecipeMatchService.cookable(user_id=self.user.id)), 2)
+        self.assertEqual(len(RecipeMatchService.cookable(user_id=self.user.id, limit=1)), 1)
+        matches = RecipeMatchService.cookable(user_id=self.user.id, min_score=0.5)
+        self.assertEqual([match['title'] for match in matches], ['Omelette'])
+
+    def test_only_uses_own_recipes(self):
+        """
+        Test other users' recipes are never suggested
+        """
+        other_user = User.objects.create_user(username='other', password='password')
+        PantryItem.objects.create(user=other_user, ingredient=self.eggs, quantity=6)
+
+        self.assertEqual(RecipeMatchService.cookable(user_id=other_user.id), [])
+
+    def test_index_is_reused_and_updated_on_change(self):
+        """
+        Test the index is built once and only changed recipes are reloaded
+        """
+        PantryItem.objects.create(user=self.user, ingredient=self.milk, quantity=1, unit='cup')
+        RecipeMatchService.cookable(user_id=self.user.id)
+
+        # Only the pantry and the recipes' count and latest update are read once the index is built
+        with self.assertNumQueries(2):
+            RecipeMatchService.cookable(user_id=self.user.id)
+
+        latte = Recipe.objects.create(title='Latte', user=self.user)
+        RecipeItem.objects.create(recipe=latte, ingredient=self.milk, quantity=200, unit='ml')
+
+        # The pantry and recipe stamp, plus the changed recipe and its items
+        with self.assertNumQueries(4):
+            matches = RecipeMatchService.cookable(user_id=self.user.id)
+        self.assertEqual([match['title'] for match in matches], ['Latte', 'Pancakes'])
+        self.assertEqual(matches[0]['score'], 1.0)
+
+        latte.delete()
+        matches = RecipeMatchService.cookable(user_id=self.user.id)
+        self.assertEqual([match['title'] for match in matches], ['Pancakes'])
+
+    def test_index_picks_up_changes_from_other_processes(self):
+        """
+        Test changes that send no signals here are picked up from the recipes' count and updated_at
+        """
+        PantryItem.objects.create(user=self.user, ingredient=self.eggs, quantity=6)
+        RecipeMatchService.cookable(user_id=self.user.id)
+
+        # Queryset updates and deletes send no signals, like changes made by another process
+        Recipe.objects.filter(id=self.omelette.id).update(title='Frittata', updated_at=timezone.now())
+        matches = RecipeMatchService.cookable(user_id=self.user.id)
+        self.assertEqual(matches[0]['title'], 'Frittata')
+
+        Recipe.objects.filter(id=self.omelette.id).delete()
+        matches = RecipeMatchService.cookable(user_id=self.user.id)
+        self.assertEqual([match['title'] for match in matches], ['Pancakes'])
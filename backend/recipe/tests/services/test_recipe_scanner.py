@@ -5,6 +5,7 @@ from django.contrib.auth import get_user_model
 from ingredient.models import Ingredient
 from ...models import Recipe
 from ...services import RecipeScannerService
+from ...services.page_fetcher import FetchedPage
 
 User = get_user_model()
 
@@ -21,9 +22,9 @@ class RecipeScannerServiceTests(TestCase):
         self.ingredient1 = Ingredient.objects.create(name="Salt")
         self.ingredient2 = Ingredient.objects.create(name="Pepper")
     
-    @patch('recipe.services.recipe_scanner.requests.get')
-    @patch('recipe.services.recipe_scanner.scrape_me')
-    def test_scan_url_specialized_scraper(self, mock_scrape_me, mock_requests_get):
+    @patch('recipe.services.recipe_scanner.PageFetcherService.fetch')
+    @patch('recipe.services.recipe_scanner.scrape_html')
+    def test_scan_url_specialized_scraper(self, mock_scrape_html, mock_fetch):
         """Test scanning a URL with a specialized scraper"""
         # Mock the scraper response
         mock_scraper = MagicMock()
@@ -35,8 +36,11 @@ class RecipeScannerServiceTests(TestCase):
         mock_scraper.ingredients.return_value = ["1 tsp salt", "1/2 tsp pepper"]
         mock_scraper.instructions.return_value = "Step 1: Mix ingredients.\nStep 2: Cook."
         
-        mock_scrape_me.return_value = mock_scraper
-        
+        mock_scrape_html.return_value = mock_scraper
+
+        # Mock the fetched page
+        mock_fetch.return_value = FetchedPage('https://example.com/recipe', b"<html><body>Recipe content</body></html>", 'utf-8')
+
         # Test the scan_url method
         with patch('recipe.services.recipe_scanner.SCRAPERS', {'example.com': 'ExampleScraper'}):
             result = RecipeScannerService.scan_url('https://example.com/recipe', self.user.id)
@@ -49,15 +53,80 @@ class RecipeScannerServiceTests(TestCase):
         self.assertEqual(result['cook_time'], 30)
         self.assertEqual(len(result['ingredients']), 2)
         self.assertEqual(len(result['steps']), 2)
-    
-    @patch('recipe.services.recipe_scanner.requests.get')
+
+        # The scraper parses the fetched page instead of fetching it again
+        mock_scrape_html.assert_called_once_with("<html><body>Recipe content</body></html>", org_url='https://example.com/recipe')
+        mock_fetch.assert_called_once()
+
+    @patch('recipe.services.recipe_scanner.PageFetcherService.fetch')
+    @patch('recipe.services.recipe_scanner.scrape_html')
+    def test_scan_url_specialized_scraper_falls_back(self, mock_scrape_html, mock_fetch):
+        """Test the fallback scraper reuses the page when the specialized scraper fails"""
+        mock_fetch.return_value = FetchedPage(
+            'https://example.com/recipe',
+            b"<html><head><title>Fallback Recipe</title></head><body></body></html>",
+            'utf-8'
+        )
+        mock_scrape_html.side_effect = Exception("Schema not found")
+
+        with patch('recipe.services.recipe_scanner.SCRAPERS', {'example.com': 'ExampleScraper'}):
+            result = RecipeScannerService.scan_url('https://example.com/recipe', self.user.id)
+
+        self.assertEqual(result['title'], "Fallback Recipe")
+        mock_fetch.assert_called_once_with('https://example.com/recipe')
+
+    @patch('recipe.services.recipe_scanner.PageFetcherService.fetch')
+    @patch('recipe.services.recipe_scanner.scrape_html')
+    def test_scan_url_reuses_stored_result(self, mock_scrape_html, mock_fetch):
+        """Test scanning an unchanged page again returns the stored recipe without parsing it"""
+        mock_scraper = MagicMock()
+        mock_scraper.title.return_value = "Test Recipe"
+        mock_scraper.description.return_value = ""
+        mock_scraper.yields.return_value = "4 servings"
+        mock_scraper.prep_time.return_value = 10
+        mock_scraper.cook_time.return_value = 20
+        mock_scraper.ingredients.return_value = ["1 tsp salt"]
+        mock_scraper.instructions.return_value = "Mix ingredients."
+        mock_scrape_html.return_value = mock_scraper
+        mock_fetch.return_value = FetchedPage('https://example.com/recipe', b"<html>v1</html>", 'utf-8')
+
+        with patch('recipe.services.recipe_scanner.SCRAPERS', {'example.com': 'ExampleScraper'}):
+            first = RecipeScannerService.scan_url('https://example.com/recipe', self.user.id)
+            second = RecipeScannerService.scan_url('https://example.com/recipe?utm_source=share', self.user.id)
+
+            self.assertEqual(mock_scrape_html.call_count, 1)
+            self.assertEqual(second['title'], first['title'])
+            self.assertEqual(second['ingredients'], first['ingredients'])
+            self.assertEqual(second['progress']['status'], 'complete')
+
+            # A changed page is parsed again
+            mock_fetch.return_value = FetchedPage('https://example.com/recipe', b"<html>v2</html>", 'utf-8')
+            RecipeScannerService.scan_url('https://example.com/recipe', self.user.id)
+            self.assertEqual(mock_scrape_html.call_count, 2)
+
+    @patch('recipe.services.recipe_scanner.ScanResultService.store')
+    @patch('recipe.services.recipe_scanner.PageFetcherService.fetch')
+    def test_scan_url_store_failure(self, mock_fetch, mock_store):
+        """Test a scan still returns its recipe when storing the result fails"""
+        mock_fetch.return_value = FetchedPage(
+            'https://example.com/recipe',
+            b"<html><head><title>Fallback Recipe</title></head><body></body></html>",
+            'utf-8'
+        )
+        mock_store.side_effect = Exception("database is locked")
+
+        with self.assertLogs('recipe.services.recipe_scanner', level='WARNING') as logs:
+            result = RecipeScannerService.scan_url('https://example.com/recipe', self.user.id)
+
+        self.assertEqual(result['title'], "Fallback Recipe")
+        self.assertIn('Could not store scan result', logs.output[-1])
+
+    @patch('recipe.services.recipe_scanner.PageFetcherService.fetch')
     @patch('recipe.services.recipe_scanner.BeautifulSoup')
-    def test_scan_url_fallback_scraper(self, mock_bs, mock_requests_get):
+    def test_scan_url_fallback_scraper(self, mock_bs, mock_fetch):
         """Test scanning a URL with the fallback scraper"""
-        # Mock the requests response
-        mock_response = MagicMock()
-        mock_response.content = "<html><body>Recipe content</body></html>"
-        mock_requests_get.return_value = mock_response
+        # Mock the fetched page
+        mock_fetch.return_value = FetchedPage('https://unknown.com/recipe', b"<html><body>Recipe content</body></html>", 'utf-8')
         
         # Mock BeautifulSoup
         mock_soup = MagicMock()
@@ -111,13 +180,14 @@ class RecipeScannerServiceTests(TestCase):
         self.assertEqual(result['unit'], None)
         self.assertEqual(result['name'], "onion")
         self.assertEqual(result['notes'], "diced")
+
+        # Test with a spelled out unit followed by "of"
+        result = RecipeScannerService._parse_ingredient("3 tablespoons of honey")
+        self.assertEqual(result['unit'], "tablespoons")
+        self.assertEqual(result['name'], "honey")
     
-    @patch('ingredient.services.IngredientService.find_or_create_ingredient')
-    def test_create_recipe_from_scan(self, mock_find_or_create):
+    def test_create_recipe_from_scan(self):
         """Test creating a recipe from scanned data"""
-        # Mock the find_or_create_ingredient method
-        mock_find_or_create.side_effect = [self.ingredient1, self.ingredient2]
-        
         # Create test scan data
         scan_data = {
             'title': 'Test Recipe',
@@ -157,3 +227,32 @@ class RecipeScannerServiceTests(TestCase):
         # Verify recipe steps were created
         self.assertEqual(recipe.steps.count(), 2)
         self.assertEqual(recipe.steps.first().description, 'Mix salt and pepper.')
+
+        # Verify the existing ingredients were reused
+        self.assertEqual(
+            set(recipe.items.values_list('ingredient_id', flat=True)),
+            {self.ingredient1.id, self.ingredient2.id}
+        )
+
+    def test_create_recipe_from_scan_bulk(self):
+        """Test creating a recipe resolves ingredients and writes rows in bulk"""
+        scan_data = {
+            'title': 'Big Recipe',
+            'ingredients': [{'name': 'salt', 'quantity': 1, 'unit': 'tsp'}] + [
+                {'name': f'New Ingredient {i}', 'quantity': i + 1, 'unit': 'g'} for i in range(30)
+            ] + [{'name': '  ', 'quantity': 1}],
+            'steps': [{'step_number': 1, 'description': f'Step {i}'} for i in range(5)]
+        }
+
+        # recipe, ingredient lookup, ingredient insert, item insert, step insert,
+        # four savepoint queries and four queries to serialize the result
+        with self.assertNumQueries(13):
+            result = RecipeScannerService.create_recipe_from_scan(scan_data, self.user.id)
+
+        recipe = Recipe.objects.get(id=result['id'])
+        self.assertEqual(recipe.items.count(), 31)
+        self.assertEqual(result['item_count'], 31)
+        self.assertEqual(recipe.items.get(ingredient__name='Salt').ingredient_id, self.ingredient1.id)
+        self.assertEqual(Ingredient.objects.filter(name__startswith='New ingredient').count(), 30)
+        # Repeated step numbers are renumbered in order
+        self.assertEqual(list(recipe.steps.values_list('step_number', flat=True)), [1, 2, 3, 4, 5])
@@ -0,0 +1,262 @@
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from common.rate_limit import RateLimited, RateLimiter
+from ...models import ScanJob
+from ...services import ScanJobService
+
+User = get_user_model()
+
+SCAN_RESULT = {
+    'title': 'Test Recipe',
+    'description': 'A test recipe',
+    'prep_time': 15,
+    'cook_time': 30,
+    'servings': 4,
+    'ingredients': [],
+    'steps': [],
+    'progress': {'status': 'complete', 'progress': 100, 'message': 'Recipe processing complete!'}
+}
+
+@override_settings(RATE_LIMIT_DB=':memory:')
+class ScanJobServiceTests(TestCase):
+    def setUp(self):
+        RateLimiter.reset()
+
+        # Create a test user
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpassword'
+        )
+
+    def test_enqueue(self):
+        """Test queueing a URL"""
+        job = ScanJobService.enqueue('https://example.com/recipe', self.user.id)
+
+        self.assertEqual(job['status'], 'queued')
+        self.assertEqual(job['progress']['status'], 'queued')
+        self.assertEqual(ScanJob.objects.get(id=job['id']).user, self.user)
+
+    def test_enqueue_invalid_url(self):
+        """Test that only http(s) URLs can be queued"""
+        for url in ['example.com/recipe', 'ftp://example.com/recipe', 'https://']:
+            with self.assertRaises(ValueError):
+                ScanJobService.enqueue(url, self.user.id)
+        self.assertFalse(ScanJob.objects.exists())
+
+    def test_enqueue_rate_limited(self):
+        """Test that a user can only queue a burst of scans"""
+        for i in range(10):
+            ScanJobService.enqueue(f'https://example.com/recipe-{i}', self.user.id)
+        with self.assertRaises(RateLimited):
+            ScanJobService.enqueue('https://example.com/recipe-10', self.user.id)
+
+        # Other users have their own limit
+        other_user = User.objects.create_user(username='otheruser', password='testpassword')
+        ScanJobService.enqueue('https://example.com/recipe-10', other_user.id)
+        self.assertEqual(ScanJob.objects.count(), 11)
+
+    def test_get_other_user(self):
+        """Test that jobs are only visible to the user who queued them"""
+        job = ScanJobService.enqueue('https://example.com/recipe', self.user.id)
+        other_user = User.objects.create_user(username='otheruser', password='testpassword')
+
+        self.assertIsNotNone(ScanJobService.get(job['id'], self.user.id))
+        self.assertIsNone(ScanJobService.get(job['id'], other_user.id))
+
+    def test_claim_next(self):
+        """Test that jobs are claimed oldest first and only once"""
+        first = ScanJobService.enqueue('https://example.com/first', self.user.id)
+        second = ScanJobService.enqueue('https://example.com/second', self.user.id)
+
+        claimed = ScanJobService.claim_next()
+        self.assertEqual(claimed.id, first['id'])
+        self.assertEqual(claimed.status, 'running')
+        self.assertIsNotNone(claimed.started_at)
+
+        self.assertEqual(ScanJobService.claim_next().id, second['id'])
+        self.assertIsNone(ScanJobService.claim_next())
+
+    @patch('recipe.services.scan_job.RecipeScannerService.scan_url')
+    def test_run(self, mock_scan_url):
+        """Test that a job saves each progress stage and then the result"""
+        saved_progress = []
+
+        def scan_url(url, user_id, on_progress):
+            on_progress({'status': 'fetching', 'progress': 10, 'message': 'Fetching recipe from URL...'})
+            saved_progress.append(ScanJob.objects.get(url=url).progress)
+            return dict(SCAN_RESULT)
+
+        mock_scan_url.side_effect = scan_url
+        ScanJobService.enqueue('https://example.com/recipe', self.user.id)
+
+        ScanJobService.run(ScanJobService.claim_next())
+
+        self.assertEqual(saved_progress[0]['status'], 'fetching')
+        job = ScanJob.objects.get()
+        self.assertEqual(job.status, 'complete')
+        self.assertEqual(job.progress['progress'], 100)
+        self.assertEqual(job.result['title'], 'Test Recipe')
+        self.assertNotIn('progress', job.result)
+        self.assertIsNotNone(job.finished_at)
+
+    @patch('recipe.services.scan_job.RecipeScannerService.scan_url')
+    def test_run_error(self, mock_scan_url):
+        """Test that a failed scan is stored with its error"""
+        mock_scan_url.side_effect = ValueError("Could not extract recipe data")
+        job = ScanJobService.enqueue('https://example.com/recipe', self.user.id)
+
+        ScanJobService.run(ScanJobService.claim_next())
+
+        job = ScanJobService.get(job['id'], self.user.id)
+        self.assertEqual(job['status'], 'error')
+        self.assertEqual(job['error'], "Could not extract recipe data")
+        self.assertEqual(job['progress']['status'], 'error')
+        self.assertNotIn('result', job)
+
+    @patch('recipe.services.scan_job.RecipeScannerService.scan_url')
+    def test_run_unexpected_error(self, mock_scan_url):
+        """Test that unexpected errors aren't exposed to the user"""
+        mock_scan_url.side_effect = RuntimeError("connection pool exhausted")
+        job = ScanJobService.enqueue('https://example.com/recipe', self.user.id)
+
+        ScanJobService.run(ScanJobService.claim_next())
+
+        self.assertEqual(ScanJobService.get(job['id'], self.user.id)['error'], "Failed to scan recipe URL")
+
+    @patch('recipe.services.scan_job.RecipeScannerService.scan_url')
+    def test_run_deferred_by_domain_limit(self, mock_scan_url):
+        """Test that a rate limited site's job is deferred without holding up other sites"""
+        mock_scan_url.side_effect = lambda **kwargs: dict(SCAN_RESULT)
+        for i in range(6):
+            ScanJob.objects.create(url=f'https://slow.example.com/recipe-{i}')
+        other = ScanJob.objects.create(url='https://other.example.com/recipe')
+
+        self.assertEqual(ScanJobService.work(once=True), 6)
+
+        deferred = ScanJob.objects.get(status='queued')
+        self.assertEqual(deferred.url, 'https://slow.example.com/recipe-5')
+        self.assertGreater(deferred.run_after, timezone.now())
+        self.assertIn('slow.example.com', deferred.progress['message'])
+        self.assertEqual(ScanJob.objects.get(id=other.id).status, 'complete')
+        self.assertEqual(mock_scan_url.call_count, 6)
+
+        # Deferred jobs are claimed again once their time comes
+        self.assertIsNone(ScanJobService.claim_next())
+        ScanJob.objects.filter(id=deferred.id).update(run_after=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(ScanJobService.claim_next().id, deferred.id)
+
+    def test_requeue_stale(self):
+        """Test that jobs left running by a dead worker are queued again"""
+        stale = ScanJob.objects.create(
+            url='https://example.com/stale', status='running',
+            started_at=timezone.now() - timedelta(hours=1)
+        )
+        active = ScanJob.objects.create(
+            url='https://example.com/active', status='running', started_at=timezone.now()
+        )
+
+        self.assertEqual(ScanJobService.requeue_stale(), 1)
+
+        stale.refresh_from_db()
+        active.refresh_from_db()
+        self.assertEqual(stale.status, 'queued')
+        self.assertIsNone(stale.started_at)
+        self.assertEqual(active.status, 'running')
+
+    @patch('recipe.services.scan_job.HOUSEKEEPING_INTERVAL', 0)
+    @patch('recipe.services.scan_job.RecipeScannerService.scan_url')
+    def test_work_housekeeping(self, mock_scan_url):
+        """Test that a running worker picks up jobs lost by another worker and purges old ones"""
+        mock_scan_url.side_effect = lambda **kwargs: dict(SCAN_RESULT)
+        stale = ScanJob.objects.create(
+            url='https://example.com/stale', user=self.user, status='running',
+            started_at=timezone.now() - timedelta(hours=1)
+        )
+        ScanJob.objects.create(
+            url='https://example.com/old', status='complete', finished_at=timezone.now() - timedelta(days=30)
+        )
+
+        with patch('recipe.services.scan_job.PageFetcherService.purge') as mock_purge:
+            self.assertEqual(ScanJobService.work(once=True), 1)
+
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, 'complete')
+        self.assertFalse(ScanJob.objects.filter(url='https://example.com/old').exists())
+        mock_purge.assert_called()
+
+    def test_requeue_stale_uses_heartbeat(self):
+        """Test that long jobs still reporting progress aren't requeued, and lost jobs are failed after their last attempt"""
+        hour_ago = timezone.now() - timedelta(hours=1)
+        live = ScanJob.objects.create(
+            url='https://example.com/live', status='running', started_at=hour_ago, heartbeat_at=timezone.now(), attempts=1
+        )
+        exhausted = ScanJob.objects.create(
+            url='https://example.com/exhausted', status='running', started_at=hour_ago, heartbeat_at=hour_ago, attempts=3
+        )
+
+        self.assertEqual(ScanJobService.requeue_stale(), 0)
+
+        live.refresh_from_db()
+        exhausted.refresh_from_db()
+        self.assertEqual(live.status, 'running')
+        self.assertEqual(exhausted.status, 'error')
+        self.assertIsNotNone(exhausted.finished_at)
+
+    def test_work_survives_errors(self):
+        """Test that the worker keeps going when claiming or running a job raises, and retries the job later"""
+        failed = ScanJobService.enqueue('https://example.com/failed', self.user.id)
+        ScanJobService.enqueue('https://example.com/next', self.user.id)
+
+        claim_next = ScanJobService.claim_next
+        claim_errors = iter([OperationalError("database is locked")])
+
+        def flaky_claim_next():
+            error = next(claim_errors, None)
+            if error:
+                raise error
+            return claim_next()
+
+        with patch.object(ScanJobService, 'claim_next', side_effect=flaky_claim_next), \
+                patch.object(ScanJobService, 'run', side_effect=[OperationalError("database is locked"), True]):
+            with self.assertLogs('recipe.services.scan_job', level='WARNING'):
+                self.assertEqual(ScanJobService.work(once=True, poll_interval=0), 1)
+
+        job = ScanJob.objects.get(id=failed['id'])
+        self.assertEqual(job.status, 'queued')
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.run_after, timezone.now())
+
+    def test_purge_finished(self):
+        """Test that only old finished jobs are deleted"""
+        old = timezone.now() - timedelta(days=30)
+        ScanJob.objects.create(url='https://example.com/old', status='complete', finished_at=old)
+        ScanJob.objects.create(url='https://example.com/failed', status='error', finished_at=old)
+        recent = ScanJob.objects.create(url='https://example.com/recent', status='complete', finished_at=timezone.now())
+        queued = ScanJob.objects.create(url='https://example.com/queued')
+
+        self.assertEqual(ScanJobService.purge_finished(), 2)
+        self.assertEqual(set(ScanJob.objects.values_list('id', flat=True)), {recent.id, queued.id})
+
+    @patch('recipe.services.scan_job.RecipeScannerService.scan_url')
+    def test_run_scan_worker_command(self, mock_scan_url):
+        """Test that the worker command drains the queue when run once"""
+        mock_scan_url.side_effect = lambda **kwargs: dict(SCAN_RESULT)
+        ScanJobService.enqueue('https://example.com/first', self.user.id)
+        ScanJobService.enqueue('https://example.com/second', self.user.id)
+
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as cache_dir, override_settings(SCAN_CACHE_DIR=cache_dir):
+            call_command('run_scan_worker', '--once', stdout=out)
+
+        self.assertIn('Ran 2 scan jobs', out.getvalue())
+        self.assertEqual(ScanJob.objects.filter(status='complete').count(), 2)
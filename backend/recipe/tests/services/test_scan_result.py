@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ...models import ScanResult
+from ...services import ScanResultService
+
+RECIPE = {
+    'title': 'Test Recipe',
+    'description': 'A test recipe',
+    'servings': 4,
+    'prep_time': 15,
+    'cook_time': 30,
+    'ingredients': [{'name': 'salt', 'quantity': 1, 'unit': 'tsp', 'notes': None}],
+    'steps': [{'step_number': 1, 'description': 'Mix ingredients.'}]
+}
+
+class ScanResultServiceTests(TestCase):
+    def test_store_and_get(self):
+        """Test a stored result is found by normalized URL and content"""
+        ScanResultService.store('https://example.com/recipe', b'<html>v1</html>', {**RECIPE, 'progress': {'progress': 100}})
+
+        result = ScanResultService.get('https://EXAMPLE.com/recipe?utm_source=feed#top', b'<html>v1</html>')
+
+        self.assertEqual(result, RECIPE)
+
+    def test_get_changed_page(self):
+        """Test a result isn't reused once the page changes"""
+        ScanResultService.store('https://example.com/recipe', b'<html>v1</html>', RECIPE)
+
+        self.assertIsNone(ScanResultService.get('https://example.com/recipe', b'<html>v2</html>'))
+        self.assertIsNone(ScanResultService.get('https://example.com/other', b'<html>v1</html>'))
+
+    def test_get_marks_used(self):
+        """Test getting a result keeps it from being evicted by age"""
+        ScanResultService.store('https://example.com/recipe', b'<html>v1</html>', RECIPE)
+        ScanResult.objects.update(last_used_at=timezone.now() - timedelta(days=60))
+
+        ScanResultService.get('https://example.com/recipe', b'<html>v1</html>')
+
+        self.assertEqual(ScanResultService.evict(), 0)
+
+    def test_store_replaces_old_version(self):
+        """Test storing a result for a changed page drops the old version's"""
+        ScanResultService.store('https://example.com/recipe', b'<html>v1</html>', RECIPE)
+        ScanResultService.store('https://example.com/recipe', b'<html>v2</html>', {**RECIPE, 'title': 'New Recipe'})
+
+        self.assertEqual(ScanResult.objects.count(), 1)
+        self.assertEqual(ScanResultService.get('https://example.com/recipe', b'<html>v2</html>')['title'], 'New Recipe')
+
+    def test_evict_by_age(self):
+        """Test results unused for the max age are evicted"""
+        ScanResultService.store('https://example.com/old', b'old', RECIPE)
+        ScanResultService.store('https://example.com/recent', b'recent', RECIPE)
+        ScanResult.objects.filter(url='https://example.com/old').update(last_used_at=timezone.now() - timedelta(days=60))
+
+        self.assertEqual(ScanResultService.evict(), 1)
+        self.assertEqual(list(ScanResult.objects.values_list('url', flat=True)), ['https://example.com/recent'])
+
+    def test_evict_by_count_and_size(self):
+        """Test the least recently used results are evicted to get under the limits"""
+        now = timezone.now()
+        for i in range(5):
+            ScanResultService.store(f'https://example.com/{i}', b'page', RECIPE)
+            ScanResult.objects.filter(url=f'https://example.com/{i}').update(last_used_at=now - timedelta(minutes=5 - i))
+        size = ScanResult.objects.first().size
+
+        self.assertEqual(ScanResultService.evict(max_results=3), 2)
+        self.assertEqual(ScanResultService.evict(max_size=size * 2), 1)
+        self.assertEqual(
+            sorted(ScanResult.objects.values_list('url', flat=True)),
+            ['https://example.com/3', 'https://example.com/4']
+        )
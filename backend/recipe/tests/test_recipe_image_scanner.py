@@ -219,6 +219,15 @@ class RecipeImageScannerServiceTests(TestCase):
         self.assertEqual(result[3]["name"], "sugar")
         self.assertEqual(result[3]["notes"], "granulated")
 
+    def test_parse_ingredients_unknown_unit(self):
+        """Test words that merely contain a unit's letters aren't treated as units"""
+        result = RecipeImageScannerService._parse_ingredients(["2 cloves garlic", "2 lbs chicken"])
+
+        self.assertEqual(result[0]["unit"], "")
+        self.assertEqual(result[0]["name"], "cloves garlic")
+        self.assertEqual(result[1]["unit"], "lbs")
+        self.assertEqual(result[1]["name"], "chicken")
+
     def test_parse_instructions(self):
         """Test parsing instruction lines"""
         instruction_lines = [
@@ -5,6 +5,8 @@ urlpatterns = [
     # Recipe endpoints
     path('', RecipeAPI.list),
     path('<int:id>/', RecipeAPI.detail),
+    path('<int:id>/scale/', RecipeAPI.scale),
+    path('cookable/', RecipeAPI.cookable),
 
     # Recipe Item endpoints
     path('<int:recipe_id>/items/', RecipeItemAPI.list),
@@ -17,8 +19,12 @@ urlpatterns = [
     # Add recipe items to grocery list endpoint
     path('<int:recipe_id>/add-to-grocery-list/<int:grocery_list_id>/', RecipeItemAPI.add_to_grocery_list),
 
+    # Add a multi-recipe meal plan to a grocery list endpoint
+    path('meal-plan/add-to-grocery-list/', RecipeItemAPI.add_meal_plan_to_grocery_list),
+
     # Recipe Scanner endpoints
     path('scan/', RecipeScannerAPI.scan),
+    path('scan/<int:id>/', RecipeScannerAPI.scan_job),
     path('scan-image/', RecipeImageScannerAPI.scan_image),
     path('create-from-scan/', RecipeScannerAPI.create_from_scan),
 ]
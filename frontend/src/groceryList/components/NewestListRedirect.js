@@ -12,7 +12,7 @@ const NewestListRedirect = ({ children }) => {
     const fetchNewestList = async () => {
       try {
         setLoading(true);
-        const response = await axios.get('/api/grocerylist/');
+        const response = await axios.get('/api/grocerylist/?summary=true');
         if (response.data && response.data.length > 0) {
           // The lists are already sorted by created_at in descending order
           setNewestListId(response.data[0].id);
@@ -40,7 +40,7 @@ const GroceryLists = () => {
     const refreshList = async () => {
         try {
             setLoading(true);
-            const response = await axios.get("/api/grocerylist/");
+            const response = await axios.get("/api/grocerylist/?summary=true");
             setGroceryLists(response.data);
             setError("");
         } catch (err) {
@@ -17,7 +17,7 @@ const GroceryListSelectionModal = ({ isOpen, toggle, onSelect }) => {
   const fetchGroceryLists = async () => {
     try {
       setLoading(true);
-      const response = await axios.get('/api/grocerylist/');
+      const response = await axios.get('/api/grocerylist/?summary=true');
       // Filter to only show incomplete grocery lists
       const incompleteLists = response.data.filter(list => !list.completed);
       setGroceryLists(incompleteLists);
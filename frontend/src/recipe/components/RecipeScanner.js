@@ -19,6 +19,10 @@ import {
 } from 'reactstrap';
 import axios from 'axios';
 
+// How often to check on a queued recipe URL scan, and how long to wait for it
+const SCAN_POLL_INTERVAL_MS = 1000;
+const SCAN_POLL_TIMEOUT_MS = 2 * 60 * 1000;
+
 // Custom styles for alignment
 const styles = {
   ingredientDeleteButton: {
@@ -52,6 +56,8 @@ const RecipeScanner = ({ isOpen, toggle, onScanComplete }) => {
   const [imageFile, setImageFile] = useState(null);
   const [imagePreview, setImagePreview] = useState(null);
   const fileInputRef = useRef(null);
+  // The scan job being polled, if any; cancelled when the modal opens, closes or unmounts
+  const pollRef = useRef(null);
   const [progress, setProgress] = useState({
     status: 'idle',
     progress: 0,
@@ -75,6 +81,13 @@ const RecipeScanner = ({ isOpen, toggle, onScanComplete }) => {
         message: ''
       });
     }
+
+    return () => {
+      if (pollRef.current) {
+        pollRef.current.cancelled = true;
+        pollRef.current = null;
+      }
+    };
   }, [isOpen]);
 
   const handleUrlChange = (e) => {
@@ -115,6 +128,40 @@ const RecipeScanner = ({ isOpen, toggle, onScanComplete }) => {
     }
   };
 
+  // Poll a scan job, showing its progress, until it completes, fails or times out.
+  // Resolves to null if polling was cancelled.
+  const pollScanJob = async (jobId) => {
+    const poll = { cancelled: false };
+    pollRef.current = poll;
+    const deadline = Date.now() + SCAN_POLL_TIMEOUT_MS;
+
+    for (;;) {
+      const { data: job } = await axios.get(`/api/recipes/scan/${jobId}/`);
+      if (poll.cancelled) {
+        return null;
+      }
+      if (job.progress && job.progress.status !== 'queued') {
+        setProgress({ ...job.progress, status: 'processing' });
+      }
+
+      if (job.status === 'complete') {
+        return { ...job.result, progress: job.progress };
+      }
+      if (job.status === 'error') {
+        throw Object.assign(new Error(job.error), { response: { data: { error: job.error } } });
+      }
+      if (Date.now() >= deadline) {
+        const message = 'The scan is taking too long. Please try again later.';
+        throw Object.assign(new Error(message), { response: { data: { error: message } } });
+      }
+
+      await new Promise((resolve) => setTimeout(resolve, SCAN_POLL_INTERVAL_MS));
+      if (poll.cancelled) {
+        return null;
+      }
+    }
+  };
+
   const scanUrl = async () => {
     // Validate URL
     if (!url) {
@@ -137,8 +184,14 @@ const RecipeScanner = ({ isOpen, toggle, onScanComplete }) => {
         message: 'Starting URL processing...'
       });
 
-      // Call the API to scan the URL
-      const response = await axios.post('/api/recipes/scan/', { url });
+      // Queue the scan, then poll the job until a worker has finished it
+      const job = await axios.post('/api/recipes/scan/', { url });
+      const result = await pollScanJob(job.data.id);
+      if (result === null) {
+        // The modal was closed or reopened while waiting
+        return;
+      }
+      const response = { data: result };
 
       // Check if we got valid recipe data
       if (!response.data || !response.data.title) {